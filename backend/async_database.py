@@ -0,0 +1,133 @@
+"""Asyncio database sessions for routers migrated off the threadpool.
+
+The async stack shares the models, engine profiles, commit hooks and
+read-your-writes pins of :mod:`backend.database`, so sync and async routers
+can serve the same tables side by side while endpoints are migrated.
+"""
+
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+
+from fastapi import Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from backend.database import (
+    PoolMetrics,
+    _resolve_database_url,
+    engine_options,
+    install_session_events,
+    instrument_engine,
+    read_your_writes,
+    resolve_engine_profile,
+)
+
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+async_pool_metrics = PoolMetrics()
+async_replica_pool_metrics = PoolMetrics()
+
+
+def _async_url(url: str) -> str:
+    """Swap a sync driver for its asyncio counterpart (psycopg2 → asyncpg, sqlite → aiosqlite)."""
+
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    if driver is None:
+        if parsed.drivername in ASYNC_DRIVERS.values():
+            return url
+        raise RuntimeError(f"No asyncio driver known for {parsed.drivername!r}; set ASYNC_DATABASE_URL")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _build_async_engine(url: str, metrics: PoolMetrics) -> AsyncEngine:
+    profile = resolve_engine_profile()
+    engine = create_async_engine(url, **engine_options(url, profile, metrics, asyncio=True))
+    instrument_engine(engine.sync_engine, profile, metrics)
+    return engine
+
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    url = os.getenv("ASYNC_DATABASE_URL") or _async_url(_resolve_database_url())
+    return _build_async_engine(url, async_pool_metrics)
+
+
+@lru_cache(maxsize=1)
+def get_async_read_engine() -> AsyncEngine:
+    url = os.getenv("ASYNC_DATABASE_READ_URL") or os.getenv("DATABASE_READ_URL")
+    if not url:
+        return get_async_engine()
+    return _build_async_engine(_async_url(url), async_replica_pool_metrics)
+
+
+class _AsyncUnitOfWorkSession(Session):
+    """Sync session behind :class:`AsyncSession` carrying the shared commit hooks."""
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        return get_async_engine().sync_engine
+
+
+class _AsyncRoutingSession(Session):
+    """Replica-bound sync session unless the current user wrote recently."""
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        request = self.info.get("request")
+        user_id = getattr(request.state, "user_id", None) if request is not None else None
+        if read_your_writes.is_pinned(user_id):
+            return get_async_engine().sync_engine
+        return get_async_read_engine().sync_engine
+
+
+install_session_events(_AsyncUnitOfWorkSession)
+
+AsyncSessionLocal = async_sessionmaker(
+    sync_session_class=_AsyncUnitOfWorkSession, autoflush=False, expire_on_commit=False
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    sync_session_class=_AsyncRoutingSession, autoflush=False, expire_on_commit=False
+)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db(request: Request):
+    """Async counterpart of ``get_read_db``."""
+
+    async with AsyncReadSessionLocal(info={"request": request}) as db:
+        yield db
+
+
+async def get_async_uow(request: Request):
+    """Async counterpart of ``get_uow``: flush in handlers, one commit here."""
+
+    db = AsyncSessionLocal()
+    db.info["unit_of_work"] = True
+    try:
+        yield db
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        request.state.db_commits = db.info.get("commits", 0)
+        if db.info.get("wrote"):
+            read_your_writes.pin(getattr(request.state, "user_id", None))
+        await db.close()
+
+
+async def dispose_async_engines() -> None:
+    for factory in (get_async_read_engine, get_async_engine):
+        if factory.cache_info().currsize:
+            await factory().dispose()
@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 import os
+import threading
+import time
+from dataclasses import dataclass, replace
 from functools import lru_cache
+from typing import Callable, Dict
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
+from fastapi import Request
+from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
-from sqlalchemy.exc import OperationalError
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 
 # Ensure values from a local .env file are available when running via uvicorn.
@@ -27,40 +32,350 @@ def _resolve_database_url() -> str:
     return "sqlite:///./uaflow.db"
 
 
-@lru_cache(maxsize=1)
-def get_engine() -> Engine:
-    """Create (and memoize) the SQLAlchemy engine with backend-specific options."""
+@dataclass(frozen=True)
+class EngineProfile:
+    """Pool and session tuning applied when the engine is created."""
+
+    pool_size: int
+    max_overflow: int
+    pool_timeout: int
+    pool_recycle: int
+    # Server-side statement timeout in milliseconds (0 disables it).
+    statement_timeout_ms: int
+    # Connection-level pragmas, only used for SQLite.
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_cache_size: int = -64000  # negative values are KiB
+    sqlite_mmap_size: int = 268435456
+    sqlite_busy_timeout_ms: int = 5000
+
+
+ENGINE_PROFILES: Dict[str, EngineProfile] = {
+    # Local development and small single-node installs.
+    "default": EngineProfile(
+        pool_size=10, max_overflow=10, pool_timeout=30, pool_recycle=1800, statement_timeout_ms=30000
+    ),
+    # API workers: wider pool, fail fast when it is exhausted.
+    "web": EngineProfile(
+        pool_size=20, max_overflow=20, pool_timeout=10, pool_recycle=1800, statement_timeout_ms=15000
+    ),
+    # Background jobs and maintenance commands: few, long-running connections.
+    "worker": EngineProfile(
+        pool_size=4,
+        max_overflow=2,
+        pool_timeout=60,
+        pool_recycle=3600,
+        statement_timeout_ms=0,
+        sqlite_busy_timeout_ms=30000,
+    ),
+    # Test runs and one-off scripts.
+    "minimal": EngineProfile(
+        pool_size=2, max_overflow=0, pool_timeout=30, pool_recycle=-1, statement_timeout_ms=0
+    ),
+}
+
+_PROFILE_OVERRIDES = {
+    "DB_POOL_SIZE": "pool_size",
+    "DB_MAX_OVERFLOW": "max_overflow",
+    "DB_POOL_TIMEOUT": "pool_timeout",
+    "DB_POOL_RECYCLE": "pool_recycle",
+    "DB_STATEMENT_TIMEOUT_MS": "statement_timeout_ms",
+    "SQLITE_SYNCHRONOUS": "sqlite_synchronous",
+    "SQLITE_CACHE_SIZE": "sqlite_cache_size",
+    "SQLITE_MMAP_SIZE": "sqlite_mmap_size",
+    "SQLITE_BUSY_TIMEOUT_MS": "sqlite_busy_timeout_ms",
+}
+
+
+def resolve_engine_profile() -> EngineProfile:
+    """Return the profile named by ``DB_ENGINE_PROFILE`` with per-setting env overrides."""
+
+    name = os.getenv("DB_ENGINE_PROFILE", "default").lower()
+    if name not in ENGINE_PROFILES:
+        raise RuntimeError(
+            f"Unknown DB_ENGINE_PROFILE {name!r}; expected one of {', '.join(ENGINE_PROFILES)}"
+        )
+    profile = ENGINE_PROFILES[name]
+    overrides = {}
+    for env_name, field in _PROFILE_OVERRIDES.items():
+        value = os.getenv(env_name)
+        if value:
+            current = getattr(profile, field)
+            overrides[field] = int(value) if isinstance(current, int) else value.upper()
+    return replace(profile, **overrides)
+
+
+class PoolMetrics:
+    """Checkout wait times and utilisation for the instrumented connection pool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.capacity = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.in_use = 0
+        self.in_use_peak = 0
+
+    def record_wait(self, seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def checked_out(self) -> None:
+        with self._lock:
+            self.in_use += 1
+            self.in_use_peak = max(self.in_use_peak, self.in_use)
+
+    def checked_in(self) -> None:
+        with self._lock:
+            self.in_use = max(self.in_use - 1, 0)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "in_use": self.in_use,
+                "in_use_peak": self.in_use_peak,
+                "utilisation": round(self.in_use / self.capacity, 3) if self.capacity else 0.0,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+pool_metrics = PoolMetrics()
+replica_pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports how long callers wait for a free connection."""
+
+    metrics: PoolMetrics = pool_metrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - started, timed_out=False)
+        return connection
+
+
+def _install_sqlite_pragmas(engine: Engine, profile: EngineProfile) -> None:
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA synchronous={profile.sqlite_synchronous}")
+            cursor.execute(f"PRAGMA cache_size={int(profile.sqlite_cache_size)}")
+            cursor.execute(f"PRAGMA mmap_size={int(profile.sqlite_mmap_size)}")
+            cursor.execute(f"PRAGMA busy_timeout={int(profile.sqlite_busy_timeout_ms)}")
+        finally:
+            cursor.close()
+
 
-    url = _resolve_database_url()
+def _install_pool_metrics(engine: Engine, metrics: PoolMetrics) -> None:
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        metrics.checked_out()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record) -> None:
+        metrics.checked_in()
+
+
+def engine_options(url: str, profile: EngineProfile, metrics: PoolMetrics, *, asyncio: bool = False) -> dict:
+    """Keyword arguments for ``create_engine``/``create_async_engine`` under ``profile``."""
+
+    pool_bases = (InstrumentedQueuePool, AsyncAdaptedQueuePool) if asyncio else (InstrumentedQueuePool,)
     connect_args = {}
-    engine_kwargs = {"pool_pre_ping": True}
+    engine_kwargs = {
+        "pool_pre_ping": True,
+        # A subclass per engine so every pool reports to its own metrics.
+        "poolclass": type("InstrumentedQueuePool", pool_bases, {"metrics": metrics}),
+        "pool_size": profile.pool_size,
+        "max_overflow": profile.max_overflow,
+        "pool_timeout": profile.pool_timeout,
+        "pool_recycle": profile.pool_recycle,
+    }
 
     if url.startswith("sqlite"):
         # SQLite needs explicit thread handling for FastAPI's threaded server.
         connect_args = {"check_same_thread": False}
-        # SQLite does not support connection pooling – drop pool arguments.
-        engine_kwargs = {}
+        if ":memory:" in url or url.split("?")[0].rstrip("/") in {"sqlite:", "sqlite+aiosqlite:"}:
+            # In-memory databases live inside a single connection; keep the
+            # dialect's default pool so every session sees the same data.
+            return {"connect_args": connect_args}
+        # File connections are cheap to check but never go stale.
+        engine_kwargs["pool_pre_ping"] = False
+        engine_kwargs["pool_recycle"] = -1
+    elif profile.statement_timeout_ms and url.startswith("postgresql+asyncpg"):
+        connect_args = {"server_settings": {"statement_timeout": str(profile.statement_timeout_ms)}}
+    elif profile.statement_timeout_ms and url.startswith("postgresql"):
+        connect_args = {"options": f"-c statement_timeout={profile.statement_timeout_ms}"}
 
-    engine = create_engine(url, connect_args=connect_args, **engine_kwargs)
+    return {"connect_args": connect_args, **engine_kwargs}
 
-    # Attempt a quick connection so deployment failures are raised early with
-    # a descriptive message rather than bubbling up during the first request.
-    try:
-        with engine.connect() as connection:
-            connection.execute(text("SELECT 1"))
-    except OperationalError as exc:  # pragma: no cover - requires broken DB
-        raise RuntimeError(
-            "Unable to connect to the configured database. "
-            "Check DATABASE_URL credentials or availability."
-        ) from exc
 
+def instrument_engine(engine: Engine, profile: EngineProfile, metrics: PoolMetrics) -> None:
+    """Install SQLite pragmas and pool metrics on a (sync) engine."""
+
+    if engine.dialect.name == "sqlite":
+        _install_sqlite_pragmas(engine, profile)
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        metrics.capacity = profile.pool_size + max(profile.max_overflow, 0)
+        _install_pool_metrics(engine, metrics)
+
+
+def _build_engine(url: str, metrics: PoolMetrics) -> Engine:
+    profile = resolve_engine_profile()
+    engine = create_engine(url, **engine_options(url, profile, metrics))
+    instrument_engine(engine, profile, metrics)
     return engine
 
 
-engine = get_engine()
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    """Create (and memoize) the SQLAlchemy engine with backend-specific options.
+
+    Nothing connects until the first checkout, so importing the application
+    never depends on the database being reachable; pre-ping and the pool
+    retry on the next request when it was briefly down.
+    """
+
+    return _build_engine(_resolve_database_url(), pool_metrics)
+
+
+@lru_cache(maxsize=1)
+def get_read_engine() -> Engine:
+    """Return the replica engine, or the primary when ``DATABASE_READ_URL`` is unset."""
+
+    url = os.getenv("DATABASE_READ_URL")
+    if not url:
+        return get_engine()
+    return _build_engine(url, replica_pool_metrics)
+
+
+class PrimarySession(Session):
+    """Session bound to the primary engine, created on first use."""
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        return get_engine()
+
+
+SessionLocal = sessionmaker(class_=PrimarySession, autocommit=False, autoflush=False)
 Base = declarative_base()
 
+
+def on_commit(db, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the session's current transaction commits."""
+
+    db.info.setdefault("on_commit", []).append(callback)
+
+
+def _after_commit(session) -> None:
+    session.info["commits"] = session.info.get("commits", 0) + 1
+    for callback in session.info.pop("on_commit", []):
+        callback()
+
+
+def _after_rollback(session) -> None:
+    session.info.pop("on_commit", None)
+    session.info.pop("wrote", None)
+
+
+def _after_flush(session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+def _on_execute(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+def install_session_events(target) -> None:
+    """Attach commit callbacks and write tracking to a sessionmaker or Session class."""
+
+    event.listen(target, "after_commit", _after_commit)
+    event.listen(target, "after_rollback", _after_rollback)
+    event.listen(target, "after_flush", _after_flush)
+    event.listen(target, "do_orm_execute", _on_execute)
+
+
+install_session_events(SessionLocal)
+
+
+# ---------------------------------------------------------------------------
+# Read replica routing
+# ---------------------------------------------------------------------------
+
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+
+class ReadYourWrites:
+    """Users who wrote recently, kept on the primary until replicas catch up.
+
+    Pins are per process, which matches the replication lag window they
+    cover; a user bouncing between workers may still see a stale replica.
+    """
+
+    def __init__(self, window: float = READ_YOUR_WRITES_SECONDS) -> None:
+        self.window = window
+        self._lock = threading.Lock()
+        self._pins: Dict[int, float] = {}
+
+    def pin(self, user_id: int | None) -> None:
+        if user_id is None or self.window <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._pins[user_id] = now + self.window
+            if len(self._pins) > 10000:
+                self._pins = {uid: until for uid, until in self._pins.items() if until > now}
+
+    def is_pinned(self, user_id: int | None) -> bool:
+        if user_id is None:
+            return False
+        with self._lock:
+            until = self._pins.get(user_id)
+        return until is not None and until > time.monotonic()
+
+
+read_your_writes = ReadYourWrites()
+
+
+class RoutingSession(Session):
+    """Read-only session bound to the replica unless the caller is pinned.
+
+    The bind is resolved on first use, after the request's dependencies (and
+    therefore the current user) have been resolved.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        request = self.info.get("request")
+        user_id = getattr(request.state, "user_id", None) if request is not None else None
+        if read_your_writes.is_pinned(user_id):
+            return get_engine()
+        return get_read_engine()
+
+
+ReadSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
+
+
+@event.listens_for(ReadSessionLocal, "before_flush")
+def _reject_replica_writes(session, flush_context, instances) -> None:
+    raise RuntimeError("Read-only session: use get_uow for endpoints that write")
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -68,29 +383,43 @@ def get_db():
     finally:
         db.close()
 
+
+def get_read_db(request: Request):
+    """Session for read-only endpoints, served by ``DATABASE_READ_URL`` when set."""
+
+    db = ReadSessionLocal(info={"request": request})
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_uow(request: Request):
+    """Request-scoped unit of work for write endpoints.
+
+    Handlers only ``flush()`` to obtain generated keys; the single commit is
+    issued here once the handler returns, and everything is rolled back if
+    it raises. The number of commits is left on ``request.state.db_commits``.
+    """
+
+    db = SessionLocal()
+    db.info["unit_of_work"] = True
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        request.state.db_commits = db.info.get("commits", 0)
+        if db.info.get("wrote"):
+            read_your_writes.pin(getattr(request.state, "user_id", None))
+        db.close()
+
+
 def init_db():
-    # Import models so metadata is populated before create_all.
-    from models import (  # noqa: F401
-        AuditLog,
-        Doc,
-        DocSignature,
-        DocVersion,
-        Epic,
-        IntegrationConnection,
-        IntegrationLog,
-        MarketplaceApp,
-        MarketplaceInstallation,
-        Project,
-        Sprint,
-        SupportComment,
-        SupportTicket,
-        Task,
-        TaskComment,
-        Team,
-        TeamMember,
-        SystemSetting,
-        TwoFactorSecret,
-        User,
-    )
-
-    Base.metadata.create_all(bind=engine)
+    """Bring the schema up to date through the versioned migrations."""
+
+    from backend.migrations import upgrade
+
+    upgrade(get_engine())
@@ -2,20 +2,19 @@
 
 from __future__ import annotations
 
-from fastapi import Depends, Header, HTTPException
+from fastapi import Depends, Header, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from backend.async_database import get_async_db
 from backend.database import get_db
-from backend.models import AuditLog, User
+from backend.models import User
 from backend.security import decode_token
+from backend.services.audit_sink import audit_sink
+from backend.services.identity_cache import UserSnapshot, identity_cache
 
 
-def get_current_user(
-    authorization: str | None = Header(default=None, alias="Authorization"),
-    db: Session = Depends(get_db),
-) -> User:
-    """Resolve the user from a Bearer token."""
-
+def _token_user_id(request: Request, authorization: str | None) -> int:
     if not authorization or not authorization.lower().startswith("bearer "):
         raise HTTPException(status_code=401, detail="Missing bearer token")
 
@@ -25,16 +24,80 @@ def get_current_user(
     except Exception:  # pragma: no cover - token errors bubble to API
         raise HTTPException(status_code=401, detail="Invalid token") from None
 
-    user = db.get(User, int(data.get("sub", 0)))
+    user_id = int(data.get("sub", 0))
+    # Lets read sessions keep this user on the primary right after a write.
+    request.state.user_id = user_id
+    return user_id
+
+
+def get_current_user(
+    request: Request,
+    authorization: str | None = Header(default=None, alias="Authorization"),
+    db: Session = Depends(get_db),
+) -> UserSnapshot:
+    """Resolve the user from a Bearer token.
+
+    The identity is served from the in-process cache when possible, so the
+    returned object is a detached snapshot rather than an ORM instance.
+    """
+
+    user_id = _token_user_id(request, authorization)
+    snapshot = identity_cache.get(user_id)
+    if snapshot is not None:
+        return snapshot
+
+    user = db.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    snapshot = UserSnapshot.from_user(user)
+    identity_cache.put(snapshot)
+    return snapshot
+
+
+def get_current_user_stream(
+    request: Request,
+    authorization: str | None = Header(default=None, alias="Authorization"),
+    access_token: str | None = Query(default=None),
+    db: Session = Depends(get_db),
+) -> UserSnapshot:
+    """``get_current_user`` that also reads ``?access_token=``.
+
+    Browsers cannot set headers on ``EventSource`` connections, so event
+    streams accept the token in the query string.
+    """
+
+    if not authorization and access_token:
+        authorization = f"Bearer {access_token}"
+    return get_current_user(request, authorization, db)
+
+
+async def get_current_user_async(
+    request: Request,
+    authorization: str | None = Header(default=None, alias="Authorization"),
+    db: AsyncSession = Depends(get_async_db),
+) -> UserSnapshot:
+    """``get_current_user`` for async routers; never touches the threadpool."""
+
+    user_id = _token_user_id(request, authorization)
+    snapshot = identity_cache.get(user_id)
+    if snapshot is not None:
+        return snapshot
+
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    snapshot = UserSnapshot.from_user(user)
+    identity_cache.put(snapshot)
+    return snapshot
+
 
+def require_roles(*allowed_roles: str, source=get_current_user):
+    """Create a dependency that ensures the current user has one of the roles.
 
-def require_roles(*allowed_roles: str):
-    """Create a dependency that ensures the current user has one of the roles."""
+    Async routers pass ``source=get_current_user_async``.
+    """
 
-    def dependency(user: User = Depends(get_current_user)) -> User:
+    async def dependency(user: UserSnapshot = Depends(source)) -> UserSnapshot:
         if allowed_roles and user.role not in allowed_roles:
             raise HTTPException(status_code=403, detail="Insufficient permissions")
         return user
@@ -43,13 +106,11 @@ def require_roles(*allowed_roles: str):
 
 
 def audit_log(
-    user: User,
+    user: User | UserSnapshot | None,
     action: str,
     metadata: dict | None,
     db: Session,
 ) -> None:
-    """Persist an audit record for the performed action."""
+    """Record an audit entry through the sink selected by ``AUDIT_LOG_MODE``."""
 
-    record = AuditLog(actor_id=user.id if user else None, action=action, metadata=metadata or {})
-    db.add(record)
-    db.commit()
+    audit_sink.record(db, user.id if user else None, action, metadata)
@@ -0,0 +1,72 @@
+"""Conditional GET: version tokens as ETags and ``304 Not Modified`` replies.
+
+Read endpoints derive an ETag from a cheap version source — a per-project
+change counter or ``count``/``max(updated_at)`` over the rows a listing
+covers — plus the request parameters, and check it before running the
+query they would otherwise serialize::
+
+    cached = not_modified(request, response, make_etag("board", project.id, project.tasks_version))
+    if cached:
+        return cached
+
+Responses carry ``Cache-Control: private, no-cache`` so browsers keep the
+body but revalidate it with ``If-None-Match`` on every poll.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+
+ETAG_HEADER = "ETag"
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over ``parts``; equal parts give equal tags across processes."""
+
+    raw = json.dumps(list(parts), default=str, separators=(",", ":"))
+    return f'W/"{hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def collection_version(db: Session, stmt: Select, updated_at, *extra) -> Tuple[Any, ...]:
+    """``(count, max(updated_at), *extra)`` over the rows ``stmt`` selects, ignoring its ordering.
+
+    Any insert, delete or update among those rows changes one of the first
+    two; ``extra`` aggregates cover data the rows summarize, such as
+    ``sum(Project.tasks_version)`` for a listing that embeds task counters.
+    """
+
+    return tuple(db.execute(collection_version_statement(stmt, updated_at, *extra)).one())
+
+
+def collection_version_statement(stmt: Select, updated_at, *extra) -> Select:
+    return stmt.with_only_columns(func.count(), func.max(updated_at), *extra).order_by(None)
+
+
+def _matches(header: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison: W/"x" and "x" name the same version.
+    opaque = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Tag ``response`` with ``etag``; return a ``304`` if the client already has it."""
+
+    headers = {ETAG_HEADER: etag, "Cache-Control": CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
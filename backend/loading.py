@@ -0,0 +1,49 @@
+"""Relationship loading plans declared per endpoint.
+
+Heavy relationships in :mod:`backend.models` are ``lazy="raise"``, so every
+endpoint that serializes or walks them states up front what it needs::
+
+    db.get(Task, task_id, options=eager(Task, "project.team.members"))
+    db.query(Team).options(*eager(Team, "members"))
+
+Each dotted path is resolved attribute by attribute from ``model``.
+Collections are loaded with ``selectinload`` (one extra ``IN`` query per
+hop, independent of the number of parents) and many-to-one hops with
+``joinedload`` (folded into the parent query).
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import List, Tuple
+
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+
+def _loader(attribute, chain=None):
+    strategy = "selectinload" if attribute.property.uselist else "joinedload"
+    if chain is None:
+        return selectinload(attribute) if strategy == "selectinload" else joinedload(attribute)
+    return getattr(chain, strategy)(attribute)
+
+
+@lru_cache(maxsize=256)
+def _plan(model, paths: Tuple[str, ...]) -> Tuple[LoaderOption, ...]:
+    options = []
+    for path in paths:
+        current, chain = model, None
+        for name in path.split("."):
+            attribute = getattr(current, name, None)
+            if attribute is None or not hasattr(attribute, "property") or not hasattr(attribute.property, "mapper"):
+                raise ValueError(f"{current.__name__}.{name} is not a relationship (in {path!r})")
+            chain = _loader(attribute, chain)
+            current = attribute.property.mapper.class_
+        options.append(chain)
+    return tuple(options)
+
+
+def eager(model, *paths: str) -> List[LoaderOption]:
+    """Loader options that populate each dotted relationship path from ``model``."""
+
+    return list(_plan(model, paths))
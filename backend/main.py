@@ -1,11 +1,35 @@
-from fastapi import FastAPI
-from database import init_db
-from routers import analytics, auth, docs, integration, projects, support, tasks
+"""ASGI application: ``uvicorn backend.main:app`` from the repository root.
+
+Importing this module neither connects to the database nor changes the
+schema. Engines are created on first use and migrations run separately::
+
+    python -m backend.migrations upgrade
+"""
+
+import os
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 
-from database import init_db
-from routers import analytics, auth, docs, integration, projects, support, tasks
+from backend.async_database import dispose_async_engines
+from backend.routers import (
+    admin,
+    analytics,
+    analytics_async,
+    auth,
+    auth_async,
+    docs,
+    integration,
+    projects,
+    support,
+    support_async,
+    tasks,
+    tasks_async,
+)
+from backend.services.audit_sink import audit_sink
+from backend.services.password_hasher import password_hasher
+from backend.sql_instrumentation import report, track_queries
 
 app = FastAPI(
     title="UA FLOW MVP",
@@ -15,6 +39,8 @@ app = FastAPI(
     openapi_url="/api/openapi.json",
 )
 
+DEBUG = os.getenv("UA_FLOW_DEBUG", "0").lower() in {"1", "true", "yes"}
+
 origins = ["*"]
 app.add_middleware(
     CORSMiddleware,
@@ -22,8 +48,56 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "ETag",
+        "X-Next-Cursor",
+        "X-Total-Count",
+        "X-Total-Count-Mode",
+        "X-DB-Queries",
+        "X-DB-Time",
+        "X-DB-N-Plus-One",
+        "X-DB-Commits",
+    ],
 )
 
+
+@app.middleware("http")
+async def sql_instrumentation(request: Request, call_next):
+    """Count statements and DB time per request; log slow requests and N+1 suspects.
+
+    In debug mode the counters are also exposed to tests and local tooling
+    through ``X-DB-*`` response headers.
+    """
+
+    with track_queries() as stats:
+        response = await call_next(request)
+    report(request.method, request.url.path, stats)
+    if DEBUG:
+        response.headers["X-DB-Queries"] = str(stats.count)
+        response.headers["X-DB-Time"] = f"{stats.milliseconds:.1f}"
+        suspects = stats.repeated()
+        if suspects:
+            response.headers["X-DB-N-Plus-One"] = str(sum(count for _, count in suspects))
+        commits = getattr(request.state, "db_commits", None)
+        if commits is not None:
+            response.headers["X-DB-Commits"] = str(commits)
+    return response
+
+
+# Comma-separated router names (tasks, support, analytics, auth) whose asyncio
+# versions should serve requests. They are mounted ahead of the sync routers,
+# so only the endpoints they implement move; the rest fall through.
+ASYNC_ROUTERS = {name.strip() for name in os.getenv("UA_FLOW_ASYNC_ROUTERS", "").split(",") if name.strip()}
+ASYNC_VERSIONS = {
+    "tasks": (tasks_async.router, "/api/v1/tasks", "Tasks"),
+    "support": (support_async.router, "/api/v1/support", "Support"),
+    "analytics": (analytics_async.router, "/api/v1/analytics", "Analytics"),
+    "auth": (auth_async.router, "/api/v1/auth", "Auth"),
+}
+for name, (async_router, prefix, tag) in ASYNC_VERSIONS.items():
+    if name in ASYNC_ROUTERS or "all" in ASYNC_ROUTERS:
+        app.include_router(async_router, prefix=prefix, tags=[tag])
+
 app.include_router(tasks.router, prefix="/api/v1/tasks", tags=["Tasks"])
 app.include_router(projects.router, prefix="/api/v1/projects", tags=["Projects"])
 app.include_router(docs.router, prefix="/api/v1/docs", tags=["Docs"])
@@ -31,10 +105,19 @@ app.include_router(support.router, prefix="/api/v1/support", tags=["Support"])
 app.include_router(integration.router, prefix="/api/v1/integrations", tags=["Integrations"])
 app.include_router(analytics.router, prefix="/api/v1/analytics", tags=["Analytics"])
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Auth"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin"])
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    password_hasher.shutdown()
+    audit_sink.shutdown()
+
+
+@app.on_event("shutdown")
+async def dispose_engines():
+    await dispose_async_engines()
 
-@app.on_event("startup")
-def startup_event():
-    init_db()
 
 @app.get("/health")
 def health():
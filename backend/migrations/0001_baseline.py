@@ -0,0 +1,41 @@
+"""Tables that existed before versioned migrations were introduced."""
+
+from __future__ import annotations
+
+from sqlalchemy.engine import Connection
+
+from backend.database import Base
+from backend import models  # noqa: F401  (populates Base.metadata)
+
+
+description = "Baseline schema"
+
+BASELINE_TABLES = (
+    "users",
+    "teams",
+    "team_members",
+    "projects",
+    "sprints",
+    "epics",
+    "tasks",
+    "task_comments",
+    "docs",
+    "doc_versions",
+    "doc_signatures",
+    "support_tickets",
+    "support_comments",
+    "integration_connections",
+    "integration_logs",
+    "audit_logs",
+    "system_settings",
+    "twofactor_secrets",
+    "marketplace_apps",
+    "marketplace_installations",
+)
+
+
+def upgrade(connection: Connection) -> None:
+    # Databases created by the old ``create_all`` startup already have these
+    # tables; checkfirst turns the baseline into a no-op for them.
+    tables = [Base.metadata.tables[name] for name in BASELINE_TABLES]
+    Base.metadata.create_all(connection, tables=tables, checkfirst=True)
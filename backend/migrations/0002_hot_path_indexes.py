@@ -0,0 +1,79 @@
+"""Composite indexes matched to the router queries, unique doc versions."""
+
+from __future__ import annotations
+
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Connection
+
+from backend.migrations import create_indexes
+from backend.models import (
+    AuditLog,
+    Doc,
+    DocSignature,
+    DocVersion,
+    Epic,
+    IntegrationLog,
+    MarketplaceInstallation,
+    Project,
+    Sprint,
+    SupportComment,
+    SupportTicket,
+    Task,
+    TaskComment,
+    TeamMember,
+    User,
+)
+
+
+description = "Hot query path indexes and unique (doc_id, version)"
+
+
+def _renumber_duplicate_versions(connection: Connection) -> None:
+    """Give docs with colliding version numbers a clean 1..n sequence."""
+
+    versions = DocVersion.__table__
+    duplicated = connection.execute(
+        select(versions.c.doc_id)
+        .group_by(versions.c.doc_id, versions.c.version)
+        .having(func.count() > 1)
+        .distinct()
+    ).scalars().all()
+    for doc_id in duplicated:
+        ids = connection.execute(
+            select(versions.c.id)
+            .where(versions.c.doc_id == doc_id)
+            .order_by(versions.c.version, versions.c.id)
+        ).scalars().all()
+        # Negative numbers first so the final values never collide mid-update.
+        for number, version_id in enumerate(ids, start=1):
+            connection.execute(update(versions).where(versions.c.id == version_id).values(version=-number))
+        connection.execute(
+            update(versions).where(versions.c.doc_id == doc_id).values(version=-versions.c.version)
+        )
+
+
+def upgrade(connection: Connection) -> None:
+    _renumber_duplicate_versions(connection)
+    create_indexes(
+        connection,
+        (
+            model.__table__
+            for model in (
+                AuditLog,
+                User,
+                TeamMember,
+                Project,
+                Sprint,
+                Epic,
+                Task,
+                TaskComment,
+                Doc,
+                DocVersion,
+                DocSignature,
+                SupportTicket,
+                SupportComment,
+                IntegrationLog,
+                MarketplaceInstallation,
+            )
+        ),
+    )
@@ -0,0 +1,58 @@
+"""Task status history and daily burndown stats, seeded from existing tasks."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+
+from backend.migrations import create_indexes
+from backend.models import Task, TaskDailyStats, TaskStatus, TaskStatusEvent
+from backend.services.task_history import COUNTERS
+
+
+description = "Task status events and daily stats for burndown charts"
+
+
+def _seed_daily_stats(connection: Connection) -> None:
+    """Count every existing task as added on its creation day.
+
+    Completion dates were never stored, so tasks that are already done are
+    counted as completed on the day of the migration.
+    """
+
+    if connection.execute(select(func.count()).select_from(TaskDailyStats.__table__)).scalar():
+        return
+    tasks = Task.__table__.c
+    today = datetime.utcnow().date()
+    deltas = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    rows = connection.execution_options(yield_per=5000).execute(
+        select(tasks.project_id, tasks.sprint_id, tasks.created_at, tasks.status, tasks.estimate_hours)
+    )
+    for project_id, sprint_id, created_at, status, estimate in rows:
+        scope = (project_id or 0, sprint_id or 0)
+        added = deltas[scope + ((created_at or datetime.utcnow()).date(),)]
+        added["tasks_added"] += 1
+        added["hours_added"] += estimate or 0
+        if status == TaskStatus.done:
+            done = deltas[scope + (today,)]
+            done["tasks_done"] += 1
+            done["hours_done"] += estimate or 0
+    if deltas:
+        connection.execute(
+            TaskDailyStats.__table__.insert(),
+            [
+                {"project_id": project_id, "sprint_id": sprint_id, "day": day, **counters}
+                for (project_id, sprint_id, day), counters in deltas.items()
+            ],
+        )
+
+
+def upgrade(connection: Connection) -> None:
+    tables = [TaskStatusEvent.__table__, TaskDailyStats.__table__]
+    for table in tables:
+        table.create(connection, checkfirst=True)
+    create_indexes(connection, tables)
+    _seed_daily_stats(connection)
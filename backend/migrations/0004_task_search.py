@@ -0,0 +1,14 @@
+"""Full-text index over tasks and comments, built from existing rows."""
+
+from __future__ import annotations
+
+from sqlalchemy.engine import Connection
+
+from backend.services.task_search import reindex_all
+
+
+description = "Task full-text search index (tsvector + GIN on Postgres, FTS5 on SQLite)"
+
+
+def upgrade(connection: Connection) -> None:
+    reindex_all(connection, commit=False)
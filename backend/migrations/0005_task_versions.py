@@ -0,0 +1,19 @@
+"""Task.updated_at and Project.tasks_version for conditional GETs."""
+
+from __future__ import annotations
+
+from sqlalchemy import update
+from sqlalchemy.engine import Connection
+
+from backend.migrations import add_column
+from backend.models import Project, Task
+
+
+description = "Task updated_at and per-project task change counter"
+
+
+def upgrade(connection: Connection) -> None:
+    tasks = Task.__table__
+    if add_column(connection, tasks, "updated_at"):
+        connection.execute(update(tasks).values(updated_at=tasks.c.created_at))
+    add_column(connection, Project.__table__, "tasks_version")
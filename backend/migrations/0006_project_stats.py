@@ -0,0 +1,20 @@
+"""Per-project task counters, built from existing tasks."""
+
+from __future__ import annotations
+
+from sqlalchemy.engine import Connection
+
+from backend.migrations import create_indexes
+from backend.models import ProjectDueStats, ProjectStats
+from backend.services.project_stats import reconcile
+
+
+description = "Per-project task counters by status, priority, hours and due date"
+
+
+def upgrade(connection: Connection) -> None:
+    tables = [ProjectStats.__table__, ProjectDueStats.__table__]
+    for table in tables:
+        table.create(connection, checkfirst=True)
+    create_indexes(connection, tables)
+    reconcile(connection)
@@ -0,0 +1,31 @@
+"""Doc size and latest version columns for body-free listings."""
+
+from __future__ import annotations
+
+from sqlalchemy import LargeBinary, cast, func, select, text, update
+from sqlalchemy.engine import Connection
+
+from backend.migrations import add_column, create_indexes
+from backend.models import Doc, DocVersion
+
+
+description = "Doc size/latest_version and (updated_at, id) listing index"
+
+
+def upgrade(connection: Connection) -> None:
+    docs, versions = Doc.__table__, DocVersion.__table__
+    if add_column(connection, docs, "size"):
+        if connection.dialect.name == "postgresql":
+            size = func.octet_length(docs.c.content_md)
+        else:
+            size = func.length(cast(docs.c.content_md, LargeBinary))
+        connection.execute(update(docs).values(size=func.coalesce(size, 0)))
+    if add_column(connection, docs, "latest_version"):
+        latest = (
+            select(func.coalesce(func.max(versions.c.version), 0))
+            .where(versions.c.doc_id == docs.c.id)
+            .scalar_subquery()
+        )
+        connection.execute(update(docs).values(latest_version=latest))
+    connection.execute(text("DROP INDEX IF EXISTS ix_docs_updated_at"))
+    create_indexes(connection, [docs])
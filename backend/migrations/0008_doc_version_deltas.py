@@ -0,0 +1,19 @@
+"""Delta column for document versions.
+
+Existing full-copy rows stay valid as snapshots; ``python -m
+backend.services.doc_versions backfill`` converts them outside the deploy.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy.engine import Connection
+
+from backend.migrations import add_column
+from backend.models import DocVersion
+
+
+description = "Doc versions stored as deltas between periodic snapshots"
+
+
+def upgrade(connection: Connection) -> None:
+    add_column(connection, DocVersion.__table__, "delta")
@@ -0,0 +1,161 @@
+"""Versioned schema migrations.
+
+Every ``NNNN_<slug>.py`` module in this package is a revision exposing a
+``description`` string and an ``upgrade(connection)`` function. Revisions run
+in order, each in its own transaction, and are recorded in the
+``schema_migrations`` table so they apply exactly once per database.
+
+The baseline creates tables from the current models, so later revisions
+must tolerate objects that already exist on fresh databases — use
+:func:`create_indexes` and :func:`add_column`, which skip existing objects.
+
+    python -m backend.migrations upgrade
+    python -m backend.migrations status
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import pkgutil
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, List
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn
+
+
+MIGRATIONS_TABLE = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("revision", String(32), primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# Arbitrary key for pg_advisory_lock so concurrent deploys migrate one at a time.
+ADVISORY_LOCK_KEY = 7_304_220_411
+
+_REVISION_MODULE = re.compile(r"^\d{4}_\w+$")
+
+
+@dataclass(frozen=True)
+class Migration:
+    revision: str
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def discover() -> List[Migration]:
+    """Return every revision in this package, oldest first."""
+
+    migrations = []
+    for module in pkgutil.iter_modules(__path__):
+        if not _REVISION_MODULE.match(module.name):
+            continue
+        loaded = importlib.import_module(f"{__name__}.{module.name}")
+        migrations.append(Migration(module.name, loaded.description, loaded.upgrade))
+    return sorted(migrations, key=lambda migration: migration.revision)
+
+
+def applied_revisions(connection: Connection) -> set[str]:
+    if not inspect(connection).has_table(MIGRATIONS_TABLE.name):
+        return set()
+    revisions = connection.execute(MIGRATIONS_TABLE.select().with_only_columns(MIGRATIONS_TABLE.c.revision))
+    return set(revisions.scalars())
+
+
+def upgrade(engine: Engine | None = None) -> List[str]:
+    """Apply pending revisions and return the ones that ran."""
+
+    if engine is None:
+        from backend.database import get_engine
+
+        engine = get_engine()
+
+    ran: List[str] = []
+    with engine.connect() as connection:
+        is_postgres = connection.dialect.name == "postgresql"
+        if is_postgres:
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        try:
+            MIGRATIONS_TABLE.create(connection, checkfirst=True)
+            connection.commit()
+            done = applied_revisions(connection)
+            for migration in discover():
+                if migration.revision in done:
+                    continue
+                try:
+                    migration.upgrade(connection)
+                    connection.execute(
+                        MIGRATIONS_TABLE.insert().values(
+                            revision=migration.revision,
+                            description=migration.description,
+                            applied_at=datetime.utcnow(),
+                        )
+                    )
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    raise
+                ran.append(migration.revision)
+        finally:
+            if is_postgres:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+                connection.commit()
+    return ran
+
+
+def status(engine: Engine | None = None) -> List[dict]:
+    if engine is None:
+        from backend.database import get_engine
+
+        engine = get_engine()
+    with engine.connect() as connection:
+        done = applied_revisions(connection)
+    return [
+        {"revision": migration.revision, "description": migration.description, "applied": migration.revision in done}
+        for migration in discover()
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Helpers for revisions
+# ---------------------------------------------------------------------------
+
+
+def create_indexes(connection: Connection, tables: Iterable[Table]) -> None:
+    """Create every index declared on ``tables`` that does not exist yet."""
+
+    for table in tables:
+        existing = {index["name"] for index in inspect(connection).get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name not in existing:
+                index.create(connection)
+
+
+def add_column(connection: Connection, table: Table, column_name: str) -> bool:
+    """Add a model column to an existing table; returns ``False`` if already present."""
+
+    existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+    if column_name in existing:
+        return False
+    ddl = CreateColumn(table.c[column_name]).compile(dialect=connection.dialect)
+    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply or inspect schema migrations.")
+    parser.add_argument("command", choices=("upgrade", "status"), nargs="?", default="upgrade")
+    args = parser.parse_args()
+    if args.command == "status":
+        for row in status():
+            marker = "x" if row["applied"] else " "
+            print(f"[{marker}] {row['revision']}  {row['description']}")
+        return
+    ran = upgrade()
+    print("Applied: " + ", ".join(ran) if ran else "Database is up to date")
@@ -0,0 +1,4 @@
+from backend.migrations import main
+
+
+main()
@@ -1,4 +1,8 @@
-"""SQLAlchemy ORM models for UA FLOW backend."""
+"""SQLAlchemy ORM models for UA FLOW backend.
+
+Collection relationships are ``lazy="raise"``: endpoints declare what they
+load with :func:`backend.loading.eager` instead of relying on lazy loads.
+"""
 
 from __future__ import annotations
 
@@ -12,6 +16,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     JSON,
     String,
@@ -82,6 +87,9 @@ class SprintStatus(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
@@ -89,21 +97,24 @@ class User(Base):
     role = Column(String(50), default="user")
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    tasks = relationship("Task", back_populates="owner")
+    tasks = relationship("Task", back_populates="owner", foreign_keys="Task.owner_id", lazy="raise")
     assignments = relationship(
         "Task",
         back_populates="assignee",
         foreign_keys="Task.assignee_id",
+        lazy="raise",
     )
     tickets = relationship(
         "SupportTicket",
         back_populates="requester",
         foreign_keys="SupportTicket.requester_id",
+        lazy="raise",
     )
     ticket_assignments = relationship(
         "SupportTicket",
         back_populates="assignee",
         foreign_keys="SupportTicket.assignee_id",
+        lazy="raise",
     )
 
 
@@ -115,17 +126,21 @@ class Team(Base):
     description = Column(Text, default="")
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    projects = relationship("Project", back_populates="team")
+    projects = relationship("Project", back_populates="team", lazy="raise")
     members = relationship(
         "TeamMember",
         back_populates="team",
         cascade="all, delete-orphan",
+        lazy="raise",
     )
 
 
 class TeamMember(Base):
     __tablename__ = "team_members"
-    __table_args__ = (UniqueConstraint("team_id", "user_id", name="uq_team_user"),)
+    __table_args__ = (
+        UniqueConstraint("team_id", "user_id", name="uq_team_user"),
+        Index("ix_team_members_user_id", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
@@ -139,6 +154,11 @@ class TeamMember(Base):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_created_at", "created_at"),
+        Index("ix_projects_team_id", "team_id"),
+        Index("ix_projects_owner_id", "owner_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     key = Column(String(15), unique=True, nullable=False)
@@ -149,19 +169,25 @@ class Project(Base):
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped on every write to the project's tasks; versions board and task ETags.
+    tasks_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     team = relationship("Team", back_populates="projects")
     owner = relationship("User")
-    tasks = relationship("Task", back_populates="project")
+    tasks = relationship("Task", back_populates="project", lazy="raise")
     sprints = relationship(
         "Sprint",
         back_populates="project",
         cascade="all, delete-orphan",
+        lazy="raise",
     )
 
 
 class Sprint(Base):
     __tablename__ = "sprints"
+    __table_args__ = (
+        Index("ix_sprints_project_id", "project_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
@@ -172,11 +198,14 @@ class Sprint(Base):
     status = Column(Enum(SprintStatus), default=SprintStatus.planned)
 
     project = relationship("Project", back_populates="sprints")
-    tasks = relationship("Task", back_populates="sprint")
+    tasks = relationship("Task", back_populates="sprint", lazy="raise")
 
 
 class Epic(Base):
     __tablename__ = "epics"
+    __table_args__ = (
+        Index("ix_epics_project_id", "project_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
@@ -186,11 +215,23 @@ class Epic(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     project = relationship("Project")
-    tasks = relationship("Task", back_populates="epic")
+    tasks = relationship("Task", back_populates="epic", lazy="raise")
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # list_tasks for members: (owner OR assignee) newest first; workload
+        Index("ix_tasks_owner_created_at", "owner_id", "created_at"),
+        Index("ix_tasks_assignee_status_created_at", "assignee_id", "status", "created_at"),
+        # project filters, Kanban lanes and burndown
+        Index("ix_tasks_project_status_created_at", "project_id", "status", "created_at"),
+        Index("ix_tasks_sprint_status", "sprint_id", "status"),
+        Index("ix_tasks_epic_id", "epic_id"),
+        # unfiltered and status-only listings for staff, velocity
+        Index("ix_tasks_status_created_at", "status", "created_at"),
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -207,6 +248,7 @@ class Task(Base):
     sprint_id = Column(Integer, ForeignKey("sprints.id", ondelete="SET NULL"), nullable=True)
     epic_id = Column(Integer, ForeignKey("epics.id", ondelete="SET NULL"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     owner = relationship("User", back_populates="tasks", foreign_keys=[owner_id])
     assignee = relationship(
@@ -221,11 +263,15 @@ class Task(Base):
         "TaskComment",
         back_populates="task",
         cascade="all, delete-orphan",
+        lazy="raise",
     )
 
 
 class TaskComment(Base):
     __tablename__ = "task_comments"
+    __table_args__ = (
+        Index("ix_task_comments_task_created_at", "task_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
@@ -237,8 +283,112 @@ class TaskComment(Base):
     author = relationship("User")
 
 
+class TaskStatusEvent(Base):
+    """A change to a task's status, estimate or placement (project/sprint).
+
+    Task, project and sprint ids are plain columns so the history outlives
+    the rows it describes.
+    """
+
+    __tablename__ = "task_status_events"
+    __table_args__ = (
+        Index("ix_task_status_events_task_created_at", "task_id", "created_at"),
+        Index("ix_task_status_events_sprint_created_at", "sprint_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False)
+    actor_id = Column(Integer, nullable=True)
+    # None on creation (from_*) and deletion (to_*).
+    from_status = Column(Enum(TaskStatus), nullable=True)
+    to_status = Column(Enum(TaskStatus), nullable=True)
+    from_estimate = Column(Integer, nullable=True)
+    to_estimate = Column(Integer, nullable=True)
+    from_project_id = Column(Integer, nullable=True)
+    project_id = Column(Integer, nullable=True)
+    from_sprint_id = Column(Integer, nullable=True)
+    sprint_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class TaskDailyStats(Base):
+    """Scope and completion changes of one (project, sprint) on one day.
+
+    Maintained incrementally by :mod:`backend.services.task_history`;
+    burndown and burnup charts are running sums over these rows. ``0``
+    stands for "no project" / "no sprint" so the scope key stays unique.
+    """
+
+    __tablename__ = "task_daily_stats"
+    __table_args__ = (
+        Index("uq_task_daily_stats_scope_day", "project_id", "sprint_id", "day", unique=True),
+        Index("ix_task_daily_stats_sprint_day", "sprint_id", "day"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, nullable=False, default=0)
+    sprint_id = Column(Integer, nullable=False, default=0)
+    day = Column(Date, nullable=False)
+    tasks_added = Column(Integer, nullable=False, default=0)
+    tasks_removed = Column(Integer, nullable=False, default=0)
+    hours_added = Column(Integer, nullable=False, default=0)
+    hours_removed = Column(Integer, nullable=False, default=0)
+    # Net completions: reopening a done task counts negative.
+    tasks_done = Column(Integer, nullable=False, default=0)
+    hours_done = Column(Integer, nullable=False, default=0)
+
+
+class ProjectStats(Base):
+    """Current task counters of one (project, sprint).
+
+    Maintained incrementally by :mod:`backend.services.project_stats` in the
+    transaction of every task write; ``0`` stands for "no project" / "no
+    sprint" as in :class:`TaskDailyStats`.
+    """
+
+    __tablename__ = "project_stats"
+    __table_args__ = (Index("uq_project_stats_scope", "project_id", "sprint_id", unique=True),)
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, nullable=False, default=0)
+    sprint_id = Column(Integer, nullable=False, default=0)
+    tasks = Column(Integer, nullable=False, default=0)
+    tasks_todo = Column(Integer, nullable=False, default=0)
+    tasks_in_progress = Column(Integer, nullable=False, default=0)
+    tasks_review = Column(Integer, nullable=False, default=0)
+    tasks_done = Column(Integer, nullable=False, default=0)
+    priority_low = Column(Integer, nullable=False, default=0)
+    priority_medium = Column(Integer, nullable=False, default=0)
+    priority_high = Column(Integer, nullable=False, default=0)
+    priority_critical = Column(Integer, nullable=False, default=0)
+    estimate_hours = Column(Integer, nullable=False, default=0)
+    done_hours = Column(Integer, nullable=False, default=0)
+
+
+class ProjectDueStats(Base):
+    """Open (not done) tasks of one (project, sprint) due on one day.
+
+    Whether a task is overdue changes with the date alone, so instead of a
+    counter the rollup keeps open tasks by due date and the overdue count is
+    a sum over the days before today.
+    """
+
+    __tablename__ = "project_due_stats"
+    __table_args__ = (Index("uq_project_due_stats_scope_due", "project_id", "sprint_id", "due_date", unique=True),)
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, nullable=False, default=0)
+    sprint_id = Column(Integer, nullable=False, default=0)
+    due_date = Column(Date, nullable=False)
+    open_tasks = Column(Integer, nullable=False, default=0)
+
+
 class Doc(Base):
     __tablename__ = "docs"
+    __table_args__ = (
+        # list_docs keyset: most recently updated first
+        Index("ix_docs_updated_at_id", "updated_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -246,26 +396,37 @@ class Doc(Base):
     created_by = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Kept in step with content_md and versions so listings never read the body.
+    size = Column(Integer, nullable=False, default=0, server_default="0")
+    latest_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     versions = relationship(
         "DocVersion",
         back_populates="doc",
         cascade="all, delete-orphan",
+        lazy="raise",
     )
     signatures = relationship(
         "DocSignature",
         back_populates="doc",
         cascade="all, delete-orphan",
+        lazy="raise",
     )
 
 
 class DocVersion(Base):
     __tablename__ = "doc_versions"
+    __table_args__ = (
+        Index("uq_doc_versions_doc_version", "doc_id", "version", unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     doc_id = Column(Integer, ForeignKey("docs.id", ondelete="CASCADE"), nullable=False)
     version = Column(Integer, nullable=False)
+    # Snapshots store content_md; other versions store a delta against the
+    # previous version (see backend.services.doc_versions).
     content_md = Column(Text, nullable=True)
+    delta = Column(Text, nullable=True)
     created_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -275,6 +436,9 @@ class DocVersion(Base):
 
 class DocSignature(Base):
     __tablename__ = "doc_signatures"
+    __table_args__ = (
+        Index("ix_doc_signatures_doc_signed_at", "doc_id", "signed_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     doc_id = Column(Integer, ForeignKey("docs.id", ondelete="CASCADE"), nullable=False)
@@ -289,6 +453,12 @@ class DocSignature(Base):
 
 class SupportTicket(Base):
     __tablename__ = "support_tickets"
+    __table_args__ = (
+        Index("ix_support_tickets_requester_created_at", "requester_id", "created_at"),
+        Index("ix_support_tickets_assignee_created_at", "assignee_id", "created_at"),
+        Index("ix_support_tickets_status_created_at", "status", "created_at"),
+        Index("ix_support_tickets_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     subject = Column(String(255), nullable=False)
@@ -316,11 +486,15 @@ class SupportTicket(Base):
         "SupportComment",
         back_populates="ticket",
         cascade="all, delete-orphan",
+        lazy="raise",
     )
 
 
 class SupportComment(Base):
     __tablename__ = "support_comments"
+    __table_args__ = (
+        Index("ix_support_comments_ticket_created_at", "ticket_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     ticket_id = Column(Integer, ForeignKey("support_tickets.id", ondelete="CASCADE"), nullable=False)
@@ -351,11 +525,15 @@ class IntegrationConnection(Base):
         "IntegrationLog",
         back_populates="connection",
         cascade="all, delete-orphan",
+        lazy="raise",
     )
 
 
 class IntegrationLog(Base):
     __tablename__ = "integration_logs"
+    __table_args__ = (
+        Index("ix_integration_logs_connection_created_at", "connection_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     connection_id = Column(Integer, ForeignKey("integration_connections.id", ondelete="CASCADE"))
@@ -370,11 +548,19 @@ class IntegrationLog(Base):
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Keyset pagination walks (created_at, id) newest first, optionally
+        # narrowed to a single actor or an action prefix.
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+        Index("ix_audit_logs_actor_created_at", "actor_id", "created_at", "id"),
+        Index("ix_audit_logs_action_created_at", "action", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     actor_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
     action = Column(String(255), nullable=False)
-    metadata = Column(JSON, default=dict)
+    # ``metadata`` is reserved by the declarative API; keep it as the column name.
+    meta = Column("metadata", JSON, default=dict)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     actor = relationship("User")
@@ -421,6 +607,9 @@ class MarketplaceApp(Base):
 
 class MarketplaceInstallation(Base):
     __tablename__ = "marketplace_installations"
+    __table_args__ = (
+        Index("ix_marketplace_installations_app_id", "app_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     app_id = Column(Integer, ForeignKey("marketplace_apps.id", ondelete="CASCADE"))
@@ -1,3 +1,5 @@
-"""Router package exports for FastAPI include_router usage."""
+"""Router package exports for FastAPI include_router usage.
 
-from . import analytics, auth, docs, integration, projects, support, tasks, timebilling  # noqa: F401
+Submodules are imported by ``backend.main`` on demand so that loading one
+router (a worker, a script) does not pull in every other router.
+"""
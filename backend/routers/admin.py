@@ -2,80 +2,156 @@
 
 from __future__ import annotations
 
-from typing import List
-
-from fastapi import APIRouter, Depends, HTTPException
+import csv
+import io
+import json
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterator, List, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
-from backend.database import get_db
+from backend.database import SessionLocal, get_db, get_uow, on_commit, pool_metrics, replica_pool_metrics
 from backend.dependencies import audit_log, require_roles
-from backend.models import AuditLog as AuditLogModel
 from backend.models import Project, SupportTicket, SystemSetting, Task, TicketStatus, User
+from backend.pagination import decode_cursor, paginate, parse_datetime
 from backend.schemas import DashboardMetric, RoleUpdate, UserOut
+from backend.services.audit_archive import AUDIT_COLUMNS, AuditQuery, iter_audit_rows
+from backend.services.identity_cache import identity_cache
 
 
 router = APIRouter()
 
 
+def users_statement() -> Select:
+    return select(User).order_by(User.created_at.desc())
+
+
+def metrics_statements() -> Dict[str, Select]:
+    """One count per dashboard metric, by metric name."""
+
+    return {
+        "Projects": select(func.count()).select_from(Project),
+        "Tasks": select(func.count()).select_from(Task),
+        "Open Tickets": select(func.count()).where(SupportTicket.status != TicketStatus.resolved),
+        "Admins": select(func.count()).where(User.role == "admin"),
+    }
+
+
+def settings_statement() -> Select:
+    return select(SystemSetting)
+
+
 @router.get("/users", response_model=List[UserOut])
 def list_users(db: Session = Depends(get_db), user: User = Depends(require_roles("admin"))):
-    return db.query(User).order_by(User.created_at.desc()).all()
+    return db.scalars(users_statement()).all()
 
 
 @router.post("/users/{user_id}/role", response_model=UserOut)
 def set_user_role(
     user_id: int,
     payload: RoleUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     current: User = Depends(require_roles("admin")),
 ):
     target = db.get(User, user_id)
     if not target:
         raise HTTPException(status_code=404, detail="User not found")
     target.role = payload.role
-    db.commit()
-    db.refresh(target)
+    db.flush()
+    on_commit(db, lambda: identity_cache.invalidate(user_id))
     audit_log(current, "admin.role_set", {"user_id": user_id, "role": payload.role}, db)
     return target
 
 
+AUDIT_PAGE_MAX = 500
+AUDIT_EXPORT_BATCH = 1000
+
+
+def _stream_audit(query: AuditQuery, export_format: str) -> Iterator[str]:
+    """Yield an export chunk by chunk across every audit storage tier.
+
+    The request session is closed before a streaming body is sent, so the
+    export owns its own session for the lifetime of the stream.
+    """
+
+    with SessionLocal() as session:
+        rows = iter_audit_rows(session, query, batch=AUDIT_EXPORT_BATCH)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == "csv":
+            writer.writerow(AUDIT_COLUMNS)
+        while chunk := list(islice(rows, AUDIT_EXPORT_BATCH)):
+            for row in chunk:
+                if export_format == "csv":
+                    writer.writerow(
+                        [
+                            row["id"],
+                            row["actor_id"],
+                            row["action"],
+                            json.dumps(row["metadata"] or {}, ensure_ascii=False),
+                            row["created_at"].isoformat(),
+                        ]
+                    )
+                else:
+                    buffer.write(json.dumps(row, default=str, ensure_ascii=False) + "\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+
 @router.get("/audit", response_model=list[dict])
-def audit_trail(db: Session = Depends(get_db), user: User = Depends(require_roles("admin", "moderator"))):
-    logs = (
-        db.query(AuditLogModel)
-        .order_by(AuditLogModel.created_at.desc())
-        .limit(100)
-        .all()
-    )
-    return [
-        {
-            "id": log.id,
-            "actor_id": log.actor_id,
-            "action": log.action,
-            "metadata": log.metadata,
-            "created_at": log.created_at,
-        }
-        for log in logs
-    ]
+def audit_trail(
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(default=100, ge=1, le=AUDIT_PAGE_MAX),
+    actor_id: int | None = None,
+    action: str | None = Query(default=None, description="Action prefix, e.g. `task.`"),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    export: Literal["ndjson", "csv"] | None = Query(
+        default=None, description="Stream every matching row instead of a single page"
+    ),
+    db: Session = Depends(get_db),
+    user: User = Depends(require_roles("admin", "moderator")),
+):
+    query = AuditQuery(actor_id=actor_id, action=action, since=since, until=until)
+    if cursor:
+        created_at, last_id = decode_cursor(cursor, 2)
+        query.before = (parse_datetime(created_at), int(last_id))
+    if export:
+        media_type = "text/csv" if export == "csv" else "application/x-ndjson"
+        return StreamingResponse(
+            _stream_audit(query, export),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="audit.{export}"'},
+        )
+
+    rows = list(iter_audit_rows(db, query, limit=limit + 1))
+    return paginate(rows, limit, response, key=lambda row: (row["created_at"], row["id"]))
 
 
 @router.get("/metrics", response_model=list[DashboardMetric])
 def metrics(db: Session = Depends(get_db), user: User = Depends(require_roles("admin", "moderator"))):
-    total_projects = db.query(Project).count()
-    total_tasks = db.query(Task).count()
-    open_tickets = db.query(SupportTicket).filter(SupportTicket.status != TicketStatus.resolved).count()
-    admins = db.query(User).filter(User.role == "admin").count()
-    return [
-        DashboardMetric(name="Projects", value=total_projects),
-        DashboardMetric(name="Tasks", value=total_tasks),
-        DashboardMetric(name="Open Tickets", value=open_tickets),
-        DashboardMetric(name="Admins", value=admins),
-    ]
+    return [DashboardMetric(name=name, value=db.scalar(stmt)) for name, stmt in metrics_statements().items()]
+
+
+@router.get("/metrics/db")
+def database_metrics(user: User = Depends(require_roles("admin"))):
+    """Connection pool checkout wait times and utilisation since startup."""
+
+    return {"primary": pool_metrics.snapshot(), "replica": replica_pool_metrics.snapshot()}
 
 
 @router.get("/settings")
 def get_settings(db: Session = Depends(get_db), user: User = Depends(require_roles("admin"))):
-    records = db.query(SystemSetting).all()
+    records = db.scalars(settings_statement()).all()
     return {record.key: record.value for record in records}
 
 
@@ -83,7 +159,7 @@ def get_settings(db: Session = Depends(get_db), user: User = Depends(require_rol
 def set_setting(
     key: str,
     value: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(require_roles("admin")),
 ):
     record = db.get(SystemSetting, key)
@@ -92,6 +168,5 @@ def set_setting(
     else:
         record = SystemSetting(key=key, value=value)
         db.add(record)
-    db.commit()
     audit_log(user, "admin.setting_updated", {"key": key}, db)
     return {"key": key, "value": value}
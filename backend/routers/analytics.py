@@ -1,67 +1,57 @@
-"""Analytical endpoints powering dashboards."""
+"""Analytical endpoints powering dashboards; aggregation happens in SQL."""
 
 from __future__ import annotations
 
-from collections import Counter
 from datetime import date
 
 from fastapi import APIRouter, Depends
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
-from database import get_db
-from dependencies import get_current_user, require_roles
-from models import SupportTicket, Task, TaskStatus, TicketStatus, User
+from backend.database import get_read_db
+from backend.dependencies import get_current_user, require_roles
+from backend.models import SupportTicket, Task, TaskStatus, User
 
 
 router = APIRouter()
 
 
+def velocity_statement() -> Select:
+    return (
+        select(Task.project_id, func.count())
+        .where(Task.status == TaskStatus.done, Task.project_id.isnot(None))
+        .group_by(Task.project_id)
+    )
+
+
+def ticket_heatmap_statement() -> Select:
+    return select(SupportTicket.priority, SupportTicket.status, func.count()).group_by(
+        SupportTicket.priority, SupportTicket.status
+    )
+
+
+def workload_statement(user_id: int, today: date) -> Select:
+    """Open tasks assigned to ``user_id`` and how many of them are overdue."""
+
+    overdue = (Task.due_date.isnot(None)) & (Task.due_date < today)
+    return select(func.count(), func.count().filter(overdue)).where(
+        Task.assignee_id == user_id, Task.status != TaskStatus.done
+    )
+
+
 @router.get("/velocity")
-def velocity(db: Session = Depends(get_db), user: User = Depends(require_roles("admin", "moderator"))):
-    tasks = db.query(Task).filter(Task.status == TaskStatus.done).all()
-    by_project = Counter(task.project_id for task in tasks if task.project_id)
-    return {str(project_id): count for project_id, count in by_project.items()}
+def velocity(db: Session = Depends(get_read_db), user: User = Depends(require_roles("admin", "moderator"))):
+    return {str(project_id): count for project_id, count in db.execute(velocity_statement())}
 
 
 @router.get("/tickets/heatmap")
-def ticket_heatmap(db: Session = Depends(get_db), user: User = Depends(require_roles("admin", "moderator"))):
-    tickets = db.query(SupportTicket).all()
-    heatmap = Counter((ticket.priority.value, ticket.status.value) for ticket in tickets)
-    return {f"{priority}:{status}": count for (priority, status), count in heatmap.items()}
+def ticket_heatmap(db: Session = Depends(get_read_db), user: User = Depends(require_roles("admin", "moderator"))):
+    rows = db.execute(ticket_heatmap_statement())
+    return {f"{priority.value}:{status.value}": count for priority, status, count in rows}
 
 
 @router.get("/workload")
-def workload(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    owned = db.query(Task).filter(Task.assignee_id == user.id, Task.status != TaskStatus.done).count()
-    overdue = (
-        db.query(Task)
-        .filter(
-            Task.assignee_id == user.id,
-            Task.due_date.isnot(None),
-            Task.due_date < date.today(),
-            Task.status != TaskStatus.done,
-        )
-        .count()
-    )
+def workload(db: Session = Depends(get_read_db), user: User = Depends(get_current_user)):
+    owned, overdue = db.execute(workload_statement(user.id, date.today())).one()
     return {"open": owned, "overdue": overdue}
-
-
-@router.get("/timebilling/summary")
-def timebilling_summary(
-    project_id: int,
-    from_date: date | None = Query(default=None),
-    to_date: date | None = Query(default=None),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-):
-    project = db.get(Project, project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    actuals = calculate_project_actuals(db, project_id, from_date, to_date)
-    return {
-        "project_id": project_id,
-        "actual_cost": actuals["cost_total"],
-        "expenses_total": actuals["expenses_total"],
-        "hours_total": actuals["hours_total"],
-        "total_with_expenses": actuals["total_with_expenses"],
-    }
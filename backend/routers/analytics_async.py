@@ -0,0 +1,44 @@
+"""Asyncio versions of the dashboard analytics endpoints.
+
+Mounted in front of :mod:`backend.routers.analytics` when ``analytics`` is
+listed in ``UA_FLOW_ASYNC_ROUTERS``; both run the statements built in that
+module, which aggregate in SQL so the event loop only handles a few rows.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.async_database import get_async_read_db
+from backend.dependencies import get_current_user_async, require_roles
+from backend.services.identity_cache import UserSnapshot
+
+from .analytics import ticket_heatmap_statement, velocity_statement, workload_statement
+
+
+router = APIRouter()
+
+_staff = require_roles("admin", "moderator", source=get_current_user_async)
+
+
+@router.get("/velocity")
+async def velocity(db: AsyncSession = Depends(get_async_read_db), user: UserSnapshot = Depends(_staff)):
+    return {str(project_id): count for project_id, count in await db.execute(velocity_statement())}
+
+
+@router.get("/tickets/heatmap")
+async def ticket_heatmap(db: AsyncSession = Depends(get_async_read_db), user: UserSnapshot = Depends(_staff)):
+    rows = await db.execute(ticket_heatmap_statement())
+    return {f"{priority.value}:{status.value}": count for priority, status, count in rows}
+
+
+@router.get("/workload")
+async def workload(
+    db: AsyncSession = Depends(get_async_read_db),
+    user: UserSnapshot = Depends(get_current_user_async),
+):
+    owned, overdue = (await db.execute(workload_statement(user.id, date.today()))).one()
+    return {"open": owned, "overdue": overdue}
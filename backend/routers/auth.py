@@ -5,12 +5,15 @@ from __future__ import annotations
 from urllib.parse import quote
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
-from database import get_db
-from dependencies import audit_log, get_current_user
-from models import TwoFactorSecret, User
-from schemas import (
+from backend.database import get_db, get_uow, on_commit
+from backend.dependencies import audit_log, get_current_user
+from backend.models import TwoFactorSecret, User
+from backend.schemas import (
     RefreshTokenIn,
     RoleUpdate,
     TokenOut,
@@ -25,46 +28,88 @@ from backend.security import (
     create_refresh_token,
     decode_token,
     generate_totp_secret,
-    get_password_hash,
-    verify_password,
     verify_totp,
 )
+from backend.services.identity_cache import identity_cache
+from backend.services.password_hasher import HashingPoolSaturated, password_hasher
 
 
 router = APIRouter()
 
 
-@router.post("/register", response_model=UserOut, status_code=201)
-def register(payload: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == payload.email).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="User already exists")
+def user_by_email_statement(email: str) -> Select:
+    return select(User).where(User.email == email).limit(1)
+
+
+def two_factor_statement(user_id: int) -> Select:
+    return select(TwoFactorSecret).where(TwoFactorSecret.user_id == user_id).limit(1)
+
+
+def _get_user_by_email(db: Session, email: str) -> User | None:
+    return db.scalar(user_by_email_statement(email))
+
 
-    user = User(email=payload.email, password_hash=get_password_hash(payload.password))
+async def _hash_in_pool(call, *args):
+    """Run a hashing call on the dedicated pool, mapping saturation to 503."""
+
+    try:
+        return await call(*args)
+    except HashingPoolSaturated:
+        raise HTTPException(
+            status_code=503,
+            detail="Authentication is temporarily overloaded, retry shortly",
+            headers={"Retry-After": "1"},
+        ) from None
+
+
+def _create_user(db: Session, email: str, password_hash: str) -> User:
+    user = User(email=email, password_hash=password_hash)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
     audit_log(user, "user.registered", {"user_id": user.id}, db)
     return user
 
 
-@router.post("/login", response_model=TokenOut)
-def login(payload: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.password_hash):
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-
-    twofa = db.query(TwoFactorSecret).filter(TwoFactorSecret.user_id == user.id).first()
+def _issue_tokens(db: Session, user: User, payload: UserLogin, new_hash: str | None) -> TokenOut:
+    twofa = db.scalar(two_factor_statement(user.id))
     if twofa and twofa.enabled:
         if not payload.twofa_code or not verify_totp(payload.twofa_code, twofa.secret):
             raise HTTPException(status_code=401, detail="Invalid 2FA code")
 
+    if new_hash:
+        # The bcrypt cost changed since this hash was stored; upgrade it in place.
+        user.password_hash = new_hash
+
     access = create_access_token({"sub": str(user.id), "email": user.email, "role": user.role})
     refresh = create_refresh_token({"sub": str(user.id)})
     audit_log(user, "user.login", {"user_id": user.id}, db)
     return TokenOut(access_token=access, refresh_token=refresh)
 
 
+@router.post("/register", response_model=UserOut, status_code=201)
+async def register(payload: UserCreate, db: Session = Depends(get_uow)):
+    existing = await run_in_threadpool(_get_user_by_email, db, payload.email)
+    if existing:
+        raise HTTPException(status_code=400, detail="User already exists")
+
+    password_hash = await _hash_in_pool(password_hasher.hash, payload.password)
+    return await run_in_threadpool(_create_user, db, payload.email, password_hash)
+
+
+@router.post("/login", response_model=TokenOut)
+async def login(payload: UserLogin, db: Session = Depends(get_uow)):
+    user = await run_in_threadpool(_get_user_by_email, db, payload.email)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    valid, new_hash = await _hash_in_pool(
+        password_hasher.verify_and_update, payload.password, user.password_hash
+    )
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    return await run_in_threadpool(_issue_tokens, db, user, payload, new_hash)
+
+
 @router.post("/refresh", response_model=TokenOut)
 def refresh(payload: RefreshTokenIn, db: Session = Depends(get_db)):
     try:
@@ -90,29 +135,31 @@ def me(user: User = Depends(get_current_user)):
 @router.post("/me/role", response_model=UserOut)
 def update_role(
     payload: RoleUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
     if user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admins can change role")
-    user.role = payload.role
-    db.commit()
-    db.refresh(user)
-    audit_log(user, "user.role_updated", {"role": user.role}, db)
-    return user
+    record = db.get(User, user.id)
+    if not record:
+        raise HTTPException(status_code=404, detail="User not found")
+    record.role = payload.role
+    db.flush()
+    on_commit(db, lambda: identity_cache.invalidate(user.id))
+    audit_log(record, "user.role_updated", {"role": record.role}, db)
+    return record
 
 
 @router.post("/2fa/setup", response_model=TwoFactorSetupOut)
-def setup_2fa(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+def setup_2fa(db: Session = Depends(get_uow), user: User = Depends(get_current_user)):
     secret = generate_totp_secret()
-    record = db.query(TwoFactorSecret).filter(TwoFactorSecret.user_id == user.id).first()
+    record = db.scalar(two_factor_statement(user.id))
     if record:
         record.secret = secret
         record.enabled = 0
     else:
         record = TwoFactorSecret(user_id=user.id, secret=secret, enabled=0)
         db.add(record)
-    db.commit()
 
     issuer = quote("UA FLOW")
     uri = f"otpauth://totp/{issuer}:{quote(user.email)}?secret={secret}&issuer={issuer}"
@@ -123,26 +170,24 @@ def setup_2fa(db: Session = Depends(get_db), user: User = Depends(get_current_us
 @router.post("/2fa/enable")
 def enable_2fa(
     payload: TwoFactorVerifyIn,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
-    record = db.query(TwoFactorSecret).filter(TwoFactorSecret.user_id == user.id).first()
+    record = db.scalar(two_factor_statement(user.id))
     if not record:
         raise HTTPException(status_code=400, detail="2FA not initialized")
     if not verify_totp(payload.code, record.secret):
         raise HTTPException(status_code=400, detail="Invalid verification code")
     record.enabled = 1
-    db.commit()
     audit_log(user, "user.2fa.enabled", {"user_id": user.id}, db)
     return {"enabled": True}
 
 
 @router.post("/2fa/disable")
-def disable_2fa(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    record = db.query(TwoFactorSecret).filter(TwoFactorSecret.user_id == user.id).first()
+def disable_2fa(db: Session = Depends(get_uow), user: User = Depends(get_current_user)):
+    record = db.scalar(two_factor_statement(user.id))
     if not record:
         raise HTTPException(status_code=400, detail="2FA not enabled")
     record.enabled = 0
-    db.commit()
     audit_log(user, "user.2fa.disabled", {"user_id": user.id}, db)
     return {"enabled": False}
@@ -0,0 +1,102 @@
+"""Asyncio versions of the login path.
+
+Mounted in front of :mod:`backend.routers.auth` when ``auth`` is listed in
+``UA_FLOW_ASYNC_ROUTERS``. Database access stays on the event loop and only
+bcrypt runs on the dedicated hashing pool.
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.async_database import get_async_db, get_async_uow
+from backend.dependencies import audit_log, get_current_user_async
+from backend.models import User
+from backend.schemas import RefreshTokenIn, TokenOut, UserCreate, UserLogin, UserOut
+from backend.security import create_access_token, create_refresh_token, decode_token, verify_totp
+from backend.services.identity_cache import UserSnapshot
+from backend.services.password_hasher import HashingPoolSaturated, password_hasher
+
+from .auth import two_factor_statement, user_by_email_statement
+
+
+router = APIRouter()
+
+
+async def _hash_in_pool(call, *args):
+    """Run a hashing call on the dedicated pool, mapping saturation to 503."""
+
+    try:
+        return await call(*args)
+    except HashingPoolSaturated:
+        raise HTTPException(
+            status_code=503,
+            detail="Authentication is temporarily overloaded, retry shortly",
+            headers={"Retry-After": "1"},
+        ) from None
+
+
+async def _get_user_by_email(db: AsyncSession, email: str) -> User | None:
+    return await db.scalar(user_by_email_statement(email))
+
+
+@router.post("/register", response_model=UserOut, status_code=201)
+async def register(payload: UserCreate, db: AsyncSession = Depends(get_async_uow)):
+    if await _get_user_by_email(db, payload.email):
+        raise HTTPException(status_code=400, detail="User already exists")
+
+    password_hash = await _hash_in_pool(password_hasher.hash, payload.password)
+    user = User(email=payload.email, password_hash=password_hash)
+    db.add(user)
+    await db.flush()
+    audit_log(user, "user.registered", {"user_id": user.id}, db)
+    return user
+
+
+@router.post("/login", response_model=TokenOut)
+async def login(payload: UserLogin, db: AsyncSession = Depends(get_async_uow)):
+    user = await _get_user_by_email(db, payload.email)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    valid, new_hash = await _hash_in_pool(
+        password_hasher.verify_and_update, payload.password, user.password_hash
+    )
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    twofa = await db.scalar(two_factor_statement(user.id))
+    if twofa and twofa.enabled:
+        if not payload.twofa_code or not verify_totp(payload.twofa_code, twofa.secret):
+            raise HTTPException(status_code=401, detail="Invalid 2FA code")
+
+    if new_hash:
+        # The bcrypt cost changed since this hash was stored; upgrade it in place.
+        user.password_hash = new_hash
+
+    access = create_access_token({"sub": str(user.id), "email": user.email, "role": user.role})
+    refresh = create_refresh_token({"sub": str(user.id)})
+    audit_log(user, "user.login", {"user_id": user.id}, db)
+    return TokenOut(access_token=access, refresh_token=refresh)
+
+
+@router.post("/refresh", response_model=TokenOut)
+async def refresh(payload: RefreshTokenIn, db: AsyncSession = Depends(get_async_db)):
+    try:
+        data = decode_token(payload.refresh_token)
+    except Exception:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if data.get("type") != "refresh":
+        raise HTTPException(status_code=401, detail="Not a refresh token")
+
+    user = await db.get(User, int(data.get("sub", 0)))
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    access = create_access_token({"sub": str(user.id), "email": user.email, "role": user.role})
+    refresh_token = create_refresh_token({"sub": str(user.id)})
+    return TokenOut(access_token=access, refresh_token=refresh_token)
+
+
+@router.get("/me", response_model=UserOut)
+async def me(user: UserSnapshot = Depends(get_current_user_async)):
+    return user
@@ -2,44 +2,107 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+import os
+from datetime import datetime
+from typing import Literal, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
-from backend.database import get_db
+from backend.database import get_db, get_read_db, get_uow, on_commit
 from backend.dependencies import audit_log, get_current_user
 from backend.models import Doc, DocSignature, DocVersion, User
+from backend.pagination import decode_cursor, paginate, parse_datetime
 from backend.schemas import (
     DocCreate,
+    DocDiffOut,
     DocOut,
     DocSignatureCreate,
     DocSignatureOut,
+    DocSummaryOut,
     DocUpdate,
     DocVersionOut,
 )
+from backend.services.doc_diff import DOC_DIFF_CONTEXT, build_diff, diff_cache
+from backend.services.doc_versions import materialize, new_version, version_content
 
 
 router = APIRouter()
 
+DOC_PAGE_DEFAULT = 50
+DOC_PAGE_MAX = int(os.getenv("DOC_PAGE_MAX", "200"))
+
+# What a listing row reads; content_md is only added on request.
+DOC_SUMMARY_COLUMNS = (Doc.id, Doc.title, Doc.created_by, Doc.updated_at, Doc.size, Doc.latest_version)
+
+
+def _content_size(content: Optional[str]) -> int:
+    return len((content or "").encode("utf-8"))
+
+
+def docs_page_statement(bound: Optional[Tuple[datetime, int]], limit: int, content: bool = False) -> Select:
+    """Summaries after the ``(updated_at, id)`` ``bound``, newest first, plus one row to detect a next page."""
+
+    stmt = select(*DOC_SUMMARY_COLUMNS, *((Doc.content_md,) if content else ()))
+    if bound is not None:
+        stmt = stmt.where(tuple_(Doc.updated_at, Doc.id) < tuple_(*bound))
+    return stmt.order_by(Doc.updated_at.desc(), Doc.id.desc()).limit(limit + 1)
+
+
+def versions_statement(doc_id: int) -> Select:
+    return select(DocVersion).where(DocVersion.doc_id == doc_id).order_by(DocVersion.version)
 
-@router.get("/", response_model=list[DocOut])
-def list_docs(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    return db.query(Doc).order_by(Doc.updated_at.desc()).all()
+
+def signatures_statement(doc_id: int) -> Select:
+    return select(DocSignature).where(DocSignature.doc_id == doc_id).order_by(DocSignature.signed_at.desc())
+
+
+@router.get("/", response_model=list[DocSummaryOut])
+def list_docs(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=DOC_PAGE_DEFAULT, ge=1, le=DOC_PAGE_MAX),
+    include: Optional[Literal["content"]] = None,
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
+    """Most recently updated documents first, without their bodies; follow ``X-Next-Cursor``.
+
+    ``include=content`` adds each document's ``content_md``; otherwise the
+    body is only served by ``GET /docs/{doc_id}``.
+    """
+
+    bound = None
+    if cursor:
+        updated_at, last_id = decode_cursor(cursor, 2)
+        try:
+            bound = (parse_datetime(updated_at), int(last_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    rows = db.execute(docs_page_statement(bound, limit, include == "content")).all()
+    return paginate(rows, limit, response, key=lambda row: (row.updated_at, row.id))
 
 
 @router.post("/", response_model=DocOut, status_code=201)
 def create_doc(
     payload: DocCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
-    doc = Doc(title=payload.title, content_md=payload.content_md or "", created_by=user.id)
+    content = payload.content_md or ""
+    doc = Doc(
+        title=payload.title,
+        content_md=content,
+        created_by=user.id,
+        size=_content_size(content),
+        latest_version=1,
+    )
     db.add(doc)
-    db.commit()
-    db.refresh(doc)
+    db.flush()
 
-    version = DocVersion(doc_id=doc.id, version=1, content_md=doc.content_md, created_by=user.id)
-    db.add(version)
-    db.commit()
+    db.add(new_version(doc.id, 1, content, None, user.id))
     audit_log(user, "doc.created", {"doc_id": doc.id}, db)
     return doc
 
@@ -56,67 +119,115 @@ def get_doc(doc_id: int, db: Session = Depends(get_db), user: User = Depends(get
 def update_doc(
     doc_id: int,
     payload: DocUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
-    doc = db.get(Doc, doc_id)
+    # The new version is stored as a delta against the current text, so
+    # concurrent saves must see each other's result: lock the row.
+    doc = db.get(Doc, doc_id, with_for_update=True)
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
 
+    previous = doc.content_md or ""
     data = payload.model_dump(exclude_unset=True)
-    for field, value in data.items():
+    if "content_md" in data:
+        data["content_md"] = data["content_md"] or ""
+    changes = {field: value for field, value in data.items() if getattr(doc, field) != value}
+    if not changes:
+        # Saving what is already stored writes neither a version nor an audit record.
+        return doc
+    for field, value in changes.items():
         setattr(doc, field, value)
-    db.commit()
-    db.refresh(doc)
-
-    latest_version = (
-        db.query(DocVersion)
-        .filter(DocVersion.doc_id == doc.id)
-        .order_by(DocVersion.version.desc())
-        .first()
-    )
-    new_version_number = (latest_version.version if latest_version else 0) + 1
-    db.add(
-        DocVersion(
-            doc_id=doc.id,
-            version=new_version_number,
-            content_md=doc.content_md,
-            created_by=user.id,
-        )
+    if "content_md" in changes:
+        doc.size = _content_size(doc.content_md)
+        doc.latest_version += 1
+        db.add(new_version(doc.id, doc.latest_version, doc.content_md, previous, user.id))
+    db.flush()
+    audit_log(
+        user, "doc.updated", {"doc_id": doc.id, "fields": sorted(changes), "version": doc.latest_version}, db
     )
-    db.commit()
-    audit_log(user, "doc.updated", {"doc_id": doc.id, "version": new_version_number}, db)
     return doc
 
 
 @router.delete("/{doc_id}", status_code=204)
-def delete_doc(doc_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+def delete_doc(doc_id: int, db: Session = Depends(get_uow), user: User = Depends(get_current_user)):
     doc = db.get(Doc, doc_id)
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
     db.delete(doc)
-    db.commit()
+    on_commit(db, lambda: diff_cache.invalidate_doc(doc_id))
     audit_log(user, "doc.deleted", {"doc_id": doc_id}, db)
 
 
 @router.get("/{doc_id}/versions", response_model=list[DocVersionOut])
 def list_versions(doc_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+    """Every version, newest first, each rebuilt from its snapshot and deltas in one pass."""
+
     doc = db.get(Doc, doc_id)
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
-    return (
-        db.query(DocVersion)
-        .filter(DocVersion.doc_id == doc_id)
-        .order_by(DocVersion.version.desc())
-        .all()
-    )
+    rows = db.scalars(versions_statement(doc_id))
+    versions = [
+        DocVersionOut.model_validate(row).model_copy(update={"content_md": content})
+        for row, content in materialize(rows)
+    ]
+    return versions[::-1]
+
+
+@router.get("/{doc_id}/versions/{version}", response_model=DocVersionOut)
+def get_version(doc_id: int, version: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+    found = version_content(db, doc_id, version)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Version not found")
+    row, content = found
+    return DocVersionOut.model_validate(row).model_copy(update={"content_md": content})
+
+
+@router.get(
+    "/{doc_id}/versions/{from_version}/diff/{to_version}",
+    response_model=DocDiffOut,
+    response_model_exclude_none=True,
+)
+def diff_versions(
+    doc_id: int,
+    from_version: int,
+    to_version: int,
+    context: int = Query(default=DOC_DIFF_CONTEXT, ge=0, le=50),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
+    """Line hunks (with word-level changes) turning ``from_version`` into ``to_version``.
+
+    Versions are immutable, so the result is computed once per version pair
+    and context size and then served from :data:`diff_cache`.
+    """
+
+    if not db.get(Doc, doc_id):
+        raise HTTPException(status_code=404, detail="Document not found")
+    key = (doc_id, from_version, to_version, context)
+    diff = diff_cache.get(key)
+    if diff is None:
+        texts = []
+        for number in (from_version, to_version):
+            found = version_content(db, doc_id, number)
+            if found is None:
+                raise HTTPException(status_code=404, detail=f"Version {number} not found")
+            texts.append(found[1])
+        diff = {
+            "doc_id": doc_id,
+            "from_version": from_version,
+            "to_version": to_version,
+            **build_diff(texts[0], texts[1], context),
+        }
+        diff_cache.put(key, diff)
+    return diff
 
 
 @router.post("/{doc_id}/sign", response_model=DocSignatureOut, status_code=201)
 def sign_document(
     doc_id: int,
     payload: DocSignatureCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
     doc = db.get(Doc, doc_id)
@@ -130,8 +241,7 @@ def sign_document(
         signature_payload=payload.signature_payload,
     )
     db.add(signature)
-    db.commit()
-    db.refresh(signature)
+    db.flush()
     audit_log(
         user,
         "doc.signed",
@@ -146,9 +256,4 @@ def get_signatures(doc_id: int, db: Session = Depends(get_db), user: User = Depe
     doc = db.get(Doc, doc_id)
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
-    return (
-        db.query(DocSignature)
-        .filter(DocSignature.doc_id == doc_id)
-        .order_by(DocSignature.signed_at.desc())
-        .all()
-    )
+    return db.scalars(signatures_statement(doc_id)).all()
@@ -10,9 +10,11 @@ import hmac
 from typing import Any, Dict, Iterable
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
-from backend.database import get_db
+from backend.database import get_db, get_uow
 from backend.dependencies import audit_log, get_current_user, require_roles
 from backend.models import (
     IntegrationConnection,
@@ -109,9 +111,7 @@ def _record_log(
         connection.last_sync_status = f"Failed ({status})"
     db.add(log)
     db.add(connection)
-    db.commit()
-    db.refresh(log)
-    db.refresh(connection)
+    db.flush()
     return log
 
 
@@ -120,7 +120,7 @@ def _ensure_marketplace_catalog(db: Session) -> None:
         return
     for item in DEFAULT_MARKETPLACE_APPS:
         db.add(MarketplaceApp(**item))
-    db.commit()
+    db.flush()
 
 
 def _serialize_marketplace_app(
@@ -158,7 +158,7 @@ def list_integrations(
 @router.post("/connections", response_model=IntegrationOut, status_code=201)
 def create_integration(
     payload: IntegrationCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(require_roles("admin", "integrator")),
 ):
     conn = IntegrationConnection(
@@ -168,8 +168,7 @@ def create_integration(
         settings=payload.settings or {},
     )
     db.add(conn)
-    db.commit()
-    db.refresh(conn)
+    db.flush()
     audit_log(user, "integration.created", {"connection_id": conn.id}, db)
     return conn
 
@@ -178,7 +177,7 @@ def create_integration(
 def update_integration(
     connection_id: int,
     payload: IntegrationUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(require_roles("admin", "integrator")),
 ):
     conn = db.get(IntegrationConnection, connection_id)
@@ -195,8 +194,7 @@ def update_integration(
     if "settings" in data:
         conn.settings = data["settings"] or {}
     db.add(conn)
-    db.commit()
-    db.refresh(conn)
+    db.flush()
     audit_log(user, "integration.updated", {"connection_id": conn.id}, db)
     return _serialize_connection(conn)
 
@@ -208,7 +206,7 @@ def update_integration(
 )
 def test_integration(
     connection_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(require_roles("admin", "integrator")),
 ):
     conn = db.get(IntegrationConnection, connection_id)
@@ -220,6 +218,8 @@ def test_integration(
         result = client.ping()
     except IntegrationError as exc:
         _record_log(db, conn, "error", {"action": "test", "error": str(exc)}, 0)
+        # Keep the failure log even though the request itself errors out.
+        db.commit()
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
     _record_log(
@@ -241,7 +241,7 @@ def test_integration(
 def trigger_sync(
     connection_id: int,
     payload: Dict[str, Any],
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(require_roles("admin", "integrator")),
 ):
     conn = db.get(IntegrationConnection, connection_id)
@@ -250,27 +250,6 @@ def trigger_sync(
     if not conn.is_active:
         raise HTTPException(status_code=400, detail="Integration disabled")
 
-    # Simulate an exchange by storing the payload as JSON.
-    serialized = json.dumps(payload, ensure_ascii=False)
-    log = IntegrationLog(
-        connection_id=conn.id,
-        direction="outbound",
-        status="success",
-        payload=serialized[:2000],
-    )
-    db.add(log)
-    db.commit()
-    db.refresh(log)
-    audit_log(
-        user,
-        "integration.sync",
-        {"connection_id": conn.id, "log_id": log.id},
-        db,
-    )
-    return log
-
-
-@router.get("/{connection_id}/logs", response_model=list[IntegrationLogOut])
     client = build_client(conn.integration_type, conn.settings)
     try:
         result = client.sync(payload or {})
@@ -282,6 +261,7 @@ def trigger_sync(
             {"action": "sync", "payload": payload, "error": str(exc)},
             0,
         )
+        db.commit()
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
     _record_log(
@@ -298,6 +278,14 @@ def trigger_sync(
     )
 
 
+def logs_statement(connection_id: int) -> Select:
+    return (
+        select(IntegrationLog)
+        .where(IntegrationLog.connection_id == connection_id)
+        .order_by(IntegrationLog.created_at.desc())
+    )
+
+
 @router.get(
     "/connections/{connection_id}/logs",
     response_model=list[IntegrationLogOut],
@@ -310,16 +298,7 @@ def list_logs(
     conn = db.get(IntegrationConnection, connection_id)
     if not conn:
         raise HTTPException(status_code=404, detail="Integration not found")
-    return (
-        db.query(IntegrationLog)
-        .filter(IntegrationLog.connection_id == connection_id)
-        .order_by(IntegrationLog.created_at.desc())
-        .all()
-    )
-            .filter(IntegrationLog.connection_id == connection_id)
-            .order_by(IntegrationLog.created_at.desc())
-            .all()
-    )
+    return db.scalars(logs_statement(connection_id)).all()
 
 
 # ---------------------------------------------------------------------------
@@ -327,17 +306,22 @@ def list_logs(
 # ---------------------------------------------------------------------------
 
 
+def marketplace_statement() -> Select:
+    return select(MarketplaceApp).order_by(MarketplaceApp.name)
+
+
+def installations_statement() -> Select:
+    return select(MarketplaceInstallation).order_by(MarketplaceInstallation.installed_at.desc())
+
+
 @router.get("/marketplace", response_model=list[MarketplaceAppOut])
 def list_marketplace_apps(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(require_roles("admin", "integrator", "moderator")),
 ):
     _ensure_marketplace_catalog(db)
-    apps = db.query(MarketplaceApp).order_by(MarketplaceApp.name).all()
-    installations = {
-        inst.app_id: inst
-        for inst in db.query(MarketplaceInstallation).order_by(MarketplaceInstallation.installed_at.desc())
-    }
+    apps = db.scalars(marketplace_statement()).all()
+    installations = {inst.app_id: inst for inst in db.scalars(installations_statement())}
     return [_serialize_marketplace_app(app, installations.get(app.id)) for app in apps]
 
 
@@ -348,7 +332,7 @@ def list_marketplace_apps(
 )
 def install_marketplace_app(
     app_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(require_roles("admin", "integrator")),
 ):
     _ensure_marketplace_catalog(db)
@@ -369,8 +353,7 @@ def install_marketplace_app(
 
     installation = MarketplaceInstallation(app_id=app.id, installed_by=user.id, settings={})
     db.add(installation)
-    db.commit()
-    db.refresh(installation)
+    db.flush()
     audit_log(user, "marketplace.install", {"app_id": app.id}, db)
     return MarketplaceInstallOut(
         message="Application installed",
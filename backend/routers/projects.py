@@ -2,17 +2,25 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
-from backend.database import get_db
+from backend.database import get_db, get_uow, on_commit
 from backend.dependencies import audit_log, get_current_user, require_roles
+from backend.http_cache import collection_version, make_etag, not_modified
+from backend.loading import eager
 from backend.models import Epic, Project, Sprint, Team, TeamMember, User
 from backend.schemas import (
     EpicCreate,
     EpicOut,
     ProjectCreate,
     ProjectOut,
+    ProjectStatsOut,
     ProjectUpdate,
     SprintCreate,
     SprintOut,
@@ -20,35 +28,55 @@ from backend.schemas import (
     TeamCreate,
     TeamOut,
 )
+from backend.services.project_acl import UNRESTRICTED, ProjectAccess, project_acl
+from backend.services.project_stats import project_summaries
 
 
 router = APIRouter()
 
 
+def teams_statement(user) -> Select:
+    """The teams ``user`` belongs to (every team for staff), with their members."""
+
+    stmt = select(Team).options(*eager(Team, "members"))
+    if user.role in {"admin", "moderator"}:
+        return stmt
+    return stmt.join(TeamMember).where(TeamMember.user_id == user.id)
+
+
+def projects_statement(user, access: ProjectAccess) -> Select:
+    """The projects ``user`` owns or may access through ``access``, newest first."""
+
+    stmt = select(Project)
+    if user.role not in {"admin", "moderator"}:
+        stmt = stmt.where((Project.owner_id == user.id) | access.clause(Project.id))
+    return stmt.order_by(Project.created_at.desc())
+
+
+def project_key_statement(key: str) -> Select:
+    return select(Project).where(Project.key == key).limit(1)
+
+
+def epics_statement(project_id: int) -> Select:
+    return select(Epic).where(Epic.project_id == project_id)
+
+
 @router.get("/teams", response_model=list[TeamOut])
 def list_teams(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    if user.role in {"admin", "moderator"}:
-        return db.query(Team).all()
-    return (
-        db.query(Team)
-        .join(TeamMember)
-        .filter(TeamMember.user_id == user.id)
-        .all()
-    )
+    return db.scalars(teams_statement(user)).all()
 
 
 @router.post("/teams", response_model=TeamOut, status_code=201)
 def create_team(
     payload: TeamCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(require_roles("admin", "moderator")),
 ):
     team = Team(name=payload.name, description=payload.description or "")
+    team.members.append(TeamMember(user_id=user.id, role="owner"))
     db.add(team)
-    db.commit()
-    db.refresh(team)
-    db.add(TeamMember(team_id=team.id, user_id=user.id, role="owner"))
-    db.commit()
+    db.flush()
+    on_commit(db, lambda: project_acl.invalidate([user.id]))
     audit_log(user, "team.created", {"team_id": team.id}, db)
     return team
 
@@ -58,48 +86,62 @@ def add_team_member(
     team_id: int,
     user_id: int,
     role: str = "member",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(require_roles("admin", "moderator")),
 ):
-    team = db.get(Team, team_id)
+    team = db.get(Team, team_id, options=eager(Team, "members"))
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     if not db.get(User, user_id):
         raise HTTPException(status_code=404, detail="User not found")
 
-    existing = (
-        db.query(TeamMember)
-        .filter(TeamMember.team_id == team_id, TeamMember.user_id == user_id)
-        .first()
-    )
+    existing = next((member for member in team.members if member.user_id == user_id), None)
     if existing:
         existing.role = role
     else:
-        db.add(TeamMember(team_id=team_id, user_id=user_id, role=role))
-    db.commit()
-    db.refresh(team)
+        team.members.append(TeamMember(user_id=user_id, role=role))
+    db.flush()
+    on_commit(db, lambda: project_acl.invalidate([user_id]))
     audit_log(user, "team.member_added", {"team_id": team_id, "user_id": user_id}, db)
     return team
 
 
+def _with_stats(db: Session, projects: List[Project]) -> List[ProjectOut]:
+    summaries = project_summaries(db, [project.id for project in projects])
+    results = []
+    for project in projects:
+        summary = summaries.get(project.id)
+        # model_copy does not validate its update, so build the nested model here.
+        stats = ProjectStatsOut.model_validate(summary) if summary is not None else None
+        results.append(ProjectOut.model_validate(project).model_copy(update={"stats": stats}))
+    return results
+
+
 @router.get("/projects", response_model=list[ProjectOut])
-def list_projects(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    query = db.query(Project)
-    if user.role not in {"admin", "moderator"}:
-        query = query.join(Team, isouter=True).join(TeamMember, isouter=True).filter(
-            (Project.owner_id == user.id)
-            | (TeamMember.user_id == user.id)
-        )
-    return query.order_by(Project.created_at.desc()).distinct().all()
+def list_projects(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    access = UNRESTRICTED if user.role in {"admin", "moderator"} else project_acl.get(db, user)
+    stmt = projects_statement(user, access)
+    # Task writes bump tasks_version and the overdue counts move with the date.
+    version = collection_version(db, stmt, Project.updated_at, func.sum(Project.tasks_version))
+    today = datetime.utcnow().date()
+    cached = not_modified(request, response, make_etag("projects", user.id, *version, today))
+    if cached:
+        return cached
+    return _with_stats(db, db.scalars(stmt).all())
 
 
 @router.post("/projects", response_model=ProjectOut, status_code=201)
 def create_project(
     payload: ProjectCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
-    if db.query(Project).filter(Project.key == payload.key).first():
+    if db.scalar(project_key_statement(payload.key)):
         raise HTTPException(status_code=400, detail="Project key already exists")
     if payload.team_id and not db.get(Team, payload.team_id):
         raise HTTPException(status_code=404, detail="Team not found")
@@ -112,17 +154,18 @@ def create_project(
         team_id=payload.team_id,
     )
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    db.flush()
+    project_acl.invalidate_team(db, project.team_id)
+    on_commit(db, lambda: project_acl.invalidate([user.id]))
     audit_log(user, "project.created", {"project_id": project.id}, db)
-    return project
+    return _with_stats(db, [project])[0]
 
 
 @router.put("/projects/{project_id}", response_model=ProjectOut)
 def update_project(
     project_id: int,
     payload: ProjectUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
     project = db.get(Project, project_id)
@@ -133,19 +176,23 @@ def update_project(
     if user.role not in {"admin", "moderator"} and project.owner_id != user.id:
         raise HTTPException(status_code=403, detail="Forbidden")
 
+    previous_team_id = project.team_id
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(project, field, value)
-    db.commit()
-    db.refresh(project)
+    db.flush()
+    if project.team_id != previous_team_id:
+        project_acl.invalidate_team(db, previous_team_id, project.team_id)
+        owner_id = project.owner_id
+        on_commit(db, lambda: project_acl.invalidate([owner_id]))
     audit_log(user, "project.updated", {"project_id": project.id}, db)
-    return project
+    return _with_stats(db, [project])[0]
 
 
 @router.post("/projects/{project_id}/sprints", response_model=SprintOut, status_code=201)
 def create_sprint(
     project_id: int,
     payload: SprintCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
     project = db.get(Project, project_id)
@@ -162,8 +209,7 @@ def create_sprint(
         end_date=payload.end_date,
     )
     db.add(sprint)
-    db.commit()
-    db.refresh(sprint)
+    db.flush()
     audit_log(user, "sprint.created", {"project_id": project.id, "sprint_id": sprint.id}, db)
     return sprint
 
@@ -173,7 +219,7 @@ def update_sprint(
     project_id: int,
     sprint_id: int,
     payload: SprintUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
     sprint = db.get(Sprint, sprint_id)
@@ -185,8 +231,7 @@ def update_sprint(
 
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(sprint, field, value)
-    db.commit()
-    db.refresh(sprint)
+    db.flush()
     audit_log(user, "sprint.updated", {"project_id": project_id, "sprint_id": sprint_id}, db)
     return sprint
 
@@ -195,7 +240,7 @@ def update_sprint(
 def create_epic(
     project_id: int,
     payload: EpicCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
     project = db.get(Project, project_id)
@@ -211,8 +256,7 @@ def create_epic(
         color=payload.color or "#005bbb",
     )
     db.add(epic)
-    db.commit()
-    db.refresh(epic)
+    db.flush()
     audit_log(user, "epic.created", {"project_id": project.id, "epic_id": epic.id}, db)
     return epic
 
@@ -224,4 +268,4 @@ def list_epics(project_id: int, db: Session = Depends(get_db), user: User = Depe
         raise HTTPException(status_code=404, detail="Project not found")
     if user.role not in {"admin", "moderator"} and project.owner_id != user.id:
         raise HTTPException(status_code=403, detail="Forbidden")
-    return db.query(Epic).filter(Epic.project_id == project_id).all()
+    return db.scalars(epics_statement(project_id)).all()
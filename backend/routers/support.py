@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
-import pytz
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
-from backend.database import get_db
+from backend.database import get_db, get_uow
 from backend.dependencies import audit_log, get_current_user, require_roles
 from backend.models import SupportComment, SupportTicket, TicketPriority, TicketStatus, User
 from backend.schemas import (
@@ -32,7 +33,18 @@ SLA_WINDOWS = {
 
 
 def _assign_sla(priority: TicketPriority) -> datetime:
-    return datetime.now(tz=pytz.UTC) + SLA_WINDOWS.get(priority, timedelta(hours=24))
+    return datetime.now(tz=timezone.utc) + SLA_WINDOWS.get(priority, timedelta(hours=24))
+
+
+def tickets_statement(user, status: TicketStatus | None) -> Select:
+    """The tickets ``user`` may see, newest first."""
+
+    stmt = select(SupportTicket)
+    if user.role not in {"admin", "moderator"}:
+        stmt = stmt.where((SupportTicket.requester_id == user.id) | (SupportTicket.assignee_id == user.id))
+    if status:
+        stmt = stmt.where(SupportTicket.status == status)
+    return stmt.order_by(SupportTicket.created_at.desc())
 
 
 @router.get("/", response_model=list[TicketOut])
@@ -41,20 +53,13 @@ def list_tickets(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    query = db.query(SupportTicket)
-    if user.role not in {"admin", "moderator"}:
-        query = query.filter(
-            (SupportTicket.requester_id == user.id) | (SupportTicket.assignee_id == user.id)
-        )
-    if status:
-        query = query.filter(SupportTicket.status == status)
-    return query.order_by(SupportTicket.created_at.desc()).all()
+    return db.scalars(tickets_statement(user, status)).all()
 
 
 @router.post("/", response_model=TicketOut, status_code=201)
 def create_ticket(
     payload: TicketCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
     ticket = SupportTicket(
@@ -66,8 +71,7 @@ def create_ticket(
         requester_id=user.id,
     )
     db.add(ticket)
-    db.commit()
-    db.refresh(ticket)
+    db.flush()
     audit_log(user, "support.ticket_created", {"ticket_id": ticket.id}, db)
     return ticket
 
@@ -86,7 +90,7 @@ def get_ticket(ticket_id: int, db: Session = Depends(get_db), user: User = Depen
 def update_ticket(
     ticket_id: int,
     payload: TicketUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
     ticket = db.get(SupportTicket, ticket_id)
@@ -100,8 +104,7 @@ def update_ticket(
         setattr(ticket, field, value)
     if "priority" in data:
         ticket.sla_due = _assign_sla(ticket.priority)
-    db.commit()
-    db.refresh(ticket)
+    db.flush()
     audit_log(user, "support.ticket_updated", {"ticket_id": ticket.id}, db)
     return ticket
 
@@ -110,7 +113,7 @@ def update_ticket(
 def assign_ticket(
     ticket_id: int,
     assignee_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(require_roles("admin", "moderator")),
 ):
     ticket = db.get(SupportTicket, ticket_id)
@@ -120,8 +123,7 @@ def assign_ticket(
         raise HTTPException(status_code=404, detail="Assignee not found")
     ticket.assignee_id = assignee_id
     ticket.status = TicketStatus.in_progress
-    db.commit()
-    db.refresh(ticket)
+    db.flush()
     audit_log(user, "support.ticket_assigned", {"ticket_id": ticket.id, "assignee_id": assignee_id}, db)
     return ticket
 
@@ -130,7 +132,7 @@ def assign_ticket(
 def add_comment(
     ticket_id: int,
     payload: TicketCommentCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
     ticket = db.get(SupportTicket, ticket_id)
@@ -146,8 +148,7 @@ def add_comment(
         via=payload.via,
     )
     db.add(comment)
-    db.commit()
-    db.refresh(comment)
+    db.flush()
     audit_log(
         user,
         "support.comment_added",
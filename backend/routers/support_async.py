@@ -0,0 +1,64 @@
+"""Asyncio versions of the hot service desk endpoints.
+
+Mounted in front of :mod:`backend.routers.support` when ``support`` is listed
+in ``UA_FLOW_ASYNC_ROUTERS``.
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.async_database import get_async_read_db, get_async_uow
+from backend.dependencies import audit_log, get_current_user_async
+from backend.models import SupportTicket, TicketStatus
+from backend.schemas import TicketCreate, TicketOut
+from backend.services.identity_cache import UserSnapshot
+
+from .support import _assign_sla, tickets_statement
+
+
+router = APIRouter()
+
+
+@router.get("/", response_model=list[TicketOut])
+async def list_tickets(
+    status: TicketStatus | None = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    user: UserSnapshot = Depends(get_current_user_async),
+):
+    return (await db.scalars(tickets_statement(user, status))).all()
+
+
+@router.post("/", response_model=TicketOut, status_code=201)
+async def create_ticket(
+    payload: TicketCreate,
+    db: AsyncSession = Depends(get_async_uow),
+    user: UserSnapshot = Depends(get_current_user_async),
+):
+    ticket = SupportTicket(
+        subject=payload.subject,
+        body=payload.body,
+        priority=payload.priority,
+        channel=payload.channel,
+        sla_due=_assign_sla(payload.priority),
+        requester_id=user.id,
+    )
+    db.add(ticket)
+    await db.flush()
+    audit_log(user, "support.ticket_created", {"ticket_id": ticket.id}, db)
+    return ticket
+
+
+@router.get("/{ticket_id}", response_model=TicketOut)
+async def get_ticket(
+    ticket_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    user: UserSnapshot = Depends(get_current_user_async),
+):
+    ticket = await db.get(SupportTicket, ticket_id)
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    if user.role not in {"admin", "moderator"} and user.id not in {ticket.requester_id, ticket.assignee_id}:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return ticket
@@ -2,69 +2,275 @@
 
 from __future__ import annotations
 
+import os
 from collections import defaultdict
-from datetime import date, timedelta
-from typing import Dict, List, Optional
-
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-
-from database import get_db
-from dependencies import audit_log, get_current_user
-from models import Epic, Project, Sprint, Task, TaskComment, TaskStatus, User
-from schemas import (
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, delete, func, insert, select, tuple_, update
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import Select
+
+from backend.database import get_db, get_read_db, get_uow
+from backend.dependencies import audit_log, get_current_user, get_current_user_stream
+from backend.http_cache import collection_version, make_etag, not_modified
+from backend.models import Epic, Project, Sprint, Task, TaskComment, TaskPriority, TaskStatus, User
+from backend.pagination import CountMode, count_rows, decode_cursor, encode_cursor, paginate, parse_datetime
+from backend.schemas import (
+    KanbanLaneOut,
+    ProjectStatsOut,
     ReportFilters,
+    TaskBulkOut,
+    TaskBulkRequest,
+    TaskBulkResult,
     TaskCommentCreate,
     TaskCommentOut,
     TaskCreate,
     TaskOut,
+    TaskSearchHit,
     TaskUpdate,
 )
+from backend.services import board_events
+from backend.services.board_events import publish_on_commit, task_event
+from backend.services.project_acl import project_acl
+from backend.services.project_stats import apply_transitions, project_summaries
+from backend.services.task_history import TaskState, burndown, record_transitions
+from backend.services.task_search import INDEXED_FIELDS, highlight_html, index_tasks, search_statement
 
 
 router = APIRouter()
 
+TASK_PAGE_DEFAULT = 50
+TASK_PAGE_MAX = int(os.getenv("TASK_PAGE_MAX", "200"))
+
+TaskSort = Literal["created_at", "priority", "due_date"]
+SortOrder = Literal["asc", "desc"]
+
+TASK_SEARCH_DEFAULT = 20
+TASK_SEARCH_MAX = 100
+
+BOARD_LANE_DEFAULT = 20
+BOARD_LANE_MAX = 100
+TASK_BULK_MAX = int(os.getenv("TASK_BULK_MAX", "5000"))
+# Fields a "move" operation may change; anything else is an "update".
+MOVE_FIELDS = {"status", "sprint_id", "project_id", "epic_id"}
+
+BURNDOWN_MAX_DAYS = 366
+
+# Card order inside a board lane: most severe first, then newest.
+BOARD_ORDER: Tuple[TaskSort, SortOrder] = ("priority", "desc")
+
+
+def _ensure_project_membership(db: Session, project_id: Optional[int], user: User) -> None:
+    if project_id and not project_acl.get(db, user).allows(project_id):
+        raise HTTPException(status_code=403, detail="User is not part of this project")
+
+
+def _sort_column(sort: TaskSort, order: SortOrder) -> Tuple[Any, Callable[[Task], Any], Callable[[Any], Any]] | None:
+    """Leading sort expression, how to read it off a task, and how to parse it from a cursor."""
+
+    if sort == "priority":
+        # Enum values do not sort by severity as strings, so rank them explicitly.
+        ranks = {priority: rank for rank, priority in enumerate(TaskPriority)}
+        rank = case(*((Task.priority == priority, value) for priority, value in ranks.items()), else_=-1)
+        return rank, lambda task: ranks.get(task.priority, -1), int
+    if sort == "due_date":
+        # Tasks without a due date come last in both directions.
+        missing = date.max if order == "asc" else date.min
+        return func.coalesce(Task.due_date, missing), lambda task: task.due_date or missing, date.fromisoformat
+    return None
+
+
+def task_filters(
+    stmt: Select,
+    user,
+    project_id: Optional[int],
+    sprint_id: Optional[int],
+    status: Optional[TaskStatus],
+) -> Select:
+    if user.role not in {"admin", "moderator"}:
+        stmt = stmt.where((Task.owner_id == user.id) | (Task.assignee_id == user.id))
+    if project_id:
+        stmt = stmt.where(Task.project_id == project_id)
+    if sprint_id:
+        stmt = stmt.where(Task.sprint_id == sprint_id)
+    if status:
+        stmt = stmt.where(Task.status == status)
+    return stmt
+
+
+def _keyset_columns(sort: TaskSort, order: SortOrder) -> list:
+    leading = _sort_column(sort, order)
+    return ([leading[0]] if leading else []) + [Task.created_at, Task.id]
+
+
+def task_ordering(sort: TaskSort, order: SortOrder) -> list:
+    """ORDER BY clauses for ``sort``; ``created_at`` and ``id`` break ties."""
+
+    return [column.desc() if order == "desc" else column.asc() for column in _keyset_columns(sort, order)]
+
+
+def task_cursor_key(sort: TaskSort, order: SortOrder) -> Callable[[Task], tuple]:
+    """Values encoded in the cursor that resumes after a given task."""
+
+    leading = _sort_column(sort, order)
+    tag = f"{sort}:{order}"
+
+    def cursor_key(task: Task) -> tuple:
+        head = (leading[1](task),) if leading else ()
+        return (tag, *head, task.created_at, task.id)
+
+    return cursor_key
+
+
+def task_page(
+    stmt: Select, sort: TaskSort, order: SortOrder, cursor: Optional[str], limit: int
+) -> Tuple[Select, Callable[[Task], tuple]]:
+    """Apply keyset ordering over ``(sort key, created_at, id)`` and fetch ``limit + 1`` rows.
+
+    Returns the statement and the cursor key for :func:`backend.pagination.paginate`.
+    The cursor records the sort it was issued for and is rejected under another.
+    """
+
+    leading = _sort_column(sort, order)
+    columns = _keyset_columns(sort, order)
+    if cursor:
+        values = decode_cursor(cursor, len(columns) + 1)
+        if values[0] != f"{sort}:{order}":
+            raise HTTPException(status_code=400, detail="Cursor was issued for a different sort order")
+        try:
+            bound = [leading[2](values[1])] if leading else []
+            bound += [parse_datetime(values[-2]), int(values[-1])]
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor") from None
+        key = tuple_(*columns)
+        stmt = stmt.where(key < tuple_(*bound) if order == "desc" else key > tuple_(*bound))
+
+    stmt = stmt.order_by(*task_ordering(sort, order)).limit(limit + 1)
+    return stmt, task_cursor_key(sort, order)
 
-def _ensure_project_membership(project: Project | None, user: User) -> None:
-    if project and user.role not in {"admin", "moderator"}:
-        team_member_ids = {member.user_id for member in project.team.members} if project.team else {project.owner_id}
-        if user.id not in team_member_ids:
-            raise HTTPException(status_code=403, detail="User is not part of this project")
+
+def touch_projects(db: Session, project_ids) -> Dict[int, int]:
+    """Bump ``Project.tasks_version`` for every project whose tasks were written.
+
+    Returns the new version of each project.
+    """
+
+    project_ids = {project_id for project_id in project_ids if project_id}
+    if not project_ids:
+        return {}
+    rows = db.execute(
+        update(Project)
+        .where(Project.id.in_(project_ids))
+        # Assigning updated_at to itself keeps its onupdate from firing: the
+        # project itself did not change.
+        .values(tasks_version=Project.tasks_version + 1, updated_at=Project.updated_at)
+        .returning(Project.id, Project.tasks_version),
+        execution_options={"synchronize_session": False},
+    )
+    return dict(rows.tuples().all())
+
+
+def publish_task_changes(db: Session, changes: List[Tuple[int, Optional[TaskState], Optional[Task]]]) -> None:
+    """Version the touched projects and stream the changes to their boards after commit.
+
+    Each change is ``(task_id, before, task)``; ``before`` is ``None`` for a
+    created task and ``task`` is ``None`` for a deleted one.
+    """
+
+    events: Dict[int, List[dict]] = defaultdict(list)
+    for task_id, before, task in changes:
+        after = TaskState.of(task) if task is not None else None
+        if before is None:
+            event_type = "task.created"
+        elif after is None:
+            event_type = "task.deleted"
+        elif (before.project_id, before.sprint_id, before.status) != (after.project_id, after.sprint_id, after.status):
+            event_type = "task.moved"
+        else:
+            event_type = "task.updated"
+        payload = TaskOut.model_validate(task).model_dump(mode="json") if task is not None else None
+        for project_id in {state.project_id for state in (before, after) if state and state.project_id}:
+            events[project_id].append(task_event(event_type, task_id, payload))
+    publish_on_commit(db, touch_projects(db, events.keys()), events)
 
 
 @router.get("/", response_model=List[TaskOut])
 def list_tasks(
+    request: Request,
+    response: Response,
     project_id: Optional[int] = None,
     sprint_id: Optional[int] = None,
     status: Optional[TaskStatus] = Query(default=None),
-    db: Session = Depends(get_db),
+    sort: TaskSort = "created_at",
+    order: SortOrder = "desc",
+    cursor: Optional[str] = None,
+    limit: int = Query(default=TASK_PAGE_DEFAULT, ge=1, le=TASK_PAGE_MAX),
+    count: CountMode = "none",
+    db: Session = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
-    """Return tasks for the current user with optional filters."""
+    """Return a page of the current user's tasks; follow ``X-Next-Cursor`` for the next one."""
 
-    query = db.query(Task)
-    if user.role not in {"admin", "moderator"}:
-        query = query.filter((Task.owner_id == user.id) | (Task.assignee_id == user.id))
-    if project_id:
-        query = query.filter(Task.project_id == project_id)
-    if sprint_id:
-        query = query.filter(Task.sprint_id == sprint_id)
-    if status:
-        query = query.filter(Task.status == status)
-    return query.order_by(Task.created_at.desc()).all()
+    stmt = task_filters(select(Task), user, project_id, sprint_id, status)
+    version = collection_version(db, stmt, Task.updated_at)
+    cached = not_modified(
+        request, response, make_etag("tasks", user.id, *version, sort, order, cursor, limit, count)
+    )
+    if cached:
+        return cached
+    count_rows(db, stmt, count, response)
+    stmt, key = task_page(stmt, sort, order, cursor, limit)
+    return paginate(db.scalars(stmt).all(), limit, response, key=key)
+
+
+@router.get("/search", response_model=List[TaskSearchHit])
+def search_tasks(
+    response: Response,
+    q: str = Query(min_length=1, max_length=200),
+    project_id: Optional[int] = None,
+    sprint_id: Optional[int] = None,
+    status: Optional[TaskStatus] = Query(default=None),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=TASK_SEARCH_DEFAULT, ge=1, le=TASK_SEARCH_MAX),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
+    """Rank the current user's tasks by ``q`` across titles, tags, descriptions and comments.
+
+    Relevance is not a stable keyset, so the cursor carries the offset of the
+    next page.
+    """
+
+    offset = decode_cursor(cursor, 1)[0] if cursor else 0
+    if not isinstance(offset, int) or offset < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    stmt = search_statement(db.connection(), q, task_filters(select(Task), user, project_id, sprint_id, status))
+    if stmt is None:
+        return []
+    rows = db.execute(stmt.offset(offset).limit(limit + 1)).all()
+    hits = [
+        TaskSearchHit(
+            task=task, rank=rank, title_highlight=highlight_html(title), snippet=highlight_html(snippet)
+        )
+        for task, rank, title, snippet in rows
+    ]
+    return paginate(hits, limit, response, key=lambda _: (offset + limit,))
 
 
 @router.post("/", response_model=TaskOut, status_code=201)
 def create_task(
     payload: TaskCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
     """Create a new task inside a project or backlog."""
 
     project = db.get(Project, payload.project_id) if payload.project_id else None
     if project:
-        _ensure_project_membership(project, user)
+        _ensure_project_membership(db, project.id, user)
     sprint = db.get(Sprint, payload.sprint_id) if payload.sprint_id else None
     epic = db.get(Epic, payload.epic_id) if payload.epic_id else None
 
@@ -85,65 +291,273 @@ def create_task(
     )
 
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    db.flush()
+    transitions = [(task.id, None, TaskState.of(task))]
+    record_transitions(db, transitions, user.id)
+    apply_transitions(db, transitions)
+    index_tasks(db, [task.id])
+    publish_task_changes(db, [(task.id, None, task)])
     audit_log(user, "task.created", {"task_id": task.id}, db)
     return task
 
 
-@router.get("/{task_id}", response_model=TaskOut)
-def get_task(task_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+@router.get("/{task_id:int}", response_model=TaskOut)
+def get_task(
+    task_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
     task = db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    _ensure_project_membership(task.project, user)
+    _ensure_project_membership(db, task.project_id, user)
     if user.role not in {"admin", "moderator"} and user.id not in {task.owner_id, task.assignee_id}:
         raise HTTPException(status_code=403, detail="Forbidden")
-    return task
+    return not_modified(request, response, make_etag("task", task.id, task.updated_at)) or task
 
 
-@router.put("/{task_id}", response_model=TaskOut)
+@router.put("/{task_id:int}", response_model=TaskOut)
 def update_task(
     task_id: int,
     payload: TaskUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
     task = db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    _ensure_project_membership(task.project, user)
+    _ensure_project_membership(db, task.project_id, user)
     if user.role not in {"admin", "moderator"} and task.owner_id != user.id:
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    for field, value in payload.model_dump(exclude_unset=True).items():
+    before = TaskState.of(task)
+    changes = payload.model_dump(exclude_unset=True)
+    for field, value in changes.items():
         setattr(task, field, value)
 
-    db.commit()
-    db.refresh(task)
+    db.flush()
+    transitions = [(task.id, before, TaskState.of(task))]
+    record_transitions(db, transitions, user.id)
+    apply_transitions(db, transitions)
+    if INDEXED_FIELDS & changes.keys():
+        index_tasks(db, [task.id])
+    publish_task_changes(db, [(task.id, before, task)])
     audit_log(user, "task.updated", {"task_id": task.id}, db)
     return task
 
 
-@router.delete("/{task_id}", status_code=204)
-def delete_task(task_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+@router.delete("/{task_id:int}", status_code=204)
+def delete_task(task_id: int, db: Session = Depends(get_uow), user: User = Depends(get_current_user)):
     task = db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     if user.role not in {"admin", "moderator"} and task.owner_id != user.id:
         raise HTTPException(status_code=403, detail="Forbidden")
 
+    before = TaskState.of(task)
+    transitions = [(task.id, before, None)]
+    record_transitions(db, transitions, user.id)
+    apply_transitions(db, transitions)
     db.delete(task)
-    db.commit()
+    db.flush()
+    index_tasks(db, [task_id])
+    publish_task_changes(db, [(task_id, before, None)])
     audit_log(user, "task.deleted", {"task_id": task_id}, db)
 
 
-@router.post("/{task_id}/comments", response_model=TaskCommentOut, status_code=201)
+def _project_access(db: Session, user: User, project_ids: set[int]) -> Tuple[set[int], set[int]]:
+    """Return ``(existing, allowed)`` project ids using the rule of :func:`_ensure_project_membership`."""
+
+    if not project_ids:
+        return set(), set()
+    existing = set(db.scalars(select(Project.id).where(Project.id.in_(project_ids))))
+    access = project_acl.get(db, user)
+    return existing, {project_id for project_id in existing if access.allows(project_id)}
+
+
+def _existing_ids(db: Session, model, ids: set[int]) -> set[int]:
+    return set(db.scalars(select(model.id).where(model.id.in_(ids)))) if ids else set()
+
+
+@router.post("/bulk", response_model=TaskBulkOut)
+def bulk_tasks(
+    payload: TaskBulkRequest,
+    db: Session = Depends(get_uow),
+    user: User = Depends(get_current_user),
+):
+    """Apply many create/update/move/delete operations in one transaction.
+
+    Permissions are resolved with one query per referenced table rather than
+    per task, valid operations are written with bulk INSERT/UPDATE/DELETE
+    statements, and a single ``task.bulk`` audit record lists what changed.
+    Rejected operations are reported per item and skipped, or abort the
+    whole request when ``atomic`` is set.
+    """
+
+    operations = payload.operations
+    if len(operations) > TASK_BULK_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {TASK_BULK_MAX} operations per request")
+
+    staff = user.role in {"admin", "moderator"}
+    results = [TaskBulkResult(index=index, op=item.op, id=item.id) for index, item in enumerate(operations)]
+    values: Dict[int, dict] = {}
+
+    def reject(index: int, error: str) -> None:
+        results[index].ok = False
+        results[index].error = error
+
+    seen_ids: set[int] = set()
+    for index, item in enumerate(operations):
+        if item.op == "create":
+            if item.task is None:
+                reject(index, "task is required for create")
+                continue
+            values[index] = item.task.model_dump()
+            continue
+        if item.id is None:
+            reject(index, f"id is required for {item.op}")
+            continue
+        if item.id in seen_ids:
+            reject(index, "Task appears in more than one operation")
+            continue
+        seen_ids.add(item.id)
+        if item.op == "delete":
+            continue
+        changes = item.changes.model_dump(exclude_unset=True) if item.changes else {}
+        if not changes:
+            reject(index, f"changes are required for {item.op}")
+        elif item.op == "move" and set(changes) - MOVE_FIELDS:
+            reject(index, f"move only changes {', '.join(sorted(MOVE_FIELDS))}")
+        else:
+            values[index] = changes
+
+    targets = {}
+    if seen_ids:
+        rows = db.execute(
+            select(
+                Task.id,
+                Task.owner_id,
+                Task.project_id,
+                Task.sprint_id,
+                Task.status,
+                Task.estimate_hours,
+                Task.priority,
+                Task.due_date,
+            ).where(Task.id.in_(seen_ids))
+        )
+        targets = {row.id: row for row in rows}
+    referenced = list(values.values())
+    existing_projects, allowed_projects = _project_access(
+        db,
+        user,
+        {row.project_id for row in targets.values() if row.project_id}
+        | {change["project_id"] for change in referenced if change.get("project_id")},
+    )
+    sprints = _existing_ids(db, Sprint, {change["sprint_id"] for change in referenced if change.get("sprint_id")})
+    epics = _existing_ids(db, Epic, {change["epic_id"] for change in referenced if change.get("epic_id")})
+
+    for index, item in enumerate(operations):
+        if not results[index].ok:
+            continue
+        if item.op != "create":
+            target = targets.get(item.id)
+            if target is None:
+                reject(index, "Task not found")
+                continue
+            if not staff and target.owner_id != user.id:
+                reject(index, "Forbidden")
+                continue
+            if item.op != "delete" and target.project_id and target.project_id not in allowed_projects:
+                reject(index, "User is not part of this project")
+                continue
+        change = values.get(index, {})
+        if change.get("project_id"):
+            if change["project_id"] not in existing_projects:
+                reject(index, "Project not found")
+            elif change["project_id"] not in allowed_projects:
+                reject(index, "User is not part of this project")
+        if change.get("sprint_id") and change["sprint_id"] not in sprints:
+            reject(index, "Sprint not found")
+        if change.get("epic_id") and change["epic_id"] not in epics:
+            reject(index, "Epic not found")
+
+    failed = sum(not result.ok for result in results)
+    if failed and payload.atomic:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "No operations were applied", "results": [r.model_dump() for r in results if not r.ok]},
+        )
+
+    accepted = [index for index, result in enumerate(results) if result.ok]
+    creates = [index for index in accepted if operations[index].op == "create"]
+    changes = [index for index in accepted if operations[index].op in {"update", "move"}]
+    deletes = [operations[index].id for index in accepted if operations[index].op == "delete"]
+
+    if creates:
+        rows = [
+            {
+                **values[index],
+                "estimate_hours": values[index]["estimate_hours"] or 0,
+                "tags": values[index]["tags"] or "",
+                "owner_id": user.id,
+            }
+            for index in creates
+        ]
+        new_ids = db.scalars(insert(Task).returning(Task.id, sort_by_parameter_order=True), rows).all()
+        for index, task_id in zip(creates, new_ids):
+            results[index].id = task_id
+    if changes:
+        db.execute(update(Task), [{"id": operations[index].id, **values[index]} for index in changes])
+    if deletes:
+        db.execute(delete(TaskComment).where(TaskComment.task_id.in_(deletes)))
+        db.execute(delete(Task).where(Task.id.in_(deletes)), execution_options={"synchronize_session": False})
+
+    transitions = []
+    for index in accepted:
+        item = operations[index]
+        before = TaskState.of(targets[item.id]) if item.op != "create" else None
+        if item.op == "create":
+            transitions.append((results[index].id, None, TaskState.of(item.task)))
+        elif item.op == "delete":
+            transitions.append((item.id, before, None))
+        else:
+            transitions.append((item.id, before, before.merged(values[index])))
+    record_transitions(db, transitions, user.id)
+    apply_transitions(db, transitions)
+    written = [task_id for task_id, _, after in transitions if after is not None]
+    loaded = (
+        db.scalars(select(Task).where(Task.id.in_(written)).execution_options(populate_existing=True))
+        if written
+        else []
+    )
+    tasks_by_id = {task.id: task for task in loaded}
+    publish_task_changes(
+        db, [(task_id, before, tasks_by_id.get(task_id)) for task_id, before, _ in transitions]
+    )
+    index_tasks(
+        db,
+        [
+            results[index].id
+            for index in accepted
+            if operations[index].op in {"create", "delete"} or INDEXED_FIELDS & values[index].keys()
+        ],
+    )
+
+    by_op: Dict[str, List[int]] = {}
+    for index in accepted:
+        by_op.setdefault(operations[index].op, []).append(results[index].id)
+    audit_log(user, "task.bulk", {**by_op, "failed": failed}, db)
+    return TaskBulkOut(applied=len(accepted), failed=failed, results=results)
+
+
+@router.post("/{task_id:int}/comments", response_model=TaskCommentOut, status_code=201)
 def add_comment(
     task_id: int,
     payload: TaskCommentCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
     task = db.get(Task, task_id)
@@ -152,69 +566,208 @@ def add_comment(
 
     comment = TaskComment(task_id=task.id, author_id=user.id, message=payload.message)
     db.add(comment)
-    db.commit()
-    db.refresh(comment)
+    db.flush()
+    index_tasks(db, [task.id])
     audit_log(user, "task.comment.added", {"task_id": task.id, "comment_id": comment.id}, db)
     return comment
 
 
-@router.get("/board/view", response_model=Dict[str, List[TaskOut]])
-def kanban_board(
-    project_id: int,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-):
+def board_statement(project_id: int, lane_limit: int) -> Select:
+    """``(task, lane total)`` for the first ``lane_limit`` cards of each lane, in board order."""
+
+    ranked = (
+        select(
+            Task,
+            func.row_number()
+            .over(partition_by=Task.status, order_by=task_ordering(*BOARD_ORDER))
+            .label("lane_position"),
+            func.count().over(partition_by=Task.status).label("lane_total"),
+        )
+        .where(Task.project_id == project_id)
+        .subquery()
+    )
+    card = aliased(Task, ranked)
+    return (
+        select(card, ranked.c.lane_total)
+        .where(ranked.c.lane_position <= lane_limit)
+        .order_by(ranked.c.status, ranked.c.lane_position)
+    )
+
+
+def lane_statement(project_id: int, status: TaskStatus) -> Select:
+    return select(Task).where(Task.project_id == project_id, Task.status == status)
+
+
+def team_projects_statement(team_id: int) -> Select:
+    return select(Project.id).where(Project.team_id == team_id)
+
+
+def _board_project(db: Session, project_id: int, user: User) -> Project:
     project = db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    _ensure_project_membership(project, user)
+    _ensure_project_membership(db, project.id, user)
+    return project
+
 
-    lanes: Dict[str, List[TaskOut]] = defaultdict(list)
-    for task in project.tasks:
-        lanes[task.status.value].append(task)
+@router.get("/board/view", response_model=Dict[str, KanbanLaneOut])
+def kanban_board(
+    request: Request,
+    response: Response,
+    project_id: int,
+    lane_limit: int = Query(default=BOARD_LANE_DEFAULT, ge=1, le=BOARD_LANE_MAX),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
+    """Every status lane with its card count and first ``lane_limit`` cards.
+
+    Cards are ranked per lane by priority, then newest first, in one windowed
+    query; ``next_cursor`` continues a lane through ``/board/lane``.
+    Answers ``304`` while the project's ``tasks_version`` is unchanged.
+    """
+
+    project = _board_project(db, project_id, user)
+    cached = not_modified(request, response, make_etag("board", project.id, project.tasks_version, lane_limit))
+    if cached:
+        return cached
+
+    rows = db.execute(board_statement(project_id, lane_limit)).all()
+
+    cursor_key = task_cursor_key(*BOARD_ORDER)
+    lanes = {status.value: KanbanLaneOut(status=status, total=0, tasks=[]) for status in TaskStatus}
+    for task, total in rows:
+        lane = lanes[task.status.value]
+        lane.total = total
+        lane.tasks.append(TaskOut.model_validate(task))
+        if len(lane.tasks) == lane_limit and total > lane_limit:
+            lane.next_cursor = encode_cursor(*cursor_key(task))
     return lanes
 
 
+@router.get("/board/lane", response_model=List[TaskOut])
+def kanban_lane(
+    request: Request,
+    response: Response,
+    project_id: int,
+    status: TaskStatus,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=BOARD_LANE_DEFAULT, ge=1, le=BOARD_LANE_MAX),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
+    """Next cards of one board lane, in board order; follow ``X-Next-Cursor``."""
+
+    project = _board_project(db, project_id, user)
+    cached = not_modified(
+        request, response, make_etag("lane", project.id, project.tasks_version, status, cursor, limit)
+    )
+    if cached:
+        return cached
+    stmt, key = task_page(lane_statement(project_id, status), *BOARD_ORDER, cursor, limit)
+    return paginate(db.scalars(stmt).all(), limit, response, key=key)
+
+
+@router.get("/board/stats", response_model=ProjectStatsOut)
+def kanban_stats(
+    request: Request,
+    response: Response,
+    project_id: int,
+    sprint_id: Optional[int] = Query(default=None, ge=0),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
+    """Board header counters: tasks by status and priority, hours and overdue tasks.
+
+    Read from the project's rollup rows instead of counting tasks;
+    ``sprint_id=0`` narrows them to the backlog. Answers ``304`` while the
+    project's ``tasks_version`` and the date are unchanged.
+    """
+
+    project = _board_project(db, project_id, user)
+    today = datetime.utcnow().date()
+    cached = not_modified(
+        request, response, make_etag("board-stats", project.id, project.tasks_version, sprint_id, today)
+    )
+    if cached:
+        return cached
+    return project_summaries(db, [project.id], sprint_id)[project.id]
+
+
+@router.get("/board/events", response_class=StreamingResponse)
+def board_event_stream(
+    project_id: int,
+    since: Optional[int] = Query(default=None, ge=0),
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user_stream),
+):
+    """Server-sent events with every task change on the project's board.
+
+    ``board`` events carry the created, updated, moved and deleted tasks and
+    use the project's ``tasks_version`` as their id; ``reset`` asks the
+    client to reload ``/board/view``. Reconnecting clients resume after
+    ``Last-Event-ID`` (or ``?since=``) and only receive what they missed.
+    """
+
+    project = _board_project(db, project_id, user)
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    return StreamingResponse(
+        board_events.stream(project.id, since, project.tasks_version),
+        media_type="text/event-stream",
+        # X-Accel-Buffering stops nginx from holding events back.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/reports/burndown")
 def burndown_report(
     filters: ReportFilters,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
-    """Return a simplified burndown data structure for charts."""
+    """Daily burndown/burnup series with scope changes, read from the daily stats.
+
+    The range defaults to the sprint's dates, otherwise the last two weeks.
+    ``ideal`` runs linearly from the opening scope (or the current scope
+    when nothing was planned yet at the start) to zero over the range.
+    """
 
-    query = db.query(Task)
+    project_ids: Optional[set[int]] = None
+    sprint = None
     if filters.project_id:
-        project = db.get(Project, filters.project_id)
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-        _ensure_project_membership(project, user)
-        query = query.filter(Task.project_id == filters.project_id)
+        _board_project(db, filters.project_id, user)
+        project_ids = {filters.project_id}
     if filters.team_id:
-        query = query.join(Project).filter(Project.team_id == filters.team_id)
+        team_projects = set(db.scalars(team_projects_statement(filters.team_id)))
+        project_ids = team_projects if project_ids is None else project_ids & team_projects
     if filters.sprint_id:
-        query = query.filter(Task.sprint_id == filters.sprint_id)
-
-    tasks = query.all()
-    total = len(tasks)
-    done = len([t for t in tasks if t.status == TaskStatus.done])
-    remaining = total - done
-    today = date.today()
-
-    # Simplified timeline with 5 data points.
-    chart = []
-    for idx in range(5):
-        days_from_start = idx * 2
-        chart.append(
-            {
-                "date": (today - timedelta(days=days_from_start)).isoformat(),
-                "remaining": max(remaining - idx, 0),
-            }
-        )
-
+        sprint = db.get(Sprint, filters.sprint_id)
+        if not sprint:
+            raise HTTPException(status_code=404, detail="Sprint not found")
+        if not filters.project_id:
+            _board_project(db, sprint.project_id, user)
+
+    today = datetime.utcnow().date()  # stats rows are keyed by UTC day
+    start = filters.from_date or (sprint.start_date if sprint else None) or today - timedelta(days=13)
+    end = filters.to_date or (sprint.end_date if sprint else None) or today
+    if end < start:
+        raise HTTPException(status_code=400, detail="to_date is before from_date")
+    if (end - start).days > BURNDOWN_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range is limited to {BURNDOWN_MAX_DAYS} days")
+
+    chart = burndown(db, start, min(end, today), project_ids=project_ids, sprint_id=filters.sprint_id)
+    latest = chart[-1] if chart else {"scope": 0, "done": 0, "remaining": 0}
+    opening = chart[0]["scope"] - chart[0]["added"] + chart[0]["removed"] if chart else 0
+    planned = opening or latest["scope"]
+    days = (end - start).days
+    ideal = [planned * (1 - step / days) if days else 0 for step in range(days + 1)]
     return {
-        "total": total,
-        "done": done,
-        "remaining": remaining,
-        "chart": list(reversed(chart)),
+        "total": latest["scope"],
+        "done": latest["done"],
+        "remaining": latest["remaining"],
+        "sprint_start": start.isoformat(),
+        "sprint_end": end.isoformat(),
+        "ideal": ideal,
+        "chart": chart,
     }
@@ -0,0 +1,164 @@
+"""Asyncio versions of the hot task endpoints.
+
+Mounted in front of :mod:`backend.routers.tasks` when ``tasks`` is listed in
+``UA_FLOW_ASYNC_ROUTERS``; every other task route keeps being served by the
+sync router. Task ids are declared ``{task_id:int}`` so that static paths
+such as ``/search`` fall through to it instead of failing id parsing here.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.async_database import get_async_read_db, get_async_uow
+from backend.dependencies import audit_log, get_current_user_async
+from backend.http_cache import collection_version, make_etag, not_modified
+from backend.models import Epic, Project, Sprint, Task, TaskStatus
+from backend.pagination import CountMode, count_statement, estimate_rows, paginate, set_count_headers
+from backend.schemas import TaskCreate, TaskOut, TaskUpdate
+from backend.services.identity_cache import UserSnapshot
+from backend.services.project_acl import project_acl
+from backend.services.project_stats import apply_transitions
+from backend.services.task_history import TaskState, record_transitions
+from backend.services.task_search import INDEXED_FIELDS, index_tasks
+from .tasks import (
+    TASK_PAGE_DEFAULT,
+    TASK_PAGE_MAX,
+    SortOrder,
+    TaskSort,
+    task_filters,
+    task_page,
+    publish_task_changes,
+)
+
+
+router = APIRouter()
+
+
+async def _ensure_project_membership(db: AsyncSession, project_id: Optional[int], user: UserSnapshot) -> None:
+    if project_id and not (await db.run_sync(project_acl.get, user)).allows(project_id):
+        raise HTTPException(status_code=403, detail="User is not part of this project")
+
+
+@router.get("/", response_model=List[TaskOut])
+async def list_tasks(
+    request: Request,
+    response: Response,
+    project_id: Optional[int] = None,
+    sprint_id: Optional[int] = None,
+    status: Optional[TaskStatus] = Query(default=None),
+    sort: TaskSort = "created_at",
+    order: SortOrder = "desc",
+    cursor: Optional[str] = None,
+    limit: int = Query(default=TASK_PAGE_DEFAULT, ge=1, le=TASK_PAGE_MAX),
+    count: CountMode = "none",
+    db: AsyncSession = Depends(get_async_read_db),
+    user: UserSnapshot = Depends(get_current_user_async),
+):
+    """Return a page of the current user's tasks; follow ``X-Next-Cursor`` for the next one."""
+
+    stmt = task_filters(select(Task), user, project_id, sprint_id, status)
+    version = await db.run_sync(collection_version, stmt, Task.updated_at)
+    cached = not_modified(
+        request, response, make_etag("tasks", user.id, *version, sort, order, cursor, limit, count)
+    )
+    if cached:
+        return cached
+    if count != "none":
+        total = await db.run_sync(estimate_rows, stmt) if count == "estimated" else None
+        if total is None:
+            total, count = await db.scalar(count_statement(stmt)), "exact"
+        set_count_headers(response, total, count)
+    stmt, key = task_page(stmt, sort, order, cursor, limit)
+    return paginate((await db.scalars(stmt)).all(), limit, response, key=key)
+
+
+@router.post("/", response_model=TaskOut, status_code=201)
+async def create_task(
+    payload: TaskCreate,
+    db: AsyncSession = Depends(get_async_uow),
+    user: UserSnapshot = Depends(get_current_user_async),
+):
+    """Create a new task inside a project or backlog."""
+
+    project = await db.get(Project, payload.project_id) if payload.project_id else None
+    await _ensure_project_membership(db, project.id if project else None, user)
+    sprint = await db.get(Sprint, payload.sprint_id) if payload.sprint_id else None
+    epic = await db.get(Epic, payload.epic_id) if payload.epic_id else None
+
+    task = Task(
+        title=payload.title,
+        description=payload.description,
+        status=payload.status,
+        priority=payload.priority,
+        type=payload.type,
+        due_date=payload.due_date,
+        estimate_hours=payload.estimate_hours or 0,
+        tags=payload.tags or "",
+        owner_id=user.id,
+        assignee_id=payload.assignee_id,
+        project_id=project.id if project else None,
+        sprint_id=sprint.id if sprint else None,
+        epic_id=epic.id if epic else None,
+    )
+    db.add(task)
+    await db.flush()
+    transitions = [(task.id, None, TaskState.of(task))]
+    await db.run_sync(record_transitions, transitions, user.id)
+    await db.run_sync(apply_transitions, transitions)
+    await db.run_sync(index_tasks, [task.id])
+    await db.run_sync(publish_task_changes, [(task.id, None, task)])
+    audit_log(user, "task.created", {"task_id": task.id}, db)
+    return task
+
+
+@router.get("/{task_id:int}", response_model=TaskOut)
+async def get_task(
+    task_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    user: UserSnapshot = Depends(get_current_user_async),
+):
+    task = await db.get(Task, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    await _ensure_project_membership(db, task.project_id, user)
+    if user.role not in {"admin", "moderator"} and user.id not in {task.owner_id, task.assignee_id}:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return not_modified(request, response, make_etag("task", task.id, task.updated_at)) or task
+
+
+@router.put("/{task_id:int}", response_model=TaskOut)
+async def update_task(
+    task_id: int,
+    payload: TaskUpdate,
+    db: AsyncSession = Depends(get_async_uow),
+    user: UserSnapshot = Depends(get_current_user_async),
+):
+    task = await db.get(Task, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    await _ensure_project_membership(db, task.project_id, user)
+    if user.role not in {"admin", "moderator"} and task.owner_id != user.id:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    before = TaskState.of(task)
+    changes = payload.model_dump(exclude_unset=True)
+    for field, value in changes.items():
+        setattr(task, field, value)
+
+    await db.flush()
+    transitions = [(task.id, before, TaskState.of(task))]
+    await db.run_sync(record_transitions, transitions, user.id)
+    await db.run_sync(apply_transitions, transitions)
+    if INDEXED_FIELDS & changes.keys():
+        await db.run_sync(index_tasks, [task.id])
+    await db.run_sync(publish_task_changes, [(task.id, before, task)])
+    audit_log(user, "task.updated", {"task_id": task.id}, db)
+    return task
@@ -8,7 +8,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from database import get_db
+from database import get_db, get_uow
 from dependencies import get_current_user, require_roles
 from models import (
     Invoice,
@@ -47,7 +47,7 @@ router = APIRouter()
 @router.post("/worklogs", response_model=WorklogOut, status_code=201)
 def create_worklog(
     payload: WorklogCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(get_current_user),
 ):
     project = db.get(Project, payload.project_id) if payload.project_id else None
@@ -62,8 +62,7 @@ def create_worklog(
         created_by=user.id,
     )
     db.add(worklog)
-    db.commit()
-    db.refresh(worklog)
+    db.flush()
     return worklog
 
 
@@ -109,7 +108,7 @@ def project_worklogs(
 
 @router.delete("/worklogs/{worklog_id}", status_code=204)
 def delete_worklog(
-    worklog_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)
+    worklog_id: int, db: Session = Depends(get_uow), user: User = Depends(get_current_user)
 ):
     worklog = db.get(Worklog, worklog_id)
     if not worklog:
@@ -117,7 +116,6 @@ def delete_worklog(
     if worklog.user_id != user.id and user.role not in {"admin", "manager"}:
         raise HTTPException(status_code=403, detail="Forbidden")
     db.delete(worklog)
-    db.commit()
     return None
 
 
@@ -129,13 +127,12 @@ def delete_worklog(
 @router.post("/rates", response_model=UserRateOut, status_code=201)
 def create_rate(
     payload: UserRateCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(require_roles("admin")),
 ):
     rate = UserRate(**payload.model_dump())
     db.add(rate)
-    db.commit()
-    db.refresh(rate)
+    db.flush()
     return rate
 
 
@@ -159,7 +156,7 @@ def list_rates(user_id: int, db: Session = Depends(get_db), user: User = Depends
 @router.post("/budget", response_model=ProjectBudgetOut)
 def upsert_budget(
     payload: ProjectBudgetUpsert,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(require_roles("manager", "admin")),
 ):
     budget = db.query(ProjectBudget).filter(ProjectBudget.project_id == payload.project_id).first()
@@ -169,8 +166,7 @@ def upsert_budget(
     else:
         budget = ProjectBudget(**payload.model_dump())
         db.add(budget)
-    db.commit()
-    db.refresh(budget)
+    db.flush()
     return budget
 
 
@@ -192,13 +188,12 @@ def get_budget_summary(
 @router.post("/expenses", response_model=ProjectExpenseOut, status_code=201)
 def create_expense(
     payload: ProjectExpenseCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(require_roles("manager", "admin")),
 ):
     expense = ProjectExpense(**payload.model_dump())
     db.add(expense)
-    db.commit()
-    db.refresh(expense)
+    db.flush()
     return expense
 
 
@@ -230,7 +225,7 @@ def _generate_external_id(db: Session, now: datetime) -> str:
 @router.post("/invoices", response_model=InvoiceOut, status_code=201)
 def create_invoice(
     payload: InvoiceCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(require_roles("manager", "admin")),
 ):
     if not payload.items:
@@ -257,8 +252,7 @@ def create_invoice(
         )
     recalculate_invoice_totals(invoice, payload.tax_percent)
     db.add(invoice)
-    db.commit()
-    db.refresh(invoice)
+    db.flush()
     return invoice
 
 
@@ -295,15 +289,14 @@ def get_invoice(invoice_id: int, db: Session = Depends(get_db), user: User = Dep
 def update_invoice_status(
     invoice_id: int,
     status: InvoiceStatus,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow),
     user: User = Depends(require_roles("manager", "admin")),
 ):
     invoice = db.get(Invoice, invoice_id)
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
     invoice.status = status
-    db.commit()
-    db.refresh(invoice)
+    db.flush()
     return invoice
 
 
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, EmailStr, Field
 
@@ -112,6 +112,17 @@ class ProjectUpdate(BaseModel):
     team_id: Optional[int] = None
 
 
+class ProjectStatsOut(BaseModel):
+    """Task counters of a project (or one sprint), kept current by every task write."""
+
+    tasks: int = 0
+    by_status: Dict[str, int] = Field(default_factory=dict)
+    by_priority: Dict[str, int] = Field(default_factory=dict)
+    estimate_hours: int = 0
+    done_hours: int = 0
+    overdue: int = 0
+
+
 class ProjectOut(BaseModel):
     id: int
     key: str
@@ -122,6 +133,7 @@ class ProjectOut(BaseModel):
     team_id: Optional[int]
     created_at: datetime
     updated_at: datetime
+    stats: Optional[ProjectStatsOut] = None
 
     class Config:
         from_attributes = True
@@ -221,6 +233,53 @@ class TaskOut(TaskBase):
         from_attributes = True
 
 
+class TaskBulkOperation(BaseModel):
+    """One item of ``POST /tasks/bulk``; ``id`` selects the task for update, move and delete."""
+
+    op: Literal["create", "update", "move", "delete"]
+    id: Optional[int] = None
+    task: Optional[TaskCreate] = None
+    changes: Optional[TaskUpdate] = None
+
+
+class TaskBulkRequest(BaseModel):
+    operations: List[TaskBulkOperation] = Field(min_length=1)
+    # Apply nothing when any operation is rejected.
+    atomic: bool = False
+
+
+class TaskBulkResult(BaseModel):
+    index: int
+    op: str
+    id: Optional[int] = None
+    ok: bool = True
+    error: Optional[str] = None
+
+
+class TaskBulkOut(BaseModel):
+    applied: int
+    failed: int
+    results: List[TaskBulkResult]
+
+
+class TaskSearchHit(BaseModel):
+    """A ``/tasks/search`` match; highlights wrap matched terms in ``<mark>``."""
+
+    task: TaskOut
+    rank: float
+    title_highlight: str
+    snippet: str
+
+
+class KanbanLaneOut(BaseModel):
+    """One board column: the first cards, the column size and where to continue."""
+
+    status: TaskStatus
+    total: int
+    tasks: List[TaskOut]
+    next_cursor: Optional[str] = None
+
+
 class TaskCommentCreate(BaseModel):
     message: str
 
@@ -273,6 +332,23 @@ class DocOut(BaseModel):
     created_by: Optional[int]
     created_at: datetime
     updated_at: datetime
+    size: int = 0
+    latest_version: int = 0
+
+    class Config:
+        from_attributes = True
+
+
+class DocSummaryOut(BaseModel):
+    """A document in listings; ``content_md`` is only filled with ``?include=content``."""
+
+    id: int
+    title: str
+    created_by: Optional[int]
+    updated_at: datetime
+    size: int
+    latest_version: int
+    content_md: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -289,6 +365,35 @@ class DocVersionOut(BaseModel):
         from_attributes = True
 
 
+class DocDiffLine(BaseModel):
+    """One line of a hunk: ``" "`` context, ``"-"`` removed or ``"+"`` added.
+
+    Lines of a replaced block carry ``words``: ``[op, text]`` segments with
+    ``=`` for unchanged text and ``-``/``+`` for the changed words.
+    """
+
+    op: Literal[" ", "-", "+"]
+    text: str
+    words: Optional[List[List[str]]] = None
+
+
+class DocDiffHunk(BaseModel):
+    from_start: int
+    from_lines: int
+    to_start: int
+    to_lines: int
+    lines: List[DocDiffLine]
+
+
+class DocDiffOut(BaseModel):
+    doc_id: int
+    from_version: int
+    to_version: int
+    added: int
+    removed: int
+    hunks: List[DocDiffHunk]
+
+
 class DocSignatureCreate(BaseModel):
     provider: Optional[str] = "КЕП"
     signature_payload: str
@@ -1,20 +1,33 @@
 import os
 import jwt
-import pyotp
 from datetime import datetime, timedelta
-from passlib.context import CryptContext
+from functools import lru_cache
+
+# passlib (with bcrypt) and pyotp are imported on first use: most workers and
+# scripts import this module for JWT handling only.
 
 JWT_SECRET = os.getenv("JWT_SECRET", "supersecretkey")
 JWT_EXPIRE_MIN = int(os.getenv("JWT_EXPIRE_MIN", "60"))
 REFRESH_EXPIRE_DAYS = int(os.getenv("REFRESH_EXPIRE_DAYS", "7"))
+# Changing the cost re-hashes stored passwords transparently on next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+@lru_cache(maxsize=1)
+def pwd_context():
+    from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context().verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password, hashed_password):
+    """Return ``(valid, new_hash)``; ``new_hash`` is set when the stored cost is outdated."""
+
+    return pwd_context().verify_and_update(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -35,9 +48,13 @@ def decode_token(token: str):
 
 
 def generate_totp_secret() -> str:
+    import pyotp
+
     return pyotp.random_base32()
 
 
 def verify_totp(token: str, secret: str) -> bool:
+    import pyotp
+
     totp = pyotp.TOTP(secret)
     return totp.verify(token, valid_window=1)
@@ -0,0 +1,389 @@
+"""Monthly buckets, retention and archival for the audit trail.
+
+The ``audit_logs`` table is split into calendar-month buckets named
+``audit_logs_YYYYMM``:
+
+* On PostgreSQL the table is natively partitioned by ``created_at`` and each
+  bucket is a partition, so the parent table keeps serving every live row.
+* On SQLite the hot ``audit_logs`` table only holds the current month; closed
+  months are rolled into plain archive tables.
+
+Buckets older than ``AUDIT_RETENTION_DAYS`` are exported to gzip NDJSON files
+under ``AUDIT_ARCHIVE_DIR`` and dropped from the database. Archived rows stay
+readable: :func:`iter_audit_rows` merges the hot table, archive tables and
+archive files newest first.
+
+Run the maintenance job from cron or a scheduled container::
+
+    python -m backend.services.audit_archive --retention-days 90
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import heapq
+import json
+import os
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Column, Index, MetaData, Table, inspect, select, text, tuple_
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from backend.database import SessionLocal
+from backend.models import AuditLog
+
+
+AUDIT_RETENTION_DAYS = int(os.getenv("AUDIT_RETENTION_DAYS", "90"))
+AUDIT_ARCHIVE_DIR = Path(os.getenv("AUDIT_ARCHIVE_DIR", "./audit_archive"))
+AUDIT_COLUMNS = ("id", "actor_id", "action", "metadata", "created_at")
+
+HOT_TABLE = AuditLog.__table__
+_BUCKET_RE = re.compile(r"^audit_logs_(\d{4})(\d{2})$")
+_bucket_metadata = MetaData()
+
+
+# ---------------------------------------------------------------------------
+# Buckets
+# ---------------------------------------------------------------------------
+
+
+def month_start(moment: datetime | date) -> datetime:
+    return datetime(moment.year, moment.month, 1)
+
+
+def next_month(start: datetime) -> datetime:
+    return datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+
+
+@dataclass(frozen=True)
+class Bucket:
+    """One calendar month of audit records, stored as a table or a file."""
+
+    month: datetime
+    kind: str  # "table" or "file"
+
+    @property
+    def name(self) -> str:
+        return f"audit_logs_{self.month:%Y%m}"
+
+    @property
+    def end(self) -> datetime:
+        return next_month(self.month)
+
+    @property
+    def path(self) -> Path:
+        return AUDIT_ARCHIVE_DIR / f"{self.name}.ndjson.gz"
+
+
+def _bucket_table(name: str) -> Table:
+    table = _bucket_metadata.tables.get(name)
+    if table is None:
+        table = Table(name, _bucket_metadata, *(Column(col.name, col.type) for col in HOT_TABLE.columns))
+        # Same indexes as the hot table, so archive reads keep their keyset order.
+        for index in HOT_TABLE.indexes:
+            Index(
+                index.name.replace(HOT_TABLE.name, name, 1),
+                *(table.c[column.name] for column in index.columns),
+            )
+    return table
+
+
+def _create_bucket_table(connection: Connection, name: str) -> Table:
+    table = _bucket_table(name)
+    table.create(connection, checkfirst=True)
+    # Archive tables created before they had indexes get them here.
+    for index in table.indexes:
+        index.create(connection, checkfirst=True)
+    return table
+
+
+def _is_postgres(bind) -> bool:
+    return bind.dialect.name == "postgresql"
+
+
+def list_buckets(bind) -> List[Bucket]:
+    """Return every bucket held outside the hot table, newest first."""
+
+    buckets: Dict[datetime, Bucket] = {}
+    for path in AUDIT_ARCHIVE_DIR.glob("audit_logs_*.ndjson.gz"):
+        match = _BUCKET_RE.match(path.name.split(".", 1)[0])
+        if match:
+            month = datetime(int(match.group(1)), int(match.group(2)), 1)
+            buckets[month] = Bucket(month, "file")
+    for name in inspect(bind).get_table_names():
+        match = _BUCKET_RE.match(name)
+        if match:
+            month = datetime(int(match.group(1)), int(match.group(2)), 1)
+            buckets[month] = Bucket(month, "table")
+    return sorted(buckets.values(), key=lambda bucket: bucket.month, reverse=True)
+
+
+# ---------------------------------------------------------------------------
+# Querying
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class AuditQuery:
+    """Filters shared by the hot table, archive tables and archive files."""
+
+    actor_id: Optional[int] = None
+    action: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    before: Optional[Tuple[datetime, int]] = None
+
+    def statement(self, table: Table):
+        stmt = select(*(table.c[name] for name in AUDIT_COLUMNS))
+        if self.actor_id is not None:
+            stmt = stmt.where(table.c.actor_id == self.actor_id)
+        if self.action:
+            stmt = stmt.where(table.c.action.startswith(self.action, autoescape=True))
+        if self.since:
+            stmt = stmt.where(table.c.created_at >= self.since)
+        if self.until:
+            stmt = stmt.where(table.c.created_at < self.until)
+        if self.before:
+            stmt = stmt.where(tuple_(table.c.created_at, table.c.id) < self.before)
+        return stmt.order_by(table.c.created_at.desc(), table.c.id.desc())
+
+    def overlaps(self, bucket: Bucket) -> bool:
+        upper = self.until
+        if self.before and (upper is None or self.before[0] < upper):
+            upper = self.before[0] + timedelta(microseconds=1)
+        if upper is not None and bucket.month >= upper:
+            return False
+        return self.since is None or bucket.end > self.since
+
+    def matches(self, row: Dict[str, Any]) -> bool:
+        if self.actor_id is not None and row["actor_id"] != self.actor_id:
+            return False
+        if self.action and not row["action"].startswith(self.action):
+            return False
+        if self.since and row["created_at"] < self.since:
+            return False
+        if self.until and row["created_at"] >= self.until:
+            return False
+        return not (self.before and (row["created_at"], row["id"]) >= self.before)
+
+
+def _sort_key(row: Dict[str, Any]) -> Tuple[datetime, int]:
+    return row["created_at"], row["id"]
+
+
+def _iter_table(session: Session, table: Table, query: AuditQuery, limit: int | None, batch: int):
+    stmt = query.statement(table)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    result = session.execute(stmt.execution_options(yield_per=batch))
+    for row in result.mappings():
+        yield dict(row)
+
+
+def _iter_file(bucket: Bucket, query: AuditQuery) -> Iterator[Dict[str, Any]]:
+    with gzip.open(bucket.path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            row = json.loads(line)
+            row["created_at"] = datetime.fromisoformat(row["created_at"])
+            if query.since and row["created_at"] < query.since:
+                return  # files are written newest first
+            if query.matches(row):
+                yield row
+
+
+def iter_audit_rows(
+    session: Session,
+    query: AuditQuery,
+    limit: int | None = None,
+    batch: int = 1000,
+) -> Iterator[Dict[str, Any]]:
+    """Yield matching rows from every storage tier, newest first."""
+
+    sources = [_iter_table(session, HOT_TABLE, query, limit, batch)]
+    for bucket in list_buckets(session.connection()):
+        if not query.overlaps(bucket):
+            continue
+        if bucket.kind == "file":
+            sources.append(_iter_file(bucket, query))
+        elif not _is_postgres(session.get_bind()):
+            # Postgres partitions are already covered by the parent table.
+            sources.append(_iter_table(session, _bucket_table(bucket.name), query, limit, batch))
+    merged = heapq.merge(*sources, key=_sort_key, reverse=True) if len(sources) > 1 else sources[0]
+    return islice(merged, limit) if limit is not None else merged
+
+
+# ---------------------------------------------------------------------------
+# Maintenance
+# ---------------------------------------------------------------------------
+
+
+def ensure_partitioned(connection: Connection, now: datetime, months_ahead: int = 2) -> List[str]:
+    """Convert ``audit_logs`` into a range-partitioned table and pre-create buckets."""
+
+    created: List[str] = []
+    is_partitioned = connection.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = 'audit_logs'"
+        )
+    ).first()
+    if not is_partitioned:
+        connection.execute(text("ALTER TABLE audit_logs RENAME TO audit_logs_legacy"))
+        connection.execute(
+            text(
+                "CREATE TABLE audit_logs (LIKE audit_logs_legacy INCLUDING DEFAULTS) "
+                "PARTITION BY RANGE (created_at)"
+            )
+        )
+        connection.execute(text("ALTER TABLE audit_logs ALTER COLUMN created_at SET NOT NULL"))
+        connection.execute(text("ALTER TABLE audit_logs ADD PRIMARY KEY (id, created_at)"))
+        connection.execute(text("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id"))
+        connection.execute(text("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT"))
+        oldest, newest = connection.execute(
+            text("SELECT min(created_at), max(created_at) FROM audit_logs_legacy")
+        ).one()
+        # Every legacy row needs its month's partition before the copy: rows
+        # landing in the default partition would block creating it later.
+        for month in partition_months(now, months_ahead, oldest, newest):
+            created.append(_create_partition(connection, month))
+        connection.execute(
+            text(
+                "INSERT INTO audit_logs (id, actor_id, action, metadata, created_at) "
+                "SELECT id, actor_id, action, metadata, COALESCE(created_at, now()) "
+                "FROM audit_logs_legacy"
+            )
+        )
+        connection.execute(text("DROP TABLE audit_logs_legacy"))
+        connection.execute(
+            text(
+                "ALTER TABLE audit_logs ADD FOREIGN KEY (actor_id) "
+                "REFERENCES users (id) ON DELETE SET NULL"
+            )
+        )
+        for index in HOT_TABLE.indexes:
+            index.create(connection)
+
+    for month in partition_months(now, months_ahead):
+        created.append(_create_partition(connection, month))
+    return [name for name in created if name]
+
+
+def partition_months(
+    now: datetime,
+    months_ahead: int,
+    oldest: Optional[datetime] = None,
+    newest: Optional[datetime] = None,
+) -> List[datetime]:
+    """Months from ``oldest`` through ``months_ahead`` past ``now`` (or ``newest``, if later)."""
+
+    last = month_start(now)
+    for _ in range(months_ahead):
+        last = next_month(last)
+    if newest is not None and month_start(newest) > last:
+        last = month_start(newest)
+    month = month_start(min(oldest, now) if oldest is not None else now)
+    months = []
+    while month <= last:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+
+def _create_partition(connection: Connection, month: datetime) -> str:
+    bucket = Bucket(month, "table")
+    exists = connection.execute(text("SELECT to_regclass(:name)"), {"name": bucket.name}).scalar()
+    if exists:
+        return ""
+    connection.execute(
+        text(
+            f"CREATE TABLE {bucket.name} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{bucket.month:%Y-%m-%d}') TO ('{bucket.end:%Y-%m-%d}')"
+        )
+    )
+    return bucket.name
+
+
+def roll_hot_table(connection: Connection, now: datetime) -> List[str]:
+    """Move closed months out of the SQLite hot table into archive tables."""
+
+    rolled: List[str] = []
+    cutoff = month_start(now)
+    for bucket in list_buckets(connection):
+        if bucket.kind == "table":
+            _create_bucket_table(connection, bucket.name)
+    while True:
+        oldest = connection.execute(
+            select(HOT_TABLE.c.created_at)
+            .where(HOT_TABLE.c.created_at < cutoff)
+            .order_by(HOT_TABLE.c.created_at)
+            .limit(1)
+        ).scalar()
+        if oldest is None:
+            return rolled
+        bucket = Bucket(month_start(oldest), "table")
+        table = _create_bucket_table(connection, bucket.name)
+        window = (HOT_TABLE.c.created_at >= bucket.month) & (HOT_TABLE.c.created_at < bucket.end)
+        columns = [HOT_TABLE.c[name] for name in AUDIT_COLUMNS]
+        connection.execute(table.insert().from_select(list(AUDIT_COLUMNS), select(*columns).where(window)))
+        connection.execute(HOT_TABLE.delete().where(window))
+        rolled.append(bucket.name)
+
+
+def _export_bucket(connection: Connection, bucket: Bucket) -> int:
+    AUDIT_ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    table = _bucket_table(bucket.name)
+    temp_path = bucket.path.with_suffix(".tmp")
+    written = 0
+    result = connection.execute(AuditQuery().statement(table).execution_options(yield_per=1000))
+    with gzip.open(temp_path, "wt", encoding="utf-8") as handle:
+        for row in result.mappings():
+            handle.write(json.dumps(dict(row), default=str, ensure_ascii=False) + "\n")
+            written += 1
+    os.replace(temp_path, bucket.path)
+    return written
+
+
+def archive_expired(connection: Connection, now: datetime, retention_days: int) -> Dict[str, int]:
+    """Export buckets past retention to gzip NDJSON and drop them from the database."""
+
+    cutoff = now - timedelta(days=retention_days)
+    archived: Dict[str, int] = {}
+    for bucket in list_buckets(connection):
+        if bucket.kind != "table" or bucket.end > cutoff:
+            continue
+        archived[bucket.name] = _export_bucket(connection, bucket)
+        connection.execute(text(f"DROP TABLE {bucket.name}"))
+    return archived
+
+
+def run_maintenance(now: datetime | None = None, retention_days: int = AUDIT_RETENTION_DAYS) -> Dict[str, Any]:
+    now = now or datetime.utcnow()
+    with SessionLocal() as session:
+        connection = session.connection()
+        if _is_postgres(connection):
+            rotated = ensure_partitioned(connection, now)
+        else:
+            rotated = roll_hot_table(connection, now)
+        session.commit()
+        archived = archive_expired(session.connection(), now, retention_days)
+        session.commit()
+    return {"rotated": rotated, "archived": archived}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rotate and archive audit log buckets.")
+    parser.add_argument("--retention-days", type=int, default=AUDIT_RETENTION_DAYS)
+    args = parser.parse_args()
+    summary = run_maintenance(retention_days=args.retention_days)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Audit trail writer with configurable durability.
+
+``AUDIT_LOG_MODE`` selects how records reach the ``audit_logs`` table:
+
+* ``synchronous`` – the record is committed immediately, or with the
+  request's unit of work when the session belongs to one.
+* ``same-transaction`` – the record joins the caller's session and is
+  committed by the request's unit of work together with its own changes.
+* ``buffered`` – the record is queued in memory and bulk-inserted by a
+  background flusher once ``AUDIT_BATCH_SIZE`` rows are waiting or
+  ``AUDIT_FLUSH_INTERVAL`` seconds have passed. Pending rows are drained on
+  shutdown but are lost if the process dies abruptly. Callers never wait
+  for room in the buffer (async routers record from the event loop): when
+  it is full the record is written like a ``synchronous`` one instead.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from backend.database import SessionLocal
+from backend.models import AuditLog
+
+
+logger = logging.getLogger(__name__)
+
+AUDIT_LOG_MODES = ("synchronous", "same-transaction", "buffered")
+AUDIT_LOG_MODE = os.getenv("AUDIT_LOG_MODE", "synchronous")
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+AUDIT_BUFFER_SIZE = int(os.getenv("AUDIT_BUFFER_SIZE", "10000"))
+
+
+class AuditSink:
+    """Route audit records according to the configured durability mode."""
+
+    def __init__(
+        self,
+        mode: str = AUDIT_LOG_MODE,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        buffer_size: int = AUDIT_BUFFER_SIZE,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ) -> None:
+        if mode not in AUDIT_LOG_MODES:
+            raise ValueError(f"Unknown AUDIT_LOG_MODE {mode!r}; expected one of {AUDIT_LOG_MODES}")
+        self.mode = mode
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self.session_factory = session_factory
+        self.flushed = 0
+        self.failed = 0
+        self.overflowed = 0
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=buffer_size)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def record(self, db: Session, actor_id: int | None, action: str, metadata: dict | None) -> None:
+        if self.mode == "buffered":
+            self._ensure_started()
+            try:
+                self._queue.put_nowait(
+                    {
+                        "actor_id": actor_id,
+                        "action": action,
+                        "metadata": metadata or {},
+                        "created_at": datetime.utcnow(),
+                    }
+                )
+                return
+            except queue.Full:
+                # Blocking here would stall the whole event loop; keep the
+                # record by writing it with the caller's session instead.
+                self.overflowed += 1
+
+        db.add(AuditLog(actor_id=actor_id, action=action, meta=metadata or {}))
+        # Inside a unit of work the request's own commit covers the record.
+        if self.mode != "same-transaction" and not db.info.get("unit_of_work"):
+            db.commit()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="audit-flusher", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._collect_batch()
+            if batch:
+                self._write(batch)
+
+    def _collect_batch(self) -> List[Dict[str, Any]]:
+        batch: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0 or (self._stop.is_set() and self._queue.empty()):
+                break
+            try:
+                batch.append(self._queue.get(timeout=min(timeout, 0.1)))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            with self.session_factory() as session:
+                session.execute(insert(AuditLog.__table__), batch)
+                session.commit()
+            self.flushed += len(batch)
+        except Exception:  # pragma: no cover - requires broken DB
+            self.failed += len(batch)
+            logger.exception("Failed to flush %d audit records", len(batch))
+
+    def shutdown(self, timeout: float | None = 10.0) -> None:
+        """Stop the flusher after writing everything still buffered."""
+
+        with self._lock:
+            thread = self._thread
+            self._stop.set()
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "buffered": self._queue.qsize(),
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "overflowed": self.overflowed,
+        }
+
+
+audit_sink = AuditSink()
@@ -0,0 +1,315 @@
+"""Per-project feed of task changes for live Kanban boards.
+
+The tasks router bumps ``Project.tasks_version`` on every write (see
+:func:`backend.routers.tasks.touch_projects`) and hands the new version and
+the changed tasks to :func:`publish_on_commit`. Once the transaction
+commits, one :class:`BoardMessage` per project reaches the broker, which
+fans it out to the project's subscribers and keeps the latest
+``BOARD_EVENTS_HISTORY`` messages so a reconnecting client can ask for
+everything after the last sequence number it saw.
+
+Sequence numbers are the project's ``tasks_version``, so they are ordered
+by commit and shared by every process writing to the database. Commit
+callbacks of concurrent transactions may still publish out of that order,
+so a stream holds a message until the ones before it arrive. When the
+history cannot fill the gap since the client's sequence, or a gap stays
+open for ``BOARD_EVENTS_GAP_WAIT`` seconds (a write this broker never saw),
+the stream sends a ``reset`` telling the client to reload the board instead.
+
+:data:`broker` is an in-process :class:`InProcessBroker`, which only sees
+writes made by its own worker and is only correct with a single worker.
+Under several workers the versions other processes take look like gaps,
+so every client watching a board would be reset and disconnected after
+each write made elsewhere. Such deployments must replace it at startup with
+a :class:`BoardBroker` backed by a shared broker (Redis pub/sub, Postgres
+``LISTEN/NOTIFY``) using :func:`set_broker`; the in-process broker logs a
+warning when ``WEB_CONCURRENCY`` asks for more than one worker or when a
+gap times out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Dict, List, Optional
+
+from backend.database import on_commit
+
+
+logger = logging.getLogger(__name__)
+
+BOARD_EVENTS_HISTORY = int(os.getenv("BOARD_EVENTS_HISTORY", "500"))
+BOARD_EVENTS_QUEUE = int(os.getenv("BOARD_EVENTS_QUEUE", "1000"))
+BOARD_EVENTS_PING = float(os.getenv("BOARD_EVENTS_PING", "15"))
+# Larger batches (bulk writes) are announced as a reset instead of task by task.
+BOARD_EVENTS_BATCH_MAX = int(os.getenv("BOARD_EVENTS_BATCH_MAX", "200"))
+BOARD_EVENTS_GAP_WAIT = float(os.getenv("BOARD_EVENTS_GAP_WAIT", "2"))
+
+EVENT_TYPES = ("task.created", "task.updated", "task.moved", "task.deleted")
+
+
+@dataclass(frozen=True)
+class BoardMessage:
+    """The task changes one transaction made to one project.
+
+    ``reset`` messages carry no events: the change was too large to stream.
+    """
+
+    project_id: int
+    seq: int
+    events: List[dict]
+    reset: bool = False
+
+    def to_sse(self) -> str:
+        if self.reset:
+            return reset_sse(self.project_id, self.seq)
+        data = json.dumps({"project_id": self.project_id, "seq": self.seq, "events": self.events})
+        return f"id: {self.seq}\nevent: board\ndata: {data}\n\n"
+
+
+def reset_sse(project_id: int, seq: int) -> str:
+    """Tell the client its board is stale: reload it, then keep applying events after ``seq``."""
+
+    data = json.dumps({"project_id": project_id, "seq": seq})
+    return f"id: {seq}\nevent: reset\ndata: {data}\n\n"
+
+
+class Subscription:
+    """A client's queue of messages for one project, filled from any thread.
+
+    ``None`` in the queue means the client fell too far behind.
+    """
+
+    def __init__(self, project_id: int, loop: asyncio.AbstractEventLoop) -> None:
+        self.project_id = project_id
+        self.loop = loop
+        self.queue: "asyncio.Queue[Optional[BoardMessage]]" = asyncio.Queue(maxsize=BOARD_EVENTS_QUEUE)
+
+    def _put(self, message: BoardMessage) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A client this far behind reloads the board instead.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    def deliver(self, message: BoardMessage) -> None:
+        self.loop.call_soon_threadsafe(self._put, message)
+
+
+class BoardBroker(ABC):
+    """Fan-out of committed board messages to subscribers, with replay."""
+
+    @abstractmethod
+    def publish(self, messages: List[BoardMessage]) -> None:
+        """Deliver ``messages`` to every subscriber of their projects, in every worker."""
+
+    @abstractmethod
+    def history(self, project_id: int, since: int) -> List[BoardMessage]:
+        """Retained messages of ``project_id`` with ``seq > since``, oldest first."""
+
+    @abstractmethod
+    def subscribe(self, project_id: int) -> Subscription:
+        """Start queueing messages of ``project_id`` for the running event loop."""
+
+    @abstractmethod
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering to ``subscription``."""
+
+    def missed(self, project_id: int, seq: int) -> None:
+        """Called when a stream gave up waiting for the message after ``seq``."""
+
+
+class InProcessBroker(BoardBroker):
+    """Broker for a single worker: subscribers and history live in this process.
+
+    Writes made by other processes never reach it, so with several workers
+    their sequence numbers show up as gaps that reset every client.
+    """
+
+    def __init__(self, history_size: int = BOARD_EVENTS_HISTORY) -> None:
+        self.history_size = history_size
+        self._history: Dict[int, Deque[BoardMessage]] = defaultdict(lambda: deque(maxlen=self.history_size))
+        self._subscribers: Dict[int, set] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._warned = False
+
+    def _warn(self, reason: str) -> None:
+        if not self._warned:
+            self._warned = True
+            logger.warning(
+                "Live board feed uses the in-process broker, but %s; clients will be reset on "
+                "writes made by other workers. Install a shared broker with set_broker().",
+                reason,
+            )
+
+    def publish(self, messages: List[BoardMessage]) -> None:
+        with self._lock:
+            targets = []
+            for message in messages:
+                self._history[message.project_id].append(message)
+                subscribers = self._subscribers.get(message.project_id, ())
+                targets.extend((subscription, message) for subscription in subscribers)
+        for subscription, message in targets:
+            subscription.deliver(message)
+
+    def history(self, project_id: int, since: int) -> List[BoardMessage]:
+        with self._lock:
+            messages = [message for message in self._history.get(project_id, ()) if message.seq > since]
+        return sorted(messages, key=lambda message: message.seq)
+
+    def subscribe(self, project_id: int) -> Subscription:
+        if _configured_workers() > 1:
+            self._warn(f"WEB_CONCURRENCY={_configured_workers()}")
+        subscription = Subscription(project_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[project_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.project_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.project_id]
+
+    def missed(self, project_id: int, seq: int) -> None:
+        self._warn(f"project {project_id} advanced past {seq} without this worker seeing it")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "projects": len(self._history),
+                "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            }
+
+
+def _configured_workers() -> int:
+    # uvicorn --workers and gunicorn -w both default to this variable.
+    try:
+        return int(os.getenv("WEB_CONCURRENCY", "1"))
+    except ValueError:
+        return 1
+
+
+broker: BoardBroker = InProcessBroker()
+
+
+def set_broker(replacement: BoardBroker) -> None:
+    """Install the broker every stream and commit hook uses from now on.
+
+    The default :class:`InProcessBroker` only works with a single worker;
+    call this at startup with a shared broker whenever the API runs several.
+    """
+
+    global broker
+    broker = replacement
+
+
+def task_event(event_type: str, task_id: int, task: Optional[dict] = None) -> dict:
+    """One change; ``task`` is the serialized ``TaskOut`` (absent for deletions)."""
+
+    if event_type not in EVENT_TYPES:
+        raise ValueError(f"Unknown board event {event_type!r}")
+    return {"type": event_type, "task_id": task_id, "task": task}
+
+
+def publish_on_commit(db, versions: Dict[int, int], events: Dict[int, List[dict]]) -> None:
+    """Queue ``events`` (by project id) for subscribers once ``db`` commits.
+
+    ``versions`` maps each project to the ``tasks_version`` this transaction
+    set, which becomes the message's sequence number.
+    """
+
+    messages = [
+        BoardMessage(project_id, versions[project_id], [], reset=True)
+        if len(project_events) > BOARD_EVENTS_BATCH_MAX
+        else BoardMessage(project_id, versions[project_id], project_events)
+        for project_id, project_events in events.items()
+        if project_events and project_id in versions
+    ]
+    if messages:
+        on_commit(db, lambda: broker.publish(messages))
+
+
+class Sequencer:
+    """Releases messages in sequence order, holding those that arrive ahead of a gap."""
+
+    def __init__(self, last: int) -> None:
+        self.last = last
+        self.pending: Dict[int, BoardMessage] = {}
+
+    def push(self, message: BoardMessage) -> List[BoardMessage]:
+        """The messages ready to send now that ``message`` arrived."""
+
+        if message.seq > self.last:
+            self.pending.setdefault(message.seq, message)
+        ready = []
+        while self.last + 1 in self.pending:
+            ready.append(self.pending.pop(self.last + 1))
+            self.last += 1
+        return ready
+
+
+def _has_gap(backlog: List[BoardMessage], last: int, current: int) -> bool:
+    """Whether ``backlog`` misses any sequence number in ``(last, current]``."""
+
+    seqs = [message.seq for message in backlog if last < message.seq <= current]
+    return seqs != list(range(last + 1, current + 1))
+
+
+async def stream(project_id: int, since: Optional[int], current: int) -> AsyncIterator[str]:
+    """Server-sent events for ``project_id``: missed messages after ``since``, then live ones.
+
+    ``current`` is the project's ``tasks_version`` read when the client
+    connected. Clients without a ``since`` start live from ``current``.
+    """
+
+    # Subscribe before reading the history so nothing published in between is lost.
+    subscription = broker.subscribe(project_id)
+    loop = asyncio.get_running_loop()
+    try:
+        last = current if since is None else since
+        backlog = broker.history(project_id, min(last, current))
+        if last > current or _has_gap(backlog, last, current):
+            # Either the sequence came from another database (or the board is
+            # gone), or the history no longer covers what the client missed.
+            last = current
+            yield reset_sse(project_id, current)
+        sequencer = Sequencer(last)
+        for message in backlog:
+            for ready in sequencer.push(message):
+                yield ready.to_sse()
+        gap_deadline = loop.time() + BOARD_EVENTS_GAP_WAIT if sequencer.pending else None
+        while True:
+            timeout = BOARD_EVENTS_PING if gap_deadline is None else max(0.0, gap_deadline - loop.time())
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                if gap_deadline is not None:
+                    # The missing messages are not coming: another worker's
+                    # write, or one this process lost.
+                    broker.missed(project_id, sequencer.last)
+                    yield reset_sse(project_id, sequencer.last)
+                    return
+                yield ": ping\n\n"
+                continue
+            if message is None:
+                yield reset_sse(project_id, sequencer.last)
+                return
+            for ready in sequencer.push(message):
+                yield ready.to_sse()
+            if not sequencer.pending:
+                gap_deadline = None
+            elif gap_deadline is None:
+                gap_deadline = loop.time() + BOARD_EVENTS_GAP_WAIT
+    finally:
+        broker.unsubscribe(subscription)
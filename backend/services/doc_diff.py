@@ -0,0 +1,314 @@
+"""Line and word diffs between document versions, cached per version pair.
+
+:func:`opcodes` implements Myers' O(ND) difference algorithm with its
+linear-space refinement: each step finds the middle snake of the edit
+path, emits it and recurses on the two halves, so memory stays linear in
+the input however far apart the versions are. Lines are compared first;
+inside each replaced block, deleted and inserted lines are paired and
+diffed again over words for inline highlighting.
+
+Myers' running time grows with the number of differences, so each diff
+gets a budget of ``DOC_DIFF_MAX_COST`` steps shared by the line and word
+passes. Once it is spent, the section still being compared becomes one
+replaced block, as GNU diff does for sections it finds too expensive: the
+hunks stay correct, just not minimal.
+
+Versions never change once written, so a diff is cached by
+``(doc_id, from, to, context)`` in a per-process LRU (:data:`diff_cache`)
+bounded by entry count and by ``DOC_DIFF_CACHE_BYTES`` of diff text, and
+only dropped when its document is deleted.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+DOC_DIFF_CONTEXT = int(os.getenv("DOC_DIFF_CONTEXT", "3"))
+DOC_DIFF_CACHE_SIZE = int(os.getenv("DOC_DIFF_CACHE_SIZE", "512"))
+DOC_DIFF_CACHE_BYTES = int(os.getenv("DOC_DIFF_CACHE_BYTES", str(32 * 1024 * 1024)))
+# Comparison steps per diff before the remaining changes are reported as whole blocks.
+DOC_DIFF_MAX_COST = int(os.getenv("DOC_DIFF_MAX_COST", "1000000"))
+
+Opcode = Tuple[str, int, int, int, int]
+
+_WORD = re.compile(r"\w+|\s+|[^\w\s]")
+
+
+class Budget:
+    """Comparison steps left for one diff."""
+
+    __slots__ = ("left",)
+
+    def __init__(self, steps: int = DOC_DIFF_MAX_COST) -> None:
+        self.left = steps
+
+
+def _middle_snake(
+    a: Sequence[Hashable], b: Sequence[Hashable], budget: Budget
+) -> Optional[Tuple[int, int, int, int]]:
+    """``(x, y, u, v)``: a diagonal run ``a[x:u] == b[y:v]`` on some shortest edit path.
+
+    ``None`` once ``budget`` runs out.
+    """
+
+    n, m = len(a), len(b)
+    delta = n - m
+    odd = delta % 2 == 1
+    limit = (n + m + 1) // 2 + 1
+    offset = limit + 1
+    forward = [0] * (2 * offset + 1)
+    backward = [0] * (2 * offset + 1)
+    for d in range(limit):
+        if budget.left <= 0:
+            return None
+        budget.left -= 2 * (d + 1)
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and forward[offset + k - 1] < forward[offset + k + 1]):
+                x = forward[offset + k + 1]
+            else:
+                x = forward[offset + k - 1] + 1
+            y = x - k
+            start_x, start_y = x, y
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            budget.left -= x - start_x
+            forward[offset + k] = x
+            if odd and delta - (d - 1) <= k <= delta + (d - 1) and x + backward[offset + delta - k] >= n:
+                return start_x, start_y, x, y
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and backward[offset + k - 1] < backward[offset + k + 1]):
+                x = backward[offset + k + 1]
+            else:
+                x = backward[offset + k - 1] + 1
+            y = x - k
+            start_x, start_y = x, y
+            while x < n and y < m and a[n - 1 - x] == b[m - 1 - y]:
+                x += 1
+                y += 1
+            budget.left -= x - start_x
+            backward[offset + k] = x
+            if not odd and -d <= delta - k <= d and x + forward[offset + delta - k] >= n:
+                return n - x, m - y, n - start_x, m - start_y
+    raise AssertionError("no middle snake")  # pragma: no cover - unreachable for finite input
+
+
+def _edits(a: Sequence[Hashable], b: Sequence[Hashable], i: int, j: int, budget: Budget) -> Iterator[Opcode]:
+    """Equal/delete/insert runs turning ``a`` into ``b`` (offset by ``i``, ``j``)."""
+
+    prefix = 0
+    while prefix < len(a) and prefix < len(b) and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < len(a) - prefix and suffix < len(b) - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    if prefix:
+        yield "equal", i, i + prefix, j, j + prefix
+    a_mid, b_mid = a[prefix:len(a) - suffix], b[prefix:len(b) - suffix]
+    i_mid, j_mid = i + prefix, j + prefix
+    if not a_mid and b_mid:
+        yield "insert", i_mid, i_mid, j_mid, j_mid + len(b_mid)
+    elif a_mid and not b_mid:
+        yield "delete", i_mid, i_mid + len(a_mid), j_mid, j_mid
+    elif a_mid:
+        # Both ends differ here, so the edit distance is at least two and the
+        # snake splits the problem into two strictly smaller ones.
+        snake = _middle_snake(a_mid, b_mid, budget)
+        if snake is None:
+            yield "delete", i_mid, i_mid + len(a_mid), j_mid, j_mid
+            yield "insert", i_mid + len(a_mid), i_mid + len(a_mid), j_mid, j_mid + len(b_mid)
+        else:
+            x, y, u, v = snake
+            yield from _edits(a_mid[:x], b_mid[:y], i_mid, j_mid, budget)
+            if u > x:
+                yield "equal", i_mid + x, i_mid + u, j_mid + y, j_mid + v
+            yield from _edits(a_mid[u:], b_mid[v:], i_mid + u, j_mid + v, budget)
+    if suffix:
+        yield "equal", i + len(a) - suffix, i + len(a), j + len(b) - suffix, j + len(b)
+
+
+def opcodes(a: Sequence[Hashable], b: Sequence[Hashable], budget: Optional[Budget] = None) -> List[Opcode]:
+    """``difflib``-style opcodes (equal, delete, insert, replace) of a shortest edit script.
+
+    The script is only shortest while ``budget`` (default: a fresh
+    ``DOC_DIFF_MAX_COST``) lasts.
+    """
+
+    merged: List[list] = []
+    for tag, i1, i2, j1, j2 in _edits(a, b, 0, 0, budget or Budget()):
+        last = merged[-1] if merged else None
+        if last is not None and (last[0] == tag == "equal" or "equal" not in (last[0], tag)):
+            # Adjacent deletions and insertions form one replaced block.
+            if last[0] != tag:
+                last[0] = "replace"
+            last[2], last[4] = i2, j2
+        else:
+            merged.append([tag, i1, i2, j1, j2])
+    return [tuple(code) for code in merged]
+
+
+def grouped(codes: List[Opcode], context: int) -> List[List[Opcode]]:
+    """Split ``codes`` into hunks with at most ``context`` unchanged lines around each change."""
+
+    if not codes or all(code[0] == "equal" for code in codes):
+        return []
+    codes = list(codes)
+    tag, i1, i2, j1, j2 = codes[0]
+    if tag == "equal":
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    tag, i1, i2, j1, j2 = codes[-1]
+    if tag == "equal":
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+
+    groups: List[List[Opcode]] = []
+    group: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > 2 * context:
+            group.append((tag, i1, i1 + context, j1, j1 + context))
+            groups.append(group)
+            group = []
+            i1, j1 = i2 - context, j2 - context
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        groups.append(group)
+    return groups
+
+
+def word_segments(
+    old: str, new: str, budget: Optional[Budget] = None
+) -> Tuple[List[List[str]], List[List[str]]]:
+    """Inline segments of a changed line pair: ``[op, text]`` with ``=``, ``-`` (old) and ``+`` (new)."""
+
+    a, b = _WORD.findall(old), _WORD.findall(new)
+    removed: List[List[str]] = []
+    added: List[List[str]] = []
+
+    def push(segments: List[List[str]], op: str, text: str) -> None:
+        if not text:
+            return
+        if segments and segments[-1][0] == op:
+            segments[-1][1] += text
+        else:
+            segments.append([op, text])
+
+    for tag, i1, i2, j1, j2 in opcodes(a, b, budget):
+        if tag == "equal":
+            push(removed, "=", "".join(a[i1:i2]))
+            push(added, "=", "".join(b[j1:j2]))
+        else:
+            push(removed, "-", "".join(a[i1:i2]))
+            push(added, "+", "".join(b[j1:j2]))
+    return removed, added
+
+
+def build_diff(old_text: str, new_text: str, context: int = DOC_DIFF_CONTEXT) -> dict:
+    """Hunks turning ``old_text`` into ``new_text``, shaped like ``DocDiffOut`` without the ids."""
+
+    old, new = old_text.splitlines(), new_text.splitlines()
+    budget = Budget()
+    codes = opcodes(old, new, budget)
+    hunks = []
+    for group in grouped(codes, context):
+        lines: List[dict] = []
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                lines.extend({"op": " ", "text": line} for line in old[i1:i2])
+                continue
+            removed = [{"op": "-", "text": line} for line in old[i1:i2]]
+            added = [{"op": "+", "text": line} for line in new[j1:j2]]
+            if tag == "replace":
+                for before, after in zip(removed, added):
+                    before["words"], after["words"] = word_segments(before["text"], after["text"], budget)
+            lines.extend(removed + added)
+        first, last = group[0], group[-1]
+        hunks.append(
+            {
+                "from_start": first[1] + 1,
+                "from_lines": last[2] - first[1],
+                "to_start": first[3] + 1,
+                "to_lines": last[4] - first[3],
+                "lines": lines,
+            }
+        )
+    return {
+        "added": sum(j2 - j1 for tag, _, _, j1, j2 in codes if tag != "equal"),
+        "removed": sum(i2 - i1 for tag, i1, i2, _, _ in codes if tag != "equal"),
+        "hunks": hunks,
+    }
+
+
+def _diff_bytes(diff: dict) -> int:
+    """Rough memory held by a diff: its text plus a fixed overhead per line."""
+
+    total = 0
+    for hunk in diff["hunks"]:
+        for line in hunk["lines"]:
+            total += 100 + 2 * len(line["text"])
+            if line.get("words"):
+                total += 2 * len(line["text"]) + 80 * len(line["words"])
+    return total
+
+
+class DiffCache:
+    """LRU of computed diffs keyed by ``(doc_id, from, to, context)``.
+
+    Bounded both by entry count and by the estimated bytes of the cached
+    diffs; a diff larger than the whole byte budget is not cached.
+    """
+
+    def __init__(self, maxsize: int = DOC_DIFF_CACHE_SIZE, maxbytes: int = DOC_DIFF_CACHE_BYTES) -> None:
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries: "OrderedDict[Tuple[int, int, int, int], Tuple[dict, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[int, int, int, int]) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple[int, int, int, int], diff: dict) -> None:
+        size = _diff_bytes(diff)
+        if self.maxsize <= 0 or size > self.maxbytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = diff, size
+            self._bytes += size
+            while len(self._entries) > self.maxsize or self._bytes > self.maxbytes:
+                self._bytes -= self._entries.popitem(last=False)[1][1]
+
+    def invalidate_doc(self, doc_id: int) -> None:
+        """Forget ``doc_id``'s diffs (its id may be reused once the document is deleted)."""
+
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == doc_id]:
+                self._bytes -= self._entries.pop(key)[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+diff_cache = DiffCache()
@@ -0,0 +1,219 @@
+"""Document version storage as line deltas with periodic snapshots.
+
+Each :class:`DocVersion` row holds either the full text (``content_md``, a
+snapshot) or ``delta``: the edit turning the previous version's text into
+this one's. Every ``DOC_SNAPSHOT_EVERY``-th version is a snapshot, so any
+version is rebuilt from one range query and at most
+``DOC_SNAPSHOT_EVERY - 1`` delta applications, while a one-line edit to a
+long page costs a few dozen bytes instead of a full copy.
+
+A delta is a JSON list of operations over the previous text's lines (line
+endings included, so reconstruction is byte-exact): a positive integer
+copies that many lines, a negative one skips that many, and a list of
+strings inserts those lines. Rows written before deltas existed are
+snapshots; convert them with::
+
+    python -m backend.services.doc_versions backfill
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import os
+from collections import deque
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from backend.models import DocVersion
+
+
+DOC_SNAPSHOT_EVERY = max(1, int(os.getenv("DOC_SNAPSHOT_EVERY", "50")))
+
+Operation = Union[int, List[str]]
+
+
+def make_delta(base: str, target: str) -> str:
+    """Encode the edit from ``base`` to ``target`` over lines."""
+
+    old, new = base.splitlines(keepends=True), target.splitlines(keepends=True)
+    operations: List[Operation] = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old, new).get_opcodes():
+        if tag == "equal":
+            operations.append(i2 - i1)
+            continue
+        if i2 > i1:
+            operations.append(i1 - i2)
+        if j2 > j1:
+            operations.append(new[j1:j2])
+    return json.dumps(operations, ensure_ascii=False, separators=(",", ":"))
+
+
+def _apply(old: Sequence[str], delta: str) -> List[str]:
+    lines: List[str] = []
+    position = 0
+    for operation in json.loads(delta):
+        if isinstance(operation, list):
+            lines.extend(operation)
+        elif operation > 0:
+            lines.extend(old[position:position + operation])
+            position += operation
+        else:
+            position -= operation
+    return lines
+
+
+def apply_delta(base: str, delta: str) -> str:
+    """Rebuild the text :func:`make_delta` encoded from ``base``."""
+
+    return "".join(_apply(base.splitlines(keepends=True), delta))
+
+
+def is_snapshot(version: int) -> bool:
+    return version % DOC_SNAPSHOT_EVERY == 1 or DOC_SNAPSHOT_EVERY == 1
+
+
+def _delta_if_smaller(previous: Optional[str], content: str, version: int) -> Optional[str]:
+    """The delta to store for ``version``, or ``None`` where a snapshot is due or no larger."""
+
+    if previous is None or is_snapshot(version):
+        return None
+    delta = make_delta(previous, content)
+    return delta if len(delta) < len(content) else None
+
+
+def new_version(
+    doc_id: int, version: int, content: str, previous: Optional[str], created_by: Optional[int]
+) -> DocVersion:
+    """The row for ``version``; ``previous`` is the text of the version before it."""
+
+    delta = _delta_if_smaller(previous, content, version)
+    if delta is None:
+        return DocVersion(doc_id=doc_id, version=version, content_md=content, created_by=created_by)
+    return DocVersion(doc_id=doc_id, version=version, delta=delta, created_by=created_by)
+
+
+def _chain(rows: Iterable[DocVersion]) -> Iterator[Tuple[DocVersion, Optional[List[str]]]]:
+    lines: Optional[List[str]] = None
+    for row in rows:
+        if row.delta is None:
+            lines = (row.content_md or "").splitlines(keepends=True)
+        elif lines is not None:
+            lines = _apply(lines, row.delta)
+        yield row, lines
+
+
+def materialize(rows: Iterable[DocVersion]) -> Iterator[Tuple[DocVersion, Optional[str]]]:
+    """Pair rows (ascending by version, starting at a snapshot) with their text.
+
+    ``None`` marks rows that cannot be rebuilt because their chain does not
+    start at a snapshot.
+    """
+
+    for row, lines in _chain(rows):
+        yield row, "".join(lines) if lines is not None else None
+
+
+def snapshot_before(version: int) -> int:
+    """The snapshot ``version`` is rebuilt from under the current ``DOC_SNAPSHOT_EVERY``."""
+
+    return max(1, version - (version - 1) % DOC_SNAPSHOT_EVERY)
+
+
+def chain_statement(doc_id: int, version: int, start=None):
+    """Rows from ``start`` (default: the last snapshot at or before ``version``) up to ``version``."""
+
+    if start is None:
+        start = (
+            select(func.max(DocVersion.version))
+            .where(DocVersion.doc_id == doc_id, DocVersion.version <= version, DocVersion.delta.is_(None))
+            .scalar_subquery()
+        )
+    return (
+        select(DocVersion)
+        .where(DocVersion.doc_id == doc_id, DocVersion.version.between(start, version))
+        .order_by(DocVersion.version)
+    )
+
+
+def version_content(db: Session, doc_id: int, version: int) -> Optional[Tuple[DocVersion, str]]:
+    """The row of ``version`` and its full text, or ``None`` if there is no such version."""
+
+    # Versions written under the current DOC_SNAPSHOT_EVERY start their chain
+    # at a known number; older layouts fall back to looking the snapshot up.
+    rows = db.scalars(chain_statement(doc_id, version, snapshot_before(version))).all()
+    if rows and rows[0].delta is not None:
+        rows = db.scalars(chain_statement(doc_id, version)).all()
+    if not rows or rows[-1].version != version:
+        return None
+    row, lines = deque(_chain(rows), maxlen=1)[0]
+    return (row, "".join(lines)) if lines is not None else None
+
+
+def backfill_doc(connection: Connection, doc_id: int) -> Tuple[int, int]:
+    """Store ``doc_id``'s versions as deltas and snapshots; return (bytes before, bytes after)."""
+
+    table = DocVersion.__table__
+    rows = connection.execute(
+        select(table.c.id, table.c.version, table.c.content_md, table.c.delta)
+        .where(table.c.doc_id == doc_id)
+        .order_by(table.c.version)
+    ).all()
+    before = after = 0
+    previous: Optional[str] = None
+    for row in rows:
+        if row.delta is None:
+            content = stored = row.content_md or ""
+        else:
+            content, stored = apply_delta(previous or "", row.delta), row.delta
+        before += len(stored.encode("utf-8"))
+        delta = _delta_if_smaller(previous, content, row.version) if row.delta is None else None
+        if delta is not None:
+            connection.execute(update(table).where(table.c.id == row.id).values(content_md=None, delta=delta))
+            stored = delta
+        after += len(stored.encode("utf-8"))
+        previous = content
+    return before, after
+
+
+def backfill(connection: Connection, batch: int = 100, commit: bool = True) -> Tuple[int, int, int]:
+    """Convert every document's full-copy versions; return (docs, bytes before, bytes after).
+
+    With ``commit`` each batch of documents is committed on its own.
+    """
+
+    table = DocVersion.__table__
+    doc_ids: Sequence[int] = (
+        connection.execute(select(table.c.doc_id).distinct().order_by(table.c.doc_id)).scalars().all()
+    )
+    before = after = 0
+    for index, doc_id in enumerate(doc_ids, start=1):
+        doc_before, doc_after = backfill_doc(connection, doc_id)
+        before += doc_before
+        after += doc_after
+        if commit and index % batch == 0:
+            connection.commit()
+    if commit:
+        connection.commit()
+    return len(doc_ids), before, after
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain delta-compressed document versions.")
+    parser.add_argument("command", choices=("backfill",), nargs="?", default="backfill")
+    parser.add_argument("--batch", type=int, default=100, help="documents per transaction")
+    args = parser.parse_args()
+
+    from backend.database import get_engine
+
+    with get_engine().connect() as connection:
+        docs, before, after = backfill(connection, batch=args.batch)
+    print(f"Converted {docs} documents: {before} -> {after} bytes of version history")
+
+
+if __name__ == "__main__":
+    main()
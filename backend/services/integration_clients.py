@@ -7,8 +7,6 @@ import json
 from dataclasses import dataclass
 from typing import Any, Dict
 
-import httpx
-
 from backend.models import IntegrationType
 
 
@@ -77,6 +75,8 @@ class IntegrationClient:
             params = payload or None
             json_payload = None
 
+        import httpx  # deferred: only connector calls need the HTTP client
+
         try:
             with httpx.Client(base_url=self.base_url, timeout=self.timeout) as client:
                 response = client.request(
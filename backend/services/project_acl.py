@@ -0,0 +1,151 @@
+"""Per-user index of the projects a user may work in.
+
+A user may access a project when they are a member of its team or, for a
+project without a team, when they own it; admins and moderators may access
+every project. :func:`ProjectAcl.get` computes the set once with a single
+query and caches it per process, so authorization is a set lookup
+(:meth:`ProjectAccess.allows`) or an ``IN`` predicate
+(:meth:`ProjectAccess.clause`) instead of loading team members.
+
+Writes that change membership (``create_team``, ``add_team_member``,
+project team or owner changes) call :meth:`ProjectAcl.invalidate` from
+``on_commit``. Each entry records the generation it was computed under, so
+a set computed while an invalidation was in flight is recomputed instead of
+served. Other workers converge within ``PROJECT_ACL_TTL`` seconds, as with
+the identity cache.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Tuple
+
+from sqlalchemy import false, select, true, union
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+
+from backend.database import on_commit
+from backend.models import Project, TeamMember
+
+
+PROJECT_ACL_TTL = float(os.getenv("PROJECT_ACL_TTL", "60"))
+PROJECT_ACL_SIZE = int(os.getenv("PROJECT_ACL_SIZE", "10000"))
+
+STAFF_ROLES = frozenset({"admin", "moderator"})
+
+
+@dataclass(frozen=True)
+class ProjectAccess:
+    """The projects one user may access."""
+
+    project_ids: FrozenSet[int]
+    unrestricted: bool = False
+
+    def allows(self, project_id: int | None) -> bool:
+        return self.unrestricted or project_id in self.project_ids
+
+    def clause(self, column) -> ColumnElement:
+        """SQL predicate restricting ``column`` (a project id) to accessible projects."""
+
+        if self.unrestricted:
+            return true()
+        if not self.project_ids:
+            return false()
+        return column.in_(sorted(self.project_ids))
+
+
+UNRESTRICTED = ProjectAccess(frozenset(), unrestricted=True)
+
+
+def accessible_projects_statement(user_id: int):
+    """Ids of the projects ``user_id`` may access: team projects plus owned team-less ones."""
+
+    via_team = (
+        select(Project.id)
+        .join(TeamMember, TeamMember.team_id == Project.team_id)
+        .where(TeamMember.user_id == user_id)
+    )
+    owned = select(Project.id).where(Project.team_id.is_(None), Project.owner_id == user_id)
+    return union(via_team, owned)
+
+
+def accessible_projects(db: Session, user_id: int) -> FrozenSet[int]:
+    return frozenset(db.scalars(accessible_projects_statement(user_id)))
+
+
+class ProjectAcl:
+    """Bounded LRU of :class:`ProjectAccess` per user with versioned invalidation."""
+
+    def __init__(self, ttl: float = PROJECT_ACL_TTL, maxsize: int = PROJECT_ACL_SIZE) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, Tuple[float, Tuple[int, int], ProjectAccess]]" = OrderedDict()
+        self._generation = 0
+        self._user_generations: Dict[int, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _version(self, user_id: int) -> Tuple[int, int]:
+        return self._generation, self._user_generations.get(user_id, 0)
+
+    def get(self, db: Session, user) -> ProjectAccess:
+        """The projects ``user`` (a ``User`` or ``UserSnapshot``) may access."""
+
+        if user.role in STAFF_ROLES:
+            return UNRESTRICTED
+        now = time.monotonic()
+        with self._lock:
+            version = self._version(user.id)
+            entry = self._entries.get(user.id)
+            if entry is not None and entry[0] > now and entry[1] == version:
+                self._entries.move_to_end(user.id)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        access = ProjectAccess(accessible_projects(db, user.id))
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return access
+        with self._lock:
+            self._entries[user.id] = (now + self.ttl, version, access)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return access
+
+    def invalidate(self, user_ids: Iterable[int]) -> None:
+        """Recompute these users' projects on their next request."""
+
+        with self._lock:
+            for user_id in user_ids:
+                self._user_generations[user_id] += 1
+                self._entries.pop(user_id, None)
+
+    def invalidate_team(self, db: Session, *team_ids: int | None) -> None:
+        """Invalidate every current member of ``team_ids`` once ``db`` commits."""
+
+        team_ids = {team_id for team_id in team_ids if team_id}
+        if not team_ids:
+            return
+        members = set(db.scalars(select(TeamMember.user_id).where(TeamMember.team_id.in_(team_ids))))
+        on_commit(db, lambda: self.invalidate(members))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._user_generations.clear()
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+project_acl = ProjectAcl()
@@ -0,0 +1,271 @@
+"""Per-project task counters: totals by status and priority, hours and overdue tasks.
+
+Every task write passes its before/after :class:`TaskState` transitions to
+:func:`apply_transitions` inside its own transaction, next to
+:func:`~backend.services.task_history.record_transitions`. That adds the
+changes to one :class:`ProjectStats` row per (project, sprint) with an
+upsert, so project listings and boards read a few precomputed rows instead
+of counting tasks.
+
+Overdue depends on the date as well as on the tasks, so open tasks are
+also counted by due date in :class:`ProjectDueStats`; the overdue count is
+the sum of the days before today.
+
+Writes that bypass the task router (sprint deletion nulling
+``Task.sprint_id``, manual SQL) make the rollup drift. Rebuild it and see
+what drifted with::
+
+    python -m backend.services.project_stats reconcile [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from backend.models import ProjectDueStats, ProjectStats, Task, TaskPriority, TaskStatus
+from backend.services.task_history import TaskState, Transition, upsert_counters
+
+
+STATUS_COUNTERS = {
+    TaskStatus.todo: "tasks_todo",
+    TaskStatus.in_progress: "tasks_in_progress",
+    TaskStatus.review: "tasks_review",
+    TaskStatus.done: "tasks_done",
+}
+PRIORITY_COUNTERS = {
+    TaskPriority.low: "priority_low",
+    TaskPriority.medium: "priority_medium",
+    TaskPriority.high: "priority_high",
+    TaskPriority.critical: "priority_critical",
+}
+COUNTERS = ("tasks", *STATUS_COUNTERS.values(), *PRIORITY_COUNTERS.values(), "estimate_hours", "done_hours")
+
+Scope = Tuple[int, int]
+DueKey = Tuple[int, int, object]
+
+
+def _counters(state: TaskState) -> Dict[str, int]:
+    """What one task in ``state`` contributes to its scope's counters."""
+
+    counters = {
+        "tasks": 1,
+        "estimate_hours": state.estimate_hours,
+        "done_hours": state.estimate_hours if state.done else 0,
+    }
+    if state.status in STATUS_COUNTERS:
+        counters[STATUS_COUNTERS[state.status]] = 1
+    if state.priority in PRIORITY_COUNTERS:
+        counters[PRIORITY_COUNTERS[state.priority]] = 1
+    return counters
+
+
+def _add(
+    stats: Dict[Scope, Dict[str, int]], due: Dict[DueKey, int], state: Optional[TaskState], sign: int
+) -> None:
+    if state is None:
+        return
+    counters = stats[state.scope]
+    for name, value in _counters(state).items():
+        counters[name] += sign * value
+    if state.due_date and not state.done:
+        due[state.scope + (state.due_date,)] += sign
+
+
+def _new_totals() -> Tuple[Dict[Scope, Dict[str, int]], Dict[DueKey, int]]:
+    return defaultdict(lambda: dict.fromkeys(COUNTERS, 0)), defaultdict(int)
+
+
+def apply_transitions(db: Session, transitions: Iterable[Transition]) -> None:
+    """Add ``(task_id, before, after)`` changes to the rollup; ``None`` marks creation or deletion.
+
+    Runs in the caller's transaction, so the counters commit or roll back
+    together with the task rows.
+    """
+
+    stats, due = _new_totals()
+    for _, before, after in transitions:
+        if before != after:
+            _add(stats, due, before, -1)
+            _add(stats, due, after, 1)
+
+    rows = [
+        {"project_id": project_id, "sprint_id": sprint_id, **counters}
+        for (project_id, sprint_id), counters in stats.items()
+        if any(counters.values())
+    ]
+    if rows:
+        upsert_counters(db, ProjectStats.__table__, ("project_id", "sprint_id"), COUNTERS, rows)
+    due_rows = [
+        {"project_id": project_id, "sprint_id": sprint_id, "due_date": due_date, "open_tasks": change}
+        for (project_id, sprint_id, due_date), change in due.items()
+        if change
+    ]
+    if due_rows:
+        upsert_counters(
+            db, ProjectDueStats.__table__, ("project_id", "sprint_id", "due_date"), ("open_tasks",), due_rows
+        )
+
+
+def _summary(counters: Dict[str, int], overdue: int) -> dict:
+    return {
+        "tasks": counters["tasks"],
+        "by_status": {status.value: counters[name] for status, name in STATUS_COUNTERS.items()},
+        "by_priority": {priority.value: counters[name] for priority, name in PRIORITY_COUNTERS.items()},
+        "estimate_hours": counters["estimate_hours"],
+        "done_hours": counters["done_hours"],
+        "overdue": overdue,
+    }
+
+
+def summary_statements(
+    project_ids: Sequence[int], sprint_id: Optional[int], today: date
+) -> Tuple[Select, Select]:
+    """Counter sums per project, and open tasks due before ``today`` per project."""
+
+    stats, due = ProjectStats.__table__.c, ProjectDueStats.__table__.c
+    stats_scope = [stats.project_id.in_(project_ids)]
+    due_scope = [due.project_id.in_(project_ids)]
+    if sprint_id is not None:
+        stats_scope.append(stats.sprint_id == sprint_id)
+        due_scope.append(due.sprint_id == sprint_id)
+    counters = (
+        select(stats.project_id, *[func.sum(stats[name]) for name in COUNTERS])
+        .where(*stats_scope)
+        .group_by(stats.project_id)
+    )
+    overdue = (
+        select(due.project_id, func.sum(due.open_tasks))
+        .where(*due_scope, due.due_date < today)
+        .group_by(due.project_id)
+    )
+    return counters, overdue
+
+
+def project_summaries(db: Session, project_ids: Iterable[int], sprint_id: Optional[int] = None) -> Dict[int, dict]:
+    """``ProjectStatsOut``-shaped counters for each of ``project_ids``.
+
+    Sums the project's sprints (and its backlog, sprint ``0``) unless
+    ``sprint_id`` narrows it to one of them. Two grouped queries, however
+    many projects are asked for.
+    """
+
+    project_ids = sorted({project_id for project_id in project_ids if project_id})
+    if not project_ids:
+        return {}
+    today = datetime.utcnow().date()  # matches the UTC days of the burndown stats
+    counters_stmt, overdue_stmt = summary_statements(project_ids, sprint_id, today)
+
+    totals = {project_id: dict.fromkeys(COUNTERS, 0) for project_id in project_ids}
+    for project_id, *sums in db.execute(counters_stmt):
+        totals[project_id] = {name: value or 0 for name, value in zip(COUNTERS, sums)}
+    overdue = dict(db.execute(overdue_stmt).all())
+    return {project_id: _summary(counters, overdue.get(project_id) or 0) for project_id, counters in totals.items()}
+
+
+def _expected(connection: Connection) -> Tuple[Dict[Scope, Dict[str, int]], Dict[DueKey, int]]:
+    stats, due = _new_totals()
+    tasks = Task.__table__.c
+    rows = connection.execution_options(yield_per=5000).execute(
+        select(tasks.project_id, tasks.sprint_id, tasks.status, tasks.estimate_hours, tasks.priority, tasks.due_date)
+    )
+    for project_id, sprint_id, status, estimate, priority, due_date in rows:
+        _add(stats, due, TaskState(project_id, sprint_id, status, estimate or 0, priority, due_date), 1)
+    return stats, due
+
+
+def _stored(connection: Connection) -> Tuple[Dict[Scope, Dict[str, int]], Dict[DueKey, int]]:
+    stats, due = _new_totals()
+    table = ProjectStats.__table__.c
+    for project_id, sprint_id, *counters in connection.execute(
+        select(table.project_id, table.sprint_id, *[table[name] for name in COUNTERS])
+    ):
+        stats[(project_id, sprint_id)] = dict(zip(COUNTERS, counters))
+    table = ProjectDueStats.__table__.c
+    for project_id, sprint_id, due_date, open_tasks in connection.execute(
+        select(table.project_id, table.sprint_id, table.due_date, table.open_tasks)
+    ):
+        due[(project_id, sprint_id, due_date)] = open_tasks
+    return stats, due
+
+
+def _drift(scope: Scope, counter: str, stored: int, expected: int) -> dict:
+    return {"project_id": scope[0], "sprint_id": scope[1], "counter": counter, "stored": stored, "expected": expected}
+
+
+def reconcile(connection: Connection, fix: bool = True) -> List[dict]:
+    """Recount the rollup from the tasks table and report every counter that drifted.
+
+    With ``fix`` both tables are rebuilt from the recount in the caller's
+    transaction. On Postgres the rollup is locked first, so task writes
+    committing meanwhile wait and then apply their deltas on top.
+    """
+
+    if fix and connection.dialect.name == "postgresql":
+        connection.execute(text("LOCK TABLE project_stats, project_due_stats IN EXCLUSIVE MODE"))
+    expected_stats, expected_due = _expected(connection)
+    stored_stats, stored_due = _stored(connection)
+
+    drift = []
+    zeros = dict.fromkeys(COUNTERS, 0)
+    for scope in sorted(set(expected_stats) | set(stored_stats)):
+        expected, stored = expected_stats.get(scope, zeros), stored_stats.get(scope, zeros)
+        for name in COUNTERS:
+            if expected[name] != stored[name]:
+                drift.append(_drift(scope, name, stored[name], expected[name]))
+    for key in sorted(set(expected_due) | set(stored_due)):
+        expected, stored = expected_due.get(key, 0), stored_due.get(key, 0)
+        if expected != stored:
+            drift.append(_drift(key[:2], f"open_due:{key[2].isoformat()}", stored, expected))
+
+    if fix:
+        connection.execute(delete(ProjectStats.__table__))
+        connection.execute(delete(ProjectDueStats.__table__))
+        rows = [
+            {"project_id": project_id, "sprint_id": sprint_id, **counters}
+            for (project_id, sprint_id), counters in expected_stats.items()
+            if any(counters.values())
+        ]
+        if rows:
+            connection.execute(ProjectStats.__table__.insert(), rows)
+        due_rows = [
+            {"project_id": project_id, "sprint_id": sprint_id, "due_date": due_date, "open_tasks": open_tasks}
+            for (project_id, sprint_id, due_date), open_tasks in expected_due.items()
+            if open_tasks
+        ]
+        if due_rows:
+            connection.execute(ProjectDueStats.__table__.insert(), due_rows)
+    return drift
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild per-project task counters and report drift.")
+    parser.add_argument("command", choices=("reconcile",), nargs="?", default="reconcile")
+    parser.add_argument("--dry-run", action="store_true", help="report drift without rebuilding")
+    args = parser.parse_args()
+
+    from backend.database import get_engine
+
+    with get_engine().connect() as connection:
+        drift = reconcile(connection, fix=not args.dry_run)
+        connection.commit()
+    for item in drift:
+        print(
+            f"project {item['project_id']} sprint {item['sprint_id']} {item['counter']}: "
+            f"stored {item['stored']}, expected {item['expected']}"
+        )
+    action = "left as is" if args.dry_run else "rebuilt"
+    print(f"{len(drift)} counters drifted; rollup {action}")
+    if drift and args.dry_run:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
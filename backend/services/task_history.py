@@ -0,0 +1,236 @@
+"""Task status history and the daily stats behind burndown/burnup charts.
+
+Every write path that changes a task's status, estimate, project or sprint
+reports the before/after :class:`TaskState` to :func:`record_transitions`
+inside its own transaction. That appends :class:`TaskStatusEvent` rows and
+adds the day's scope/completion deltas to :class:`TaskDailyStats` with an
+upsert, so a chart for any sprint or date range is a running sum over a
+handful of precomputed rows instead of a scan of every task.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from backend.models import TaskDailyStats, TaskPriority, TaskStatus, TaskStatusEvent
+
+
+COUNTERS = ("tasks_added", "tasks_removed", "hours_added", "hours_removed", "tasks_done", "hours_done")
+
+
+@dataclass(frozen=True)
+class TaskState:
+    """The task fields that burndown charts and project stats depend on.
+
+    Only placement, status and estimate are part of the history;
+    ``priority`` and ``due_date`` feed :mod:`backend.services.project_stats`.
+    """
+
+    project_id: Optional[int]
+    sprint_id: Optional[int]
+    status: Optional[TaskStatus]
+    estimate_hours: int = 0
+    priority: Optional[TaskPriority] = None
+    due_date: Optional[date] = None
+
+    @classmethod
+    def of(cls, task) -> "TaskState":
+        return cls(
+            task.project_id,
+            task.sprint_id,
+            task.status,
+            task.estimate_hours or 0,
+            task.priority,
+            task.due_date,
+        )
+
+    def merged(self, changes: dict) -> "TaskState":
+        """State after applying a ``TaskUpdate``-style dict of changes."""
+
+        fields = {
+            name: changes[name]
+            for name in ("project_id", "sprint_id", "status", "priority", "due_date")
+            if name in changes
+        }
+        if "estimate_hours" in changes:
+            fields["estimate_hours"] = changes["estimate_hours"] or 0
+        return replace(self, **fields)
+
+    @property
+    def scope(self) -> Tuple[int, int]:
+        return self.project_id or 0, self.sprint_id or 0
+
+    @property
+    def done(self) -> bool:
+        return self.status == TaskStatus.done
+
+    @property
+    def tracked(self) -> Tuple[Optional[int], Optional[int], Optional[TaskStatus], int]:
+        """The fields whose changes are recorded as history."""
+
+        return self.project_id, self.sprint_id, self.status, self.estimate_hours
+
+
+Transition = Tuple[int, Optional[TaskState], Optional[TaskState]]
+
+
+def _deltas(transitions: Iterable[Transition]) -> Dict[Tuple[int, int], Dict[str, int]]:
+    deltas: Dict[Tuple[int, int], Dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    for _, before, after in transitions:
+        if before and after and before.scope == after.scope:
+            change = after.estimate_hours - before.estimate_hours
+            counters = deltas[after.scope]
+            counters["hours_added"] += max(change, 0)
+            counters["hours_removed"] += max(-change, 0)
+        else:
+            if before:
+                deltas[before.scope]["tasks_removed"] += 1
+                deltas[before.scope]["hours_removed"] += before.estimate_hours
+            if after:
+                deltas[after.scope]["tasks_added"] += 1
+                deltas[after.scope]["hours_added"] += after.estimate_hours
+        for state, sign in ((before, -1), (after, 1)):
+            if state and state.done:
+                deltas[state.scope]["tasks_done"] += sign
+                deltas[state.scope]["hours_done"] += sign * state.estimate_hours
+    return deltas
+
+
+def upsert_counters(db: Session, table, keys: Tuple[str, ...], counters: Tuple[str, ...], rows: List[dict]) -> None:
+    """Insert ``rows`` into ``table``, adding their ``counters`` to existing rows with the same ``keys``.
+
+    ``keys`` must be covered by a unique index. The addition happens in the
+    database, so concurrent writers never lose each other's deltas.
+    """
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:  # pragma: no cover - only Postgres and SQLite are deployed
+        raise RuntimeError(f"No upsert support for {dialect!r}")
+
+    stmt = dialect_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c[name] for name in keys],
+        set_={name: table.c[name] + stmt.excluded[name] for name in counters},
+    )
+    db.execute(stmt, rows)
+
+
+def record_transitions(db: Session, transitions: Iterable[Transition], actor_id: Optional[int]) -> None:
+    """Record ``(task_id, before, after)`` changes; ``None`` marks creation or deletion.
+
+    Runs in the caller's transaction, so history and stats commit or roll
+    back together with the task rows themselves.
+    """
+
+    changed = [
+        (task_id, before, after)
+        for task_id, before, after in transitions
+        if (before.tracked if before else None) != (after.tracked if after else None)
+    ]
+    if not changed:
+        return
+
+    now = datetime.utcnow()
+    db.execute(
+        insert(TaskStatusEvent),
+        [
+            {
+                "task_id": task_id,
+                "actor_id": actor_id,
+                "from_status": before.status if before else None,
+                "to_status": after.status if after else None,
+                "from_estimate": before.estimate_hours if before else None,
+                "to_estimate": after.estimate_hours if after else None,
+                "from_project_id": before.project_id if before else None,
+                "project_id": after.project_id if after else None,
+                "from_sprint_id": before.sprint_id if before else None,
+                "sprint_id": after.sprint_id if after else None,
+                "created_at": now,
+            }
+            for task_id, before, after in changed
+        ],
+    )
+    rows = [
+        {"project_id": project_id, "sprint_id": sprint_id, "day": now.date(), **counters}
+        for (project_id, sprint_id), counters in _deltas(changed).items()
+        if any(counters.values())
+    ]
+    if rows:
+        upsert_counters(db, TaskDailyStats.__table__, ("project_id", "sprint_id", "day"), COUNTERS, rows)
+
+
+def burndown_statements(
+    start: date,
+    end: date,
+    project_ids: Optional[Collection[int]] = None,
+    sprint_id: Optional[int] = None,
+) -> Tuple[Select, Select]:
+    """The counter totals before ``start`` and the per-day changes in ``start..end``."""
+
+    sums = [func.coalesce(func.sum(TaskDailyStats.__table__.c[name]), 0) for name in COUNTERS]
+    scope = []
+    if project_ids is not None:
+        scope.append(TaskDailyStats.project_id.in_(project_ids))
+    if sprint_id is not None:
+        scope.append(TaskDailyStats.sprint_id == sprint_id)
+    opening = select(*sums).where(*scope, TaskDailyStats.day < start)
+    days = (
+        select(TaskDailyStats.day, *sums)
+        .where(*scope, TaskDailyStats.day.between(start, end))
+        .group_by(TaskDailyStats.day)
+    )
+    return opening, days
+
+
+def burndown(
+    db: Session,
+    start: date,
+    end: date,
+    project_ids: Optional[Collection[int]] = None,
+    sprint_id: Optional[int] = None,
+) -> List[dict]:
+    """Daily scope, completed and remaining work (tasks and hours) for ``start..end``.
+
+    One aggregate over the rows before ``start`` gives the opening totals and
+    one grouped query returns the days in range; days without changes carry
+    the previous values forward.
+    """
+
+    opening_stmt, days_stmt = burndown_statements(start, end, project_ids, sprint_id)
+    totals = dict(zip(COUNTERS, db.execute(opening_stmt).one()))
+    by_day = {row[0]: dict(zip(COUNTERS, row[1:])) for row in db.execute(days_stmt)}
+
+    chart = []
+    day = start
+    while day <= end:
+        changes = by_day.get(day, dict.fromkeys(COUNTERS, 0))
+        for name in COUNTERS:
+            totals[name] += changes[name]
+        scope_tasks = totals["tasks_added"] - totals["tasks_removed"]
+        scope_hours = totals["hours_added"] - totals["hours_removed"]
+        chart.append(
+            {
+                "date": day.isoformat(),
+                "scope": scope_tasks,
+                "done": totals["tasks_done"],
+                "remaining": scope_tasks - totals["tasks_done"],
+                "added": changes["tasks_added"],
+                "removed": changes["tasks_removed"],
+                "scope_hours": scope_hours,
+                "done_hours": totals["hours_done"],
+                "remaining_hours": scope_hours - totals["hours_done"],
+            }
+        )
+        day += timedelta(days=1)
+    return chart
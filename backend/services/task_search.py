@@ -0,0 +1,285 @@
+"""Full-text index over tasks and their comments.
+
+Each task has one ``task_search`` row built from its title, tags,
+description and comment messages:
+
+* On PostgreSQL the row holds a weighted ``tsvector`` (title A, tags B,
+  description C, comments D) built with every configuration listed in
+  ``TASK_SEARCH_CONFIGS`` and indexed with GIN. The default covers English
+  and Russian stemming plus ``simple`` for exact Ukrainian word forms; add
+  ``ukrainian`` once a Ukrainian dictionary is installed on the server.
+* On SQLite it is an FTS5 virtual table keyed by the task id and ranked
+  with ``bm25``.
+
+Write paths call :func:`index_tasks` with the ids they touched, inside
+their own transaction. Backfill or rebuild the whole index with::
+
+    python -m backend.services.task_search reindex
+"""
+
+from __future__ import annotations
+
+import argparse
+import html
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+from sqlalchemy import bindparam, column, func, literal_column, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from backend.models import Task
+
+
+TASK_SEARCH_CONFIGS = [
+    name.strip() for name in os.getenv("TASK_SEARCH_CONFIGS", "english,russian,simple").split(",") if name.strip()
+]
+# ts_headline takes one configuration; "russian" stems Cyrillic and Latin words.
+TASK_SEARCH_HEADLINE_CONFIG = os.getenv("TASK_SEARCH_HEADLINE_CONFIG", "russian")
+TASK_SEARCH_TABLE = "task_search"
+# Task columns copied into the index; updates touching none of them skip reindexing.
+INDEXED_FIELDS = frozenset({"title", "description", "tags"})
+
+_CONFIG_NAME = re.compile(r"^[a-z_]+$")
+_WORD = re.compile(r"\w+", re.UNICODE)
+# Matches are delimited with control characters, not tags, so the stored
+# text can be HTML-escaped before <mark> is put back (see highlight_html).
+_MARK_START, _MARK_STOP = "\x02", "\x03"
+_MARK = f'StartSel="{_MARK_START}", StopSel="{_MARK_STOP}"'
+
+for _name in TASK_SEARCH_CONFIGS + [TASK_SEARCH_HEADLINE_CONFIG]:
+    if not _CONFIG_NAME.match(_name):
+        raise RuntimeError(f"Invalid text search configuration name {_name!r}")
+
+
+def _is_postgres(connection: Connection) -> bool:
+    return connection.dialect.name == "postgresql"
+
+
+# ---------------------------------------------------------------------------
+# Schema
+# ---------------------------------------------------------------------------
+
+
+def create_search_index(connection: Connection) -> None:
+    """Create the search table for the connected backend if it is missing."""
+
+    if _is_postgres(connection):
+        connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {TASK_SEARCH_TABLE} ("
+                " task_id INTEGER PRIMARY KEY REFERENCES tasks(id) ON DELETE CASCADE,"
+                " content TEXT NOT NULL DEFAULT '',"
+                " document TSVECTOR NOT NULL)"
+            )
+        )
+        connection.execute(
+            text(
+                f"CREATE INDEX IF NOT EXISTS ix_{TASK_SEARCH_TABLE}_document"
+                f" ON {TASK_SEARCH_TABLE} USING GIN (document)"
+            )
+        )
+    else:
+        connection.execute(
+            text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {TASK_SEARCH_TABLE} USING fts5("
+                "title, tags, description, comments, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        )
+
+
+# ---------------------------------------------------------------------------
+# Indexing
+# ---------------------------------------------------------------------------
+
+
+def _weighted_document() -> str:
+    fields = (
+        ("t.title", "A"),
+        ("t.tags", "B"),
+        ("t.description", "C"),
+        ("c.comments", "D"),
+    )
+    parts = [
+        f"setweight(to_tsvector('{config}', coalesce({field}, '')), '{weight}')"
+        for field, weight in fields
+        for config in TASK_SEARCH_CONFIGS
+    ]
+    return " || ".join(parts)
+
+
+def _postgres_index(connection: Connection, task_ids: List[int]) -> None:
+    connection.execute(
+        text(f"DELETE FROM {TASK_SEARCH_TABLE} WHERE task_id = ANY(:ids)"), {"ids": task_ids}
+    )
+    connection.execute(
+        text(
+            f"INSERT INTO {TASK_SEARCH_TABLE} (task_id, content, document)"
+            " SELECT t.id, concat_ws(' ', t.tags, t.description, c.comments), "
+            + _weighted_document()
+            + " FROM tasks t LEFT JOIN ("
+            "   SELECT task_id, string_agg(message, ' ' ORDER BY id) AS comments"
+            "   FROM task_comments WHERE task_id = ANY(:ids) GROUP BY task_id"
+            " ) c ON c.task_id = t.id"
+            " WHERE t.id = ANY(:ids)"
+        ),
+        {"ids": task_ids},
+    )
+
+
+def _sqlite_index(connection: Connection, task_ids: List[int]) -> None:
+    ids = bindparam("ids", expanding=True)
+    connection.execute(
+        text(f"DELETE FROM {TASK_SEARCH_TABLE} WHERE rowid IN :ids").bindparams(ids), {"ids": task_ids}
+    )
+    connection.execute(
+        text(
+            f"INSERT INTO {TASK_SEARCH_TABLE} (rowid, title, tags, description, comments)"
+            " SELECT t.id, coalesce(t.title, ''), coalesce(t.tags, ''), coalesce(t.description, ''),"
+            "  coalesce((SELECT group_concat(message, ' ') FROM task_comments WHERE task_id = t.id), '')"
+            " FROM tasks t WHERE t.id IN :ids"
+        ).bindparams(ids),
+        {"ids": task_ids},
+    )
+
+
+def index_tasks(db: Session | Connection, task_ids: Iterable[int]) -> None:
+    """Rebuild the search rows of ``task_ids``; ids of deleted tasks are dropped."""
+
+    task_ids = sorted({task_id for task_id in task_ids if task_id is not None})
+    if not task_ids:
+        return
+    connection = db.connection() if isinstance(db, Session) else db
+    if _is_postgres(connection):
+        _postgres_index(connection, task_ids)
+    else:
+        _sqlite_index(connection, task_ids)
+
+
+def reindex_all(connection: Connection, batch: int = 1000, commit: bool = True) -> int:
+    """Rebuild the index for every task in batches of ``batch`` ids.
+
+    With ``commit`` each batch is committed on its own, so a backfill of a
+    large table neither holds one long transaction nor starts over on failure.
+    """
+
+    create_search_index(connection)
+    indexed, last_id = 0, 0
+    while True:
+        ids = connection.execute(
+            select(Task.id).where(Task.id > last_id).order_by(Task.id).limit(batch)
+        ).scalars().all()
+        if not ids:
+            break
+        index_tasks(connection, ids)
+        if commit:
+            connection.commit()
+        indexed += len(ids)
+        last_id = ids[-1]
+    # Drop rows of tasks deleted without going through index_tasks.
+    if _is_postgres(connection):
+        connection.execute(
+            text(f"DELETE FROM {TASK_SEARCH_TABLE} s WHERE NOT EXISTS (SELECT 1 FROM tasks t WHERE t.id = s.task_id)")
+        )
+    else:
+        connection.execute(text(f"DELETE FROM {TASK_SEARCH_TABLE} WHERE rowid NOT IN (SELECT id FROM tasks)"))
+    if commit:
+        connection.commit()
+    return indexed
+
+
+# ---------------------------------------------------------------------------
+# Querying
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class SearchColumns:
+    """Extra columns :func:`search_statement` adds next to ``Task``."""
+
+    rank: object
+    title: object
+    snippet: object
+
+
+def _fts5_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match, as a prefix."""
+
+    words = _WORD.findall(query)
+    return " ".join(f'"{word}"*' for word in words) if words else None
+
+
+def search_statement(connection: Connection, query: str, stmt: Select) -> Optional[Select]:
+    """Restrict ``stmt`` (a ``select(Task)``) to matches of ``query``, best first.
+
+    Adds ``rank``, ``title_highlight`` and ``snippet`` columns with matched
+    terms between control-character sentinels; pass them through
+    :func:`highlight_html` before serving. Returns ``None`` when the query
+    has no words.
+    """
+
+    if _is_postgres(connection):
+        if not _WORD.search(query):
+            return None
+        index = table(TASK_SEARCH_TABLE, column("task_id"), column("content"), column("document"))
+        tsquery = None
+        for config in TASK_SEARCH_CONFIGS:
+            part = func.websearch_to_tsquery(literal_column(f"'{config}'::regconfig"), query)
+            tsquery = part if tsquery is None else tsquery.op("||")(part)
+        headline = literal_column(f"'{TASK_SEARCH_HEADLINE_CONFIG}'::regconfig")
+        columns = SearchColumns(
+            rank=func.ts_rank_cd(index.c.document, tsquery),
+            title=func.ts_headline(headline, Task.title, tsquery, f"{_MARK}, HighlightAll=true"),
+            snippet=func.ts_headline(
+                headline, index.c.content, tsquery, f"{_MARK}, MaxFragments=2, MaxWords=20, MinWords=5"
+            ),
+        )
+        stmt = stmt.join(index, index.c.task_id == Task.id).where(index.c.document.op("@@")(tsquery))
+        order = columns.rank.desc()
+    else:
+        match = _fts5_query(query)
+        if match is None:
+            return None
+        index = table(TASK_SEARCH_TABLE, column("rowid"))
+        name = literal_column(TASK_SEARCH_TABLE)
+        columns = SearchColumns(
+            # bm25 is lower-is-better; negate it so both backends rank descending.
+            rank=-func.bm25(name, 10.0, 5.0, 2.0, 1.0),
+            title=func.highlight(name, 0, _MARK_START, _MARK_STOP),
+            snippet=func.snippet(name, -1, _MARK_START, _MARK_STOP, "…", 16),
+        )
+        stmt = stmt.join(index, index.c.rowid == Task.id).where(name.op("MATCH")(match))
+        order = columns.rank.desc()
+
+    return stmt.add_columns(
+        columns.rank.label("rank"),
+        columns.title.label("title_highlight"),
+        columns.snippet.label("snippet"),
+    ).order_by(order, Task.id.desc())
+
+
+def highlight_html(value: Optional[str]) -> str:
+    """Escape a highlighted column and wrap its matches in ``<mark>``."""
+
+    escaped = html.escape(value or "", quote=False)
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_STOP, "</mark>")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain the task full-text index.")
+    parser.add_argument("command", choices=("reindex",), nargs="?", default="reindex")
+    parser.add_argument("--batch", type=int, default=1000, help="tasks per transaction")
+    args = parser.parse_args()
+
+    from backend.database import get_engine
+
+    with get_engine().connect() as connection:
+        indexed = reindex_all(connection, batch=args.batch)
+    print(f"Indexed {indexed} tasks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Per-request SQL statistics collected from SQLAlchemy engine events.
+
+Every statement executed by any engine (primary, replica or the sync side of
+an async engine) is attributed to the request that issued it through a
+context variable. The HTTP middleware in ``main`` reads the totals to emit
+debug headers, log slow requests with their SQL and flag suspected N+1
+patterns. Tests can lock query budgets in with :func:`assert_max_queries`.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+SLOW_REQUEST_MS = float(os.getenv("SQL_SLOW_REQUEST_MS", "500"))
+QUERY_WARN_COUNT = int(os.getenv("SQL_QUERY_WARN_COUNT", "50"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    """Statements executed within one request (or one test block)."""
+
+    count: int = 0
+    seconds: float = 0.0
+    statements: List[Tuple[str, float]] = field(default_factory=list)
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.statements.append((statement, seconds))
+
+    @property
+    def milliseconds(self) -> float:
+        return self.seconds * 1000
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int]]:
+        """Identical statements run at least ``threshold`` times — likely N+1 loads."""
+
+        counts = Counter(statement for statement, _ in self.statements)
+        return [(statement, count) for statement, count in counts.most_common() if count >= threshold]
+
+    def slowest(self, limit: int = 5) -> List[Tuple[str, float]]:
+        return sorted(self.statements, key=lambda item: item[1], reverse=True)[:limit]
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("sql_query_stats", default=None)
+_captures: List[QueryStats] = []
+_captures_lock = threading.Lock()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_started"].pop()
+    elapsed = time.perf_counter() - started
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    if _captures:
+        with _captures_lock:
+            for capture in _captures:
+                capture.record(statement, elapsed)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context) -> None:
+    # after_cursor_execute never fires for a failed statement.
+    if exception_context.cursor is not None and exception_context.connection is not None:
+        started = exception_context.connection.info.get("query_started")
+        if started:
+            started.pop()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Attribute statements run in this context (and tasks/threads it spawns) to one stats object."""
+
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def report(method: str, path: str, stats: QueryStats) -> None:
+    """Log slow or query-heavy requests together with the SQL responsible."""
+
+    suspects = stats.repeated()
+    for statement, count in suspects:
+        logger.warning("Suspected N+1 in %s %s: %d× %s", method, path, count, statement)
+    if stats.milliseconds < SLOW_REQUEST_MS and stats.count < QUERY_WARN_COUNT:
+        return
+    lines = "\n".join(f"  {seconds * 1000:8.1f}ms  {statement}" for statement, seconds in stats.slowest())
+    logger.warning(
+        "%s %s ran %d queries in %.1fms; slowest:\n%s",
+        method,
+        path,
+        stats.count,
+        stats.milliseconds,
+        lines,
+    )
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail when the block runs more than ``limit`` statements on any engine.
+
+    Captures process-wide, so it also sees queries issued by ``TestClient``
+    from its own event-loop thread::
+
+        with assert_max_queries(3):
+            client.get("/api/v1/tasks/")
+    """
+
+    stats = QueryStats()
+    with _captures_lock:
+        _captures.append(stats)
+    try:
+        yield stats
+    finally:
+        with _captures_lock:
+            _captures.remove(stats)
+    if stats.count > limit:
+        listing = "\n".join(f"  {statement}" for statement, _ in stats.statements)
+        raise AssertionError(f"Expected at most {limit} queries, {stats.count} were run:\n{listing}")
@@ -156,12 +156,26 @@ export async function getKanban(projectId) {
   return request('/tasks/board/view', { params: { project_id: projectId } })
 }
 
+// Live board changes over server-sent events. EventSource cannot send headers,
+// so the token goes in the query string; reconnects resume via Last-Event-ID.
+export function subscribeBoard(projectId, onChange) {
+  const url = new URL(`${API_URL}/tasks/board/events`, window.location.origin)
+  url.searchParams.set('project_id', projectId)
+  const token = localStorage.getItem('token')
+  if (token) url.searchParams.set('access_token', token)
+  const source = new EventSource(url.toString())
+  const handle = (event) => onChange(event.type, JSON.parse(event.data))
+  source.addEventListener('board', handle)
+  source.addEventListener('reset', handle)
+  return () => source.close()
+}
+
 export async function getBurndown(filters) {
   return request('/tasks/reports/burndown', { method: 'POST', data: filters })
 }
 
-export async function listDocs() {
-  return request('/docs/')
+export async function listDocs(params) {
+  return request('/docs/', { params })
 }
 
 export async function getDoc(docId) {
@@ -184,6 +198,10 @@ export async function listDocVersions(docId) {
   return request(`/docs/${docId}/versions`)
 }
 
+export async function diffDocVersions(docId, fromVersion, toVersion, params) {
+  return request(`/docs/${docId}/versions/${fromVersion}/diff/${toVersion}`, { params })
+}
+
 export async function listTickets(filters = {}) {
   return request('/support/', { params: filters })
 }
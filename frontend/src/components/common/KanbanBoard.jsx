@@ -1,23 +1,25 @@
 import React from 'react'
 
+// Keys match TaskStatus values returned by /tasks/board/view.
 const columns = [
-  { key: 'backlog', label: 'Backlog' },
-  { key: 'todo', label: 'To Do' },
-  { key: 'in_progress', label: 'В работе' },
-  { key: 'done', label: 'Готово' },
+  { key: 'ToDo', label: 'To Do' },
+  { key: 'In Progress', label: 'В работе' },
+  { key: 'Review', label: 'Ревью' },
+  { key: 'Done', label: 'Готово' },
 ]
 
 export default function KanbanBoard({ lanes = {}, onSelect }) {
   return (
     <div className="grid four" style={{ gap: 16, alignItems: 'flex-start' }}>
       {columns.map((column) => {
-        const tasks = lanes[column.key] || []
+        const lane = lanes[column.key] || {}
+        const tasks = lane.tasks || []
         return (
           <div key={column.key} className="panel" style={{ minHeight: 280 }}>
             <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
               <strong>{column.label}</strong>
               <span className="chip" style={{ background: 'rgba(255,255,255,0.1)', color: 'var(--accent-strong)' }}>
-                {tasks.length}
+                {lane.total ?? tasks.length}
               </span>
             </div>
             <div style={{ marginTop: 16, display: 'grid', gap: 12 }}>
@@ -6,6 +6,7 @@ import {
   listProjects,
   listSprints,
   listTasks,
+  subscribeBoard,
 } from '../../api'
 import KanbanBoard from '../../components/common/KanbanBoard'
 import Loader from '../../components/common/Loader'
@@ -90,6 +91,14 @@ export default function TasksPage() {
     updateBoard()
   }, [projectId, filters.sprint_id])
 
+  useEffect(() => {
+    if (!projectId) return undefined
+    // The board is revalidated with its ETag, so a reload per change is cheap.
+    return subscribeBoard(projectId, () => {
+      getKanban(projectId).then(setKanban).catch(setError)
+    })
+  }, [projectId])
+
   async function handleCreateTask(event) {
     event.preventDefault()
     try {
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Compare sync and async API stacks under many concurrent clients.
+
+Start the backend twice, once per stack, then point the benchmark at both:
+
+    UA_FLOW_ASYNC_ROUTERS= uvicorn backend.main:app --port 8000
+    UA_FLOW_ASYNC_ROUTERS=all uvicorn backend.main:app --port 8001
+    python scripts/bench_async_stack.py --clients 256 --duration 30 \
+        --target sync=http://localhost:8000/api/v1 \
+        --target async=http://localhost:8001/api/v1
+
+Each client loops over the read paths of the migrated routers with its own
+token-authenticated requests; targets are measured one after the other.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections import Counter
+
+import httpx
+
+from bench_login_storm import ensure_user, percentile
+
+
+DEFAULT_PATHS = ("/tasks/", "/support/", "/analytics/workload", "/auth/me")
+
+
+async def client_worker(
+    client: httpx.AsyncClient,
+    paths: list[str],
+    headers: dict[str, str],
+    deadline: float,
+    latencies: list[float],
+    statuses: Counter,
+    offset: int,
+) -> None:
+    index = offset
+    while time.perf_counter() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            response = await client.get(path, headers=headers)
+            statuses[response.status_code] += 1
+        except httpx.HTTPError as exc:
+            statuses[type(exc).__name__] += 1
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def bench_target(label: str, base_url: str, args: argparse.Namespace) -> None:
+    limits = httpx.Limits(max_connections=args.clients + 4, max_keepalive_connections=args.clients + 4)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+        token = await ensure_user(client, email, "bench-password")
+        headers = {"Authorization": f"Bearer {token}"}
+        for path in args.paths:
+            (await client.get(path, headers=headers)).raise_for_status()
+
+        latencies: list[float] = []
+        statuses: Counter = Counter()
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(
+                client_worker(client, args.paths, headers, deadline, latencies, statuses, offset)
+                for offset in range(args.clients)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+    ok = statuses.get(200, 0)
+    print(f"[{label}] {base_url}")
+    print(f"  clients:      {args.clients} for {elapsed:.1f}s")
+    print(f"  requests/sec: {ok / elapsed:.1f} ok, {sum(statuses.values()) / elapsed:.1f} attempted")
+    print(f"  statuses:     {dict(sorted(statuses.items(), key=str))}")
+    if latencies:
+        print(
+            f"  latency:      p50 {statistics.median(latencies):.1f}ms  "
+            f"p95 {percentile(latencies, 95):.1f}ms  p99 {percentile(latencies, 99):.1f}ms  "
+            f"max {max(latencies):.1f}ms"
+        )
+
+
+async def run(args: argparse.Namespace) -> None:
+    for target in args.target:
+        label, sep, base_url = target.partition("=")
+        if not sep or "://" in label:
+            label, base_url = target, target
+        await bench_target(label, base_url, args)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--target",
+        action="append",
+        default=None,
+        help="label=base-url of a running backend; repeat to compare stacks",
+    )
+    parser.add_argument("--clients", type=int, default=200, help="concurrent client loops")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per target")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--path", dest="paths", action="append", default=None, help="GET path to cycle through")
+    args = parser.parse_args()
+    args.target = args.target or ["http://localhost:8000/api/v1"]
+    args.paths = args.paths or list(DEFAULT_PATHS)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
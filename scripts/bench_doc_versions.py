@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Document version storage benchmark: delta chains against full copies.
+
+Builds a wiki page with ``--versions`` edits in an in-memory SQLite
+database, stored through :mod:`backend.services.doc_versions`, then reports
+the bytes stored against one full copy per version, the cost of writing a
+version and the latency of rebuilding versions (verified byte for byte).
+
+    python scripts/bench_doc_versions.py --versions 1000 --lines 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from backend.database import Base  # noqa: E402
+from backend.models import Doc, DocVersion  # noqa: E402
+from backend.services import doc_versions  # noqa: E402
+
+
+WORDS = "проєкт задача спринт реліз документ вимога інтеграція звіт команда план review deploy api".split()
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 16))).capitalize() + ".\n"
+
+
+def edit(lines: list[str], rng: random.Random) -> list[str]:
+    """A typical save: reword a few lines, sometimes add or drop a paragraph."""
+
+    lines = list(lines)
+    for _ in range(rng.randint(1, 3)):
+        lines[rng.randrange(len(lines))] = sentence(rng)
+    roll = rng.random()
+    if roll < 0.15:
+        at = rng.randrange(len(lines))
+        lines[at:at] = ["\n", f"## {sentence(rng)}"] + [sentence(rng) for _ in range(rng.randint(1, 5))]
+    elif roll < 0.25 and len(lines) > 20:
+        at = rng.randrange(len(lines) - 5)
+        del lines[at:at + rng.randint(1, 5)]
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--versions", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=400, help="lines in the first version")
+    parser.add_argument("--snapshot-every", type=int, default=doc_versions.DOC_SNAPSHOT_EVERY)
+    parser.add_argument("--reads", type=int, default=1000, help="random versions to rebuild")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    doc_versions.DOC_SNAPSHOT_EVERY = max(1, args.snapshot_every)
+    rng = random.Random(args.seed)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    texts: list[str] = []
+    lines = [sentence(rng) for _ in range(args.lines)]
+    write_ms: list[float] = []
+    with Session(engine) as db:
+        doc = Doc(title="Benchmark", content_md="")
+        db.add(doc)
+        db.flush()
+        previous = None
+        for version in range(1, args.versions + 1):
+            if version > 1:
+                lines = edit(lines, rng)
+            text = "".join(lines)
+            started = time.perf_counter()
+            db.add(doc_versions.new_version(doc.id, version, text, previous, None))
+            write_ms.append((time.perf_counter() - started) * 1000)
+            texts.append(text)
+            previous = text
+        db.commit()
+        doc_id = doc.id
+
+        stored = sum(
+            len((delta if delta is not None else content).encode("utf-8"))
+            for content, delta in db.execute(select(DocVersion.content_md, DocVersion.delta))
+        )
+
+    full = sum(len(text.encode("utf-8")) for text in texts)
+    read_ms: list[float] = []
+    with Session(engine) as db:
+        for version in [rng.randint(1, args.versions) for _ in range(args.reads)]:
+            db.expunge_all()
+            started = time.perf_counter()
+            found = doc_versions.version_content(db, doc_id, version)
+            read_ms.append((time.perf_counter() - started) * 1000)
+            if found is None or found[1] != texts[version - 1]:
+                raise SystemExit(f"version {version} was not rebuilt exactly")
+
+    print(f"versions:           {args.versions} (snapshot every {doc_versions.DOC_SNAPSHOT_EVERY})")
+    print(f"latest version:     {len(texts[-1].encode('utf-8')) / 1024:.1f} KiB")
+    print(f"full copies:        {full / 1024 / 1024:.2f} MiB")
+    print(f"deltas + snapshots: {stored / 1024 / 1024:.2f} MiB ({100 * (1 - stored / full):.1f}% saved)")
+    print(f"write (delta):      p50 {percentile(write_ms, 50):.2f} ms  p95 {percentile(write_ms, 95):.2f} ms")
+    print(
+        f"rebuild:            p50 {percentile(read_ms, 50):.2f} ms  p95 {percentile(read_ms, 95):.2f} ms"
+        f"  max {max(read_ms):.2f} ms  mean {statistics.mean(read_ms):.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Login storm benchmark for a running UA FLOW backend.
+
+Fires concurrent logins at ``/auth/login`` while probing an unrelated
+endpoint, then reports logins/sec and the probe's latency percentiles.
+
+    python scripts/bench_login_storm.py --base-url http://localhost:8000/api/v1 \
+        --concurrency 64 --duration 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections import Counter
+
+import httpx
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def ensure_user(client: httpx.AsyncClient, email: str, password: str) -> str:
+    await client.post("/auth/register", json={"email": email, "password": password})
+    response = await client.post("/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def login_worker(
+    client: httpx.AsyncClient,
+    email: str,
+    password: str,
+    deadline: float,
+    statuses: Counter,
+) -> None:
+    while time.perf_counter() < deadline:
+        response = await client.post("/auth/login", json={"email": email, "password": password})
+        statuses[response.status_code] += 1
+
+
+async def probe_worker(
+    client: httpx.AsyncClient,
+    path: str,
+    token: str,
+    deadline: float,
+    latencies: list[float],
+    interval: float,
+) -> None:
+    headers = {"Authorization": f"Bearer {token}"}
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await client.get(path, headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+
+
+async def run(args: argparse.Namespace) -> None:
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    password = "bench-password"
+    limits = httpx.Limits(max_connections=args.concurrency + args.probes + 4)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        token = await ensure_user(client, email, password)
+
+        baseline: list[float] = []
+        await probe_worker(client, args.probe_path, token, time.perf_counter() + 3, baseline, 0.05)
+
+        statuses: Counter = Counter()
+        latencies: list[float] = []
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(login_worker(client, email, password, deadline, statuses) for _ in range(args.concurrency)),
+            *(
+                probe_worker(client, args.probe_path, token, deadline, latencies, args.probe_interval)
+                for _ in range(args.probes)
+            ),
+        )
+        elapsed = time.perf_counter() - started
+
+    successful = statuses.get(200, 0)
+    print(f"duration:         {elapsed:.1f}s, login concurrency {args.concurrency}")
+    print(f"logins/sec:       {successful / elapsed:.1f} ok, {sum(statuses.values()) / elapsed:.1f} attempted")
+    print(f"login statuses:   {dict(sorted(statuses.items()))}")
+    for label, samples in (("probe baseline", baseline), ("probe in storm", latencies)):
+        if samples:
+            print(
+                f"{label + ':':<17} p50 {statistics.median(samples):.1f}ms  "
+                f"p99 {percentile(samples, 99):.1f}ms  ({len(samples)} requests)"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--concurrency", type=int, default=64, help="parallel login loops")
+    parser.add_argument("--duration", type=float, default=20.0, help="storm length in seconds")
+    parser.add_argument("--probe-path", default="/auth/me", help="unrelated sync endpoint to time")
+    parser.add_argument("--probes", type=int, default=4, help="parallel probe loops")
+    parser.add_argument("--probe-interval", type=float, default=0.05)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
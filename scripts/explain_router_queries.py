@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""EXPLAIN every router query and fail when one needs a sequential scan.
+
+The statements are built by the same functions the routers execute
+(``task_filters``/``task_page``, the ``*_statement`` builders of each
+router, ``ProjectAccess.clause`` and the service helpers), called with
+sample arguments, so a router change is checked as soon as it lands.
+Primary-key lookups (``Session.get``) are not listed.
+
+Run it against a migrated database (Postgres or SQLite):
+
+    DATABASE_URL=postgresql+psycopg2://... python scripts/explain_router_queries.py
+
+On Postgres ``enable_seqscan`` is switched off for the check, so a
+``Seq Scan`` in the plan means no index can serve the query at all rather
+than the planner preferring a scan of a small table. On SQLite any ``SCAN``
+step that does not go through an index is reported. Queries that must read
+a whole table (catalogues, global counters) are listed with ``full_scan=True``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import func, select, text  # noqa: E402
+from sqlalchemy.engine import Connection  # noqa: E402
+from sqlalchemy.orm import with_parent  # noqa: E402
+from sqlalchemy.sql import Select  # noqa: E402
+
+from backend.http_cache import collection_version_statement  # noqa: E402
+from backend.models import Project, SupportTicket, Task, TaskStatus, TicketStatus, User  # noqa: E402
+from backend.pagination import encode_cursor  # noqa: E402
+from backend.routers import admin, analytics, auth, docs, integration, projects, support, tasks  # noqa: E402
+from backend.services.audit_archive import HOT_TABLE, AuditQuery  # noqa: E402
+from backend.services.doc_versions import chain_statement, snapshot_before  # noqa: E402
+from backend.services.project_acl import ProjectAccess, accessible_projects_statement  # noqa: E402
+from backend.services.project_stats import summary_statements  # noqa: E402
+from backend.services.task_history import burndown_statements  # noqa: E402
+from backend.services.task_search import search_statement  # noqa: E402
+
+
+# Sample arguments; the plans depend on the shape of the query, not the values.
+ID = 1
+MEMBER = User(id=ID, role="user")
+STAFF = User(id=ID + 1, role="admin")
+ACCESS = ProjectAccess(frozenset({ID, ID + 1}))
+DAY = date(2024, 1, 1)
+WHEN = datetime(2024, 1, 1)
+
+
+@dataclass(frozen=True)
+class RouterQuery:
+    name: str
+    build: Callable[[Connection], Select]
+    full_scan: bool = False
+
+
+def _tasks(user, project_id=None, sprint_id=None, status=None, cursor=None) -> Select:
+    """``GET /tasks/``: the router's filters and keyset page."""
+
+    stmt = tasks.task_filters(select(Task), user, project_id, sprint_id, status)
+    return tasks.task_page(stmt, "created_at", "desc", cursor, tasks.TASK_PAGE_DEFAULT)[0]
+
+
+def _task_cursor() -> str:
+    return encode_cursor(*tasks.task_cursor_key("created_at", "desc")(Task(id=ID, created_at=WHEN)))
+
+
+QUERIES: List[RouterQuery] = [
+    # tasks
+    RouterQuery("tasks.list_tasks (member)", lambda _: _tasks(MEMBER)),
+    RouterQuery("tasks.list_tasks (member, next page)", lambda _: _tasks(MEMBER, cursor=_task_cursor())),
+    RouterQuery("tasks.list_tasks (member, status)", lambda _: _tasks(MEMBER, status=TaskStatus.todo)),
+    RouterQuery("tasks.list_tasks (project)", lambda _: _tasks(MEMBER, project_id=ID)),
+    RouterQuery("tasks.list_tasks (sprint, status)", lambda _: _tasks(MEMBER, sprint_id=ID, status=TaskStatus.todo)),
+    RouterQuery("tasks.list_tasks (staff, status)", lambda _: _tasks(STAFF, status=TaskStatus.todo)),
+    RouterQuery("tasks.list_tasks (staff)", lambda _: _tasks(STAFF)),
+    RouterQuery(
+        "tasks.list_tasks (etag)",
+        lambda _: collection_version_statement(
+            tasks.task_filters(select(Task), MEMBER, None, None, None), Task.updated_at
+        ),
+    ),
+    RouterQuery(
+        "tasks.search_tasks",
+        lambda connection: search_statement(
+            connection, "login", tasks.task_filters(select(Task), MEMBER, None, None, None)
+        ),
+    ),
+    RouterQuery("tasks.kanban_board", lambda _: tasks.board_statement(ID, tasks.BOARD_LANE_DEFAULT)),
+    RouterQuery(
+        "tasks.kanban_lane",
+        lambda _: tasks.task_page(
+            tasks.lane_statement(ID, TaskStatus.done), *tasks.BOARD_ORDER, None, tasks.BOARD_LANE_DEFAULT
+        )[0],
+    ),
+    RouterQuery(
+        "tasks.delete_task (comments)",
+        lambda _: select(Task.comments.property.mapper).where(with_parent(Task(id=ID), Task.comments)),
+    ),
+    RouterQuery("tasks.burndown (sprint)", lambda _: burndown_statements(DAY, DAY, None, ID)[1]),
+    RouterQuery("tasks.burndown (project, opening)", lambda _: burndown_statements(DAY, DAY, {ID})[0]),
+    RouterQuery("tasks.burndown (project)", lambda _: burndown_statements(DAY, DAY, {ID})[1]),
+    RouterQuery("tasks.burndown (team)", lambda _: tasks.team_projects_statement(ID)),
+    RouterQuery("project_stats.project_summaries", lambda _: summary_statements([ID, ID + 1], None, DAY)[0]),
+    RouterQuery(
+        "project_stats.project_summaries (overdue)", lambda _: summary_statements([ID, ID + 1], None, DAY)[1]
+    ),
+    RouterQuery("project_stats.project_summaries (sprint)", lambda _: summary_statements([ID], ID, DAY)[0]),
+    RouterQuery("project_acl.accessible_projects", lambda _: accessible_projects_statement(ID)),
+    # analytics
+    RouterQuery("analytics.velocity", lambda _: analytics.velocity_statement()),
+    RouterQuery("analytics.workload", lambda _: analytics.workload_statement(ID, DAY)),
+    RouterQuery("analytics.ticket_heatmap", lambda _: analytics.ticket_heatmap_statement(), full_scan=True),
+    # support
+    RouterQuery("support.list_tickets (member)", lambda _: support.tickets_statement(MEMBER, None)),
+    RouterQuery("support.list_tickets (staff, status)", lambda _: support.tickets_statement(STAFF, TicketStatus.new)),
+    RouterQuery("support.list_tickets (staff)", lambda _: support.tickets_statement(STAFF, None)),
+    RouterQuery(
+        "support.delete_ticket (comments)",
+        lambda _: select(SupportTicket.comments.property.mapper).where(
+            with_parent(SupportTicket(id=ID), SupportTicket.comments)
+        ),
+    ),
+    # projects
+    RouterQuery("projects.list_teams (staff)", lambda _: projects.teams_statement(STAFF), full_scan=True),
+    RouterQuery("projects.list_teams (member)", lambda _: projects.teams_statement(MEMBER)),
+    RouterQuery("projects.list_projects (member)", lambda _: projects.projects_statement(MEMBER, ACCESS)),
+    RouterQuery(
+        "projects.list_projects (member, etag)",
+        lambda _: collection_version_statement(
+            projects.projects_statement(MEMBER, ACCESS), Project.updated_at, func.sum(Project.tasks_version)
+        ),
+    ),
+    RouterQuery("projects.list_projects (staff)", lambda _: projects.projects_statement(STAFF, ACCESS)),
+    RouterQuery("projects.create_project (key)", lambda _: projects.project_key_statement("UAF")),
+    RouterQuery("projects.list_epics", lambda _: projects.epics_statement(ID)),
+    # docs
+    RouterQuery("docs.list_docs", lambda _: docs.docs_page_statement(None, docs.DOC_PAGE_DEFAULT)),
+    RouterQuery("docs.list_docs (next page)", lambda _: docs.docs_page_statement((WHEN, ID), docs.DOC_PAGE_DEFAULT)),
+    RouterQuery("docs.list_versions", lambda _: docs.versions_statement(ID)),
+    RouterQuery("doc_versions.version_content", lambda _: chain_statement(ID, 60, snapshot_before(60))),
+    RouterQuery("doc_versions.version_content (fallback)", lambda _: chain_statement(ID, 60)),
+    RouterQuery("docs.get_signatures", lambda _: docs.signatures_statement(ID)),
+    # integrations
+    RouterQuery("integration.list_logs", lambda _: integration.logs_statement(ID)),
+    RouterQuery("integration.marketplace", lambda _: integration.marketplace_statement(), full_scan=True),
+    RouterQuery(
+        "integration.marketplace (installations)", lambda _: integration.installations_statement(), full_scan=True
+    ),
+    # auth and admin
+    RouterQuery("auth.user_by_email", lambda _: auth.user_by_email_statement("user@example.com")),
+    RouterQuery("auth.two_factor", lambda _: auth.two_factor_statement(ID)),
+    RouterQuery("admin.list_users", lambda _: admin.users_statement()),
+    *[
+        RouterQuery(f"admin.metrics ({name})", lambda _, stmt=stmt: stmt, full_scan=True)
+        for name, stmt in admin.metrics_statements().items()
+    ],
+    RouterQuery("admin.settings", lambda _: admin.settings_statement(), full_scan=True),
+    RouterQuery("admin.audit_trail", lambda _: AuditQuery().statement(HOT_TABLE)),
+    RouterQuery("admin.audit_trail (actor)", lambda _: AuditQuery(actor_id=ID).statement(HOT_TABLE)),
+    RouterQuery("admin.audit_trail (action)", lambda _: AuditQuery(action="task.").statement(HOT_TABLE)),
+]
+
+
+def _postgres_scans(connection: Connection, sql: str) -> List[str]:
+    connection.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    scans: List[str] = []
+
+    def walk(node: dict) -> None:
+        if node.get("Node Type") == "Seq Scan":
+            scans.append(node.get("Relation Name", "?"))
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return scans
+
+
+def _sqlite_scans(connection: Connection, sql: str) -> List[str]:
+    scans, derived = [], set()
+    for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")):
+        detail = row[-1]
+        # Subqueries and CTEs are read back from the co-routine or temporary
+        # table that computed them, which is not a table scan.
+        for prefix in ("CO-ROUTINE ", "MATERIALIZE "):
+            if detail.startswith(prefix):
+                derived.add(detail[len(prefix):])
+        # FTS5 lookups show up as "SCAN <table> VIRTUAL TABLE INDEX ...".
+        if detail.startswith("SCAN ") and " USING " not in detail and " VIRTUAL TABLE INDEX " not in detail:
+            name = detail[len("SCAN "):]
+            if name not in derived:
+                scans.append(name.split()[0])
+    return scans
+
+
+def check(connection: Connection, verbose: bool = False) -> List[str]:
+    """Return a failure line for every query whose plan contains a table scan."""
+
+    explain = _postgres_scans if connection.dialect.name == "postgresql" else _sqlite_scans
+    failures = []
+    for query in QUERIES:
+        sql = str(query.build(connection).compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+        with connection.begin():
+            scans = explain(connection, sql)
+        status = "scan" if scans else "ok"
+        if scans and query.full_scan:
+            status = "scan (expected)"
+        elif scans:
+            failures.append(f"{query.name}: sequential scan on {', '.join(sorted(set(scans)))}")
+        if verbose or (scans and not query.full_scan):
+            print(f"{status:<16} {query.name}")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--migrate", action="store_true", help="apply pending migrations first")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every query, not only failures")
+    args = parser.parse_args()
+
+    from backend.database import get_engine
+    from backend.migrations import upgrade
+
+    engine = get_engine()
+    if args.migrate:
+        upgrade(engine)
+    with engine.connect() as connection:
+        failures = check(connection, verbose=args.verbose)
+    if failures:
+        print(f"\n{len(failures)} router queries fall back to a sequential scan:", file=sys.stderr)
+        for line in failures:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    print(f"All {len(QUERIES)} router queries are served by indexes.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -32,6 +32,9 @@ npm install --prefix frontend --no-package-lock
 npm run build --prefix frontend
 
 python -m compileall backend
+python scripts/check_import_time.py
+pip install pytest
+python -m pytest -q tests
 
 deactivate
 rm -rf .venv
@@ -0,0 +1,39 @@
+"""Shared fixtures: the API on a throwaway SQLite database.
+
+Run from the repository root with ``python -m pytest tests``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+# Set before backend.database is imported so every engine points at it.
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'ua_flow_test.db'}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.database import get_engine  # noqa: E402
+from backend.migrations import upgrade  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    upgrade(get_engine())
+    from backend.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client: TestClient) -> dict:
+    credentials = {"email": "tester@example.com", "password": "Secret123!"}
+    client.post("/api/v1/auth/register", json={**credentials, "full_name": "Tester"})
+    token = client.post("/api/v1/auth/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
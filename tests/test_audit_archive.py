@@ -0,0 +1,77 @@
+"""Audit trail buckets: partition ranges and archive table indexes."""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from backend.database import get_engine
+from backend.models import AuditLog, User
+from backend.services.audit_archive import (
+    HOT_TABLE,
+    AuditQuery,
+    _bucket_table,
+    ensure_partitioned,
+    partition_months,
+    roll_hot_table,
+)
+
+
+NOW = datetime(2024, 5, 17, 12, 0)
+
+
+def test_partition_months_cover_legacy_rows_from_this_month_and_later() -> None:
+    months = partition_months(NOW, 2, oldest=datetime(2024, 3, 2), newest=datetime(2024, 9, 1))
+    assert months[0] == datetime(2024, 3, 1)
+    assert datetime(2024, 5, 1) in months
+    assert months[-1] == datetime(2024, 9, 1)
+    assert partition_months(NOW, 2) == [datetime(2024, 5, 1), datetime(2024, 6, 1), datetime(2024, 7, 1)]
+
+
+def test_archive_tables_keep_the_hot_table_indexes(client) -> None:
+    with get_engine().connect() as connection, connection.begin() as transaction:
+        connection.execute(HOT_TABLE.insert().values(action="legacy", created_at=datetime(2001, 2, 3)))
+        assert roll_hot_table(connection, NOW) == ["audit_logs_200102"]
+
+        indexed = {tuple(index["column_names"]) for index in inspect(connection).get_indexes("audit_logs_200102")}
+        assert ("created_at", "id") in indexed
+        assert ("actor_id", "created_at", "id") in indexed
+
+        stmt = AuditQuery(actor_id=1).statement(_bucket_table("audit_logs_200102")).limit(50)
+        compiled = stmt.compile(connection, compile_kwargs={"literal_binds": True})
+        plan = " ".join(row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}"))
+        assert "USING INDEX" in plan or "USING COVERING INDEX" in plan, plan
+        transaction.rollback()
+
+
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="set TEST_POSTGRES_URL to a throwaway database")
+def test_partitioning_keeps_current_month_rows_out_of_the_default_partition() -> None:
+    now = datetime.utcnow()
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    tables = [User.__table__, AuditLog.__table__]
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("DROP TABLE IF EXISTS audit_logs CASCADE"))
+            User.metadata.drop_all(connection, tables=tables)
+            User.metadata.create_all(connection, tables=tables)
+            connection.execute(
+                HOT_TABLE.insert(),
+                [
+                    {"action": "legacy.old", "created_at": datetime(now.year - 1, now.month, 1)},
+                    {"action": "legacy.current", "created_at": now},
+                ],
+            )
+            ensure_partitioned(connection, now)
+            # Runs again on the next maintenance pass without touching the default partition.
+            ensure_partitioned(connection, now)
+            assert connection.execute(text("SELECT count(*) FROM audit_logs")).scalar() == 2
+            assert connection.execute(text("SELECT count(*) FROM audit_logs_default")).scalar() == 0
+            assert connection.execute(text(f"SELECT count(*) FROM audit_logs_{now:%Y%m}")).scalar() == 1
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text("DROP TABLE IF EXISTS audit_logs CASCADE"))
+            User.metadata.drop_all(connection, tables=tables)
+        engine.dispose()
@@ -0,0 +1,23 @@
+"""Buffered audit records under back-pressure."""
+
+from __future__ import annotations
+
+from backend.database import SessionLocal
+from backend.models import AuditLog
+from backend.services.audit_sink import AuditSink
+
+
+def test_full_buffer_falls_back_to_the_callers_session(monkeypatch) -> None:
+    sink = AuditSink(mode="buffered", buffer_size=1)
+    # Without a flusher the buffer stays full after the first record.
+    monkeypatch.setattr(sink, "_ensure_started", lambda: None)
+
+    with SessionLocal() as db:
+        db.info["unit_of_work"] = True
+        sink.record(db, None, "audit.buffered", None)
+        sink.record(db, None, "audit.overflow", {"n": 2})
+        assert [(record.action, record.meta) for record in db.new if isinstance(record, AuditLog)] == [
+            ("audit.overflow", {"n": 2})
+        ]
+    assert sink.stats()["buffered"] == 1
+    assert sink.stats()["overflowed"] == 1
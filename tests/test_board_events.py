@@ -0,0 +1,66 @@
+"""Ordering of the live board feed."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import pytest
+
+from backend.services import board_events
+from backend.services.board_events import BoardBroker, BoardMessage, InProcessBroker
+
+
+def _collect(publish, since: int, current: int, count: int) -> list:
+    async def run() -> list:
+        board_events.set_broker(InProcessBroker())
+        events = board_events.stream(1, since, current)
+        first = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0)  # let the stream subscribe
+        publish(board_events.broker)
+        chunks = [await first] + [await events.__anext__() for _ in range(count - 1)]
+        await events.aclose()
+        return [chunk.split("\n", 2)[:2] for chunk in chunks]
+
+    return asyncio.run(run())
+
+
+def test_out_of_order_messages_are_sent_in_sequence() -> None:
+    def publish(broker) -> None:
+        broker.publish([BoardMessage(1, 6, [])])
+        broker.publish([BoardMessage(1, 5, [])])
+
+    assert _collect(publish, 4, 4, 2) == [["id: 5", "event: board"], ["id: 6", "event: board"]]
+
+
+def test_unfilled_gap_resets_the_client(monkeypatch, caplog) -> None:
+    monkeypatch.setattr(board_events, "BOARD_EVENTS_GAP_WAIT", 0.05)
+
+    def publish(broker) -> None:
+        broker.publish([BoardMessage(1, 5, [])])
+        broker.publish([BoardMessage(1, 7, [])])
+
+    assert _collect(publish, 4, 4, 2) == [["id: 5", "event: board"], ["id: 5", "event: reset"]]
+    assert "set_broker" in caplog.text
+
+
+def test_in_process_broker_warns_under_several_workers(monkeypatch, caplog) -> None:
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+
+    async def run() -> None:
+        broker = InProcessBroker()
+        broker.unsubscribe(broker.subscribe(1))
+        broker.unsubscribe(broker.subscribe(2))
+
+    with caplog.at_level(logging.WARNING, logger=board_events.__name__):
+        asyncio.run(run())
+    assert [record.message.count("WEB_CONCURRENCY=4") for record in caplog.records] == [1]
+
+
+def test_brokers_must_implement_the_whole_interface() -> None:
+    class PublishOnly(BoardBroker):
+        def publish(self, messages) -> None:
+            pass
+
+    with pytest.raises(TypeError):
+        PublishOnly()
@@ -0,0 +1,47 @@
+"""Document updates and version diffs."""
+
+from __future__ import annotations
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend.database import get_engine
+from backend.models import AuditLog
+
+
+def _doc_updates(doc_id: int) -> int:
+    with Session(get_engine()) as db:
+        return db.scalar(
+            select(func.count())
+            .select_from(AuditLog)
+            .where(AuditLog.action == "doc.updated", AuditLog.meta["doc_id"].as_integer() == doc_id)
+        )
+
+
+def test_unchanged_save_writes_no_version_or_audit(client, auth_headers) -> None:
+    doc = client.post("/api/v1/docs/", json={"title": "Spec", "content_md": "one\n"}, headers=auth_headers).json()
+    url = f"/api/v1/docs/{doc['id']}"
+
+    assert client.put(url, json={"content_md": "one\ntwo\n"}, headers=auth_headers).json()["latest_version"] == 2
+    assert client.put(url, json={"title": "Spec", "content_md": "one\ntwo\n"}, headers=auth_headers).status_code == 200
+    assert _doc_updates(doc["id"]) == 1
+
+    renamed = client.put(url, json={"title": "Spec v2"}, headers=auth_headers).json()
+    assert (renamed["title"], renamed["latest_version"]) == ("Spec v2", 2)
+    assert _doc_updates(doc["id"]) == 2
+    assert len(client.get(f"{url}/versions", headers=auth_headers).json()) == 2
+
+
+def test_diff_of_rewritten_versions_is_bounded() -> None:
+    from backend.services import doc_diff
+
+    old = "".join(f"old line {i}\n" for i in range(3000))
+    new = "".join(f"new line {i}\n" for i in range(3000))
+    diff = doc_diff.build_diff(old, new, 0)
+    assert (diff["added"], diff["removed"]) == (3000, 3000)
+
+    cache = doc_diff.DiffCache(maxsize=10, maxbytes=doc_diff._diff_bytes(diff) + 1)
+    cache.put((1, 1, 2, 0), diff)
+    cache.put((1, 2, 3, 0), diff)
+    assert cache.stats()["size"] == 1
+    assert cache.get((1, 2, 3, 0)) is diff
@@ -0,0 +1,21 @@
+"""Project listings with their task counters."""
+
+from __future__ import annotations
+
+import warnings
+
+
+def test_project_stats_serialize_as_model(client, auth_headers) -> None:
+    created = client.post("/api/v1/projects/projects", json={"key": "STAT", "name": "Stats"}, headers=auth_headers)
+    assert created.status_code in (200, 201), created.text
+    project_id = created.json()["id"]
+    task = {"title": "Counted", "project_id": project_id, "priority": "High"}
+    assert client.post("/api/v1/tasks/", json=task, headers=auth_headers).status_code == 201
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        response = client.get("/api/v1/projects/projects", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    project = next(project for project in response.json() if project["id"] == project_id)
+    assert project["stats"]["tasks"] == 1
+    assert project["stats"]["by_priority"]["High"] == 1
@@ -0,0 +1,81 @@
+"""Query budgets of the endpoints that used to load relationships row by row.
+
+Each endpoint is measured on a small and a large project with the identity
+and project access caches cold, so the budget is the worst case and must
+not grow with the number of rows.
+"""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+
+from backend.database import get_engine
+from backend.services.identity_cache import identity_cache
+from backend.services.project_acl import project_acl
+from backend.sql_instrumentation import assert_max_queries
+
+
+SIZES = (2, 25)
+
+
+def _login(client, email: str) -> tuple:
+    credentials = {"email": email, "password": "Secret123!"}
+    user_id = client.post("/api/v1/auth/register", json={**credentials, "full_name": email}).json()["id"]
+    token = client.post("/api/v1/auth/login", json=credentials).json()["access_token"]
+    return user_id, {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="module")
+def team_board(client) -> dict:
+    """A team project per size, seen by a plain member of the team."""
+
+    admin_id, admin = _login(client, "budget-admin@example.com")
+    with get_engine().begin() as connection:
+        connection.execute(text("UPDATE users SET role = 'admin' WHERE id = :id"), {"id": admin_id})
+    member_id, member = _login(client, "budget-member@example.com")
+    team = client.post("/api/v1/projects/teams", json={"name": "Budget"}, headers=admin).json()
+    client.post(f"/api/v1/projects/teams/{team['id']}/members", params={"user_id": member_id}, headers=admin)
+
+    boards = {}
+    for size in SIZES:
+        project = client.post(
+            "/api/v1/projects/projects",
+            json={"key": f"QB{size}", "name": "Budget", "team_id": team["id"]},
+            headers=admin,
+        ).json()
+        for index in range(size):
+            task = client.post(
+                "/api/v1/tasks/",
+                json={
+                    "title": f"Task {index}",
+                    "project_id": project["id"],
+                    "assignee_id": member_id,
+                    "status": ("ToDo", "In Progress", "Done")[index % 3],
+                },
+                headers=admin,
+            ).json()
+        boards[size] = {"project_id": project["id"], "task_id": task["id"]}
+    return {"headers": member, "boards": boards}
+
+
+@pytest.mark.parametrize(
+    "url, budget",
+    [
+        ("/api/v1/tasks/?project_id={project_id}", 3),
+        ("/api/v1/tasks/board/view?project_id={project_id}", 4),
+        # The membership check on a single task: identity, project access, task.
+        ("/api/v1/tasks/{task_id}", 3),
+        ("/api/v1/projects/teams", 3),
+    ],
+)
+def test_query_budget_does_not_grow_with_rows(client, team_board, url: str, budget: int) -> None:
+    counts = []
+    for size in SIZES:
+        identity_cache.clear()
+        project_acl.clear()
+        with assert_max_queries(budget) as stats:
+            response = client.get(url.format(**team_board["boards"][size]), headers=team_board["headers"])
+        assert response.status_code == 200, response.text
+        counts.append(stats.count)
+    assert counts[0] == counts[1], counts
@@ -0,0 +1,22 @@
+"""Task search highlights."""
+
+from __future__ import annotations
+
+from backend.services.task_search import highlight_html
+
+
+def test_highlight_html_escapes_stored_markup() -> None:
+    assert highlight_html("<b>\x02login\x03</b> & co") == "&lt;b&gt;<mark>login</mark>&lt;/b&gt; &amp; co"
+    assert highlight_html(None) == ""
+
+
+def test_search_escapes_html_in_title(client, auth_headers) -> None:
+    title = "<img src=x onerror=alert(1)> login bug"
+    created = client.post("/api/v1/tasks/", json={"title": title}, headers=auth_headers)
+    assert created.status_code == 201, created.text
+
+    response = client.get("/api/v1/tasks/search", params={"q": "login"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    hit = next(hit for hit in response.json() if hit["task"]["id"] == created.json()["id"])
+    assert hit["title_highlight"] == "&lt;img src=x onerror=alert(1)&gt; <mark>login</mark> bug"
+    assert "<img" not in hit["snippet"]